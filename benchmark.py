@@ -0,0 +1,154 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+import numpy as np
+
+from graph import Graph, random_graph, random_graph_gnp, _subgraph_memo
+from graph_explo import Graphexploration
+from graph_dijkstra import Dijkstra
+from graph_cycles import Circle
+
+
+# Generators of the benchmark graphs: name -> function(numVertices, density, seed)
+generators = {
+    "gnm": lambda n, density, seed: random_graph(n, True, density, seed=seed, sparse=True),
+    "gnp": lambda n, density, seed: random_graph_gnp(n, density, True, seed=seed, sparse=True),
+}
+
+
+def _construct(g):
+    """Creates a graph from the edge arrays of the given graph."""
+    indptr, indices, weights = g.return_csr()
+    src = np.repeat(np.arange(g.return_num_vertices()), np.diff(indptr))
+    return lambda: Graph.from_edges(src, indices, weights, vertexNames=list(g.return_names()), sparse=True)
+
+
+def _subgraph(g):
+    """Checks, whether the tree of shortest paths from vertex 0 is a subgraph of the graph."""
+    tree = Dijkstra(g, cacheBytes=0).return_shortestPaths(0).to_graph()
+    def run():
+        # Known results are memoized by the hashes of both graphs
+        _subgraph_memo.clear()
+        return tree.is_subgraph_of(g)
+    return run
+
+
+# Benchmarks: name -> (function(graph) returning the function to be measured, largest number of vertices). The preparation is not measured, each repetition uses new algorithm objects without cached results.
+benchmarks = {
+    "construction": (_construct, None),
+    "bfs": (lambda g: lambda: Graphexploration(g, cacheBytes=0).return_bfsDist(0), None),
+    "dfs": (lambda g: lambda: Graphexploration(g, cacheBytes=0).return_dfsNum(0), None),
+    "dijkstra": (lambda g: lambda: Dijkstra(g, cacheBytes=0).return_shortestPathLengths(0), None),
+    "delta": (lambda g: lambda: Dijkstra(g, cacheBytes=0, engine="delta").return_shortestPathLengths(0), None),
+    # The circles are searched by one shortest path per backward edge, so the number of vertices is limited
+    "cycles": (lambda g: lambda: Circle(g).return_numCircles(), 2000),
+    "subgraph": (_subgraph, None),
+}
+
+
+def _measure(run, repeat, memory=True):
+    """Executes 'run' 'repeat' times and returns the times in seconds and the peak memory of an additional execution in bytes, which is traced separately, since tracing slows down the execution. Without 'memory' the peak memory is None."""
+    times = []
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    if not memory:
+        return times, None
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+
+def run_benchmarks(sizes=(1000, 10000), densities=(0.001, 0.01), names=None, graphs=None, seed=0, repeat=3, memory=True):
+    """Runs the selected benchmarks ('names', default: all) on graphs of all combinations of the generators ('graphs', default: all), numbers of vertices and edge densities. The graphs are created with the given seed, so runs are reproducible. The peak memory is traced by an additional execution unless 'memory' is False. Returns the results as a dictionary, which can be stored as JSON."""
+    names = list(benchmarks) if names is None else list(names)
+    graphs = list(generators) if graphs is None else list(graphs)
+    for name in names:
+        if name not in benchmarks:
+            raise ValueError("Unknown benchmark " + repr(name) + ", available are " + str(tuple(benchmarks)) + ".")
+    for generator in graphs:
+        if generator not in generators:
+            raise ValueError("Unknown generator " + repr(generator) + ", available are " + str(tuple(generators)) + ".")
+    results = []
+    with warnings.catch_warnings():
+        # Warnings about unreachable vertices are expected on random graphs
+        warnings.simplefilter("ignore")
+        for generator in graphs:
+            for size in sizes:
+                for density in densities:
+                    start = time.perf_counter()
+                    g = generators[generator](size, density, seed)
+                    generated = time.perf_counter() - start
+                    for name in names:
+                        prepare, limit = benchmarks[name]
+                        if limit is not None and size > limit:
+                            continue
+                        times, peak = _measure(prepare(g), repeat, memory)
+                        results.append({"benchmark": name, "generator": generator, "vertices": size, "density": density, "edges": int(g.return_num_edges()),
+                                        "median": float(np.median(times)), "min": min(times), "peakBytes": peak})
+                    results.append({"benchmark": "generate", "generator": generator, "vertices": size, "density": density, "edges": int(g.return_num_edges()),
+                                    "median": generated, "min": generated, "peakBytes": None})
+    meta = {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(), "seed": seed, "repeat": repeat, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline, current, threshold=0.2):
+    """Compares two results of run_benchmarks. Returns a list of the cases, whose median time or peak memory grew by more than the factor 1+threshold, as dictionaries with the case, the measure and both values."""
+    def key(result):
+        return (result["benchmark"], result["generator"], result["vertices"], result["density"])
+    old = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        for measure in ("median", "peakBytes"):
+            if before[measure] is None or result[measure] is None:
+                continue
+            if result[measure] > before[measure] * (1 + threshold):
+                regressions.append({"benchmark": result["benchmark"], "generator": result["generator"], "vertices": result["vertices"], "density": result["density"],
+                                    "measure": measure, "baseline": before[measure], "current": result[measure]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measures the time and the peak memory of the graph algorithms on seeded random graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="numbers of vertices")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.001, 0.01], help="edge densities")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(benchmarks), help="benchmarks to run (default: all)")
+    parser.add_argument("--generators", nargs="+", choices=list(generators), help="graph generators (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of each measurement")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracing the peak memory")
+    parser.add_argument("--output", help="file to store the results as JSON (default: standard output)")
+    parser.add_argument("--compare", help="JSON file of an earlier run, regressions against it are reported")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative growth reported as regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.densities, args.benchmarks, args.generators, args.seed, args.repeat, args.memory)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        for r in regressions:
+            print("Regression: %s on %s (V=%d, density=%g): %s %.6g -> %.6g" % (r["benchmark"], r["generator"], r["vertices"], r["density"], r["measure"], r["baseline"], r["current"]), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
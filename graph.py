@@ -1,59 +1,426 @@
 import numpy as np
+import hashlib
+import json
+import os
 import random
+import sys
+from itertools import islice
 from warnings import warn
 
-def random_graph(numVertices: int, edgeWeight = True, edgeDensity=0.1):
-    """Produces a random graph with given edge density"""
+from graph_cache import ResultCache
+
+
+# Identification and version of the binary file format of graphs
+_FILE_MAGIC = b"PYGRAPH\x00"
+_FILE_VERSION = 1
+# Alignment of the arrays within a graph file
+_PAGE_SIZE = 4096
+
+
+def _random_generator(optional):
+    """Returns the numpy random generator for the optional parameter 'seed' (an integer or a np.random.Generator). Without a seed the generator is seeded from the 'random' module, so random.seed() keeps results reproducible."""
+    if "seed" in optional and optional["seed"] is not None:
+        if isinstance(optional["seed"], np.random.Generator):
+            return optional["seed"]
+        return np.random.default_rng(optional["seed"])
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _codes_to_graph(codes, numVertices, edgeWeight, rng, **optional):
+    """Creates a graph from edge codes in [0, V²-V), where a code enumerates the pairs (i,j) with i != j row by row."""
+    if numVertices > 1:
+        src = codes // (numVertices - 1)
+        dst = codes % (numVertices - 1)
+        # The diagonal is skipped
+        dst += dst >= src
+    else:
+        src = dst = codes
+    if edgeWeight:
+        # Weights are drawn from (0,1], since a weight of 0 is no edge
+        weights = 1.0 - rng.random(len(codes))
+    else:
+        weights = np.ones(len(codes), dtype=np.int32)
+    return Graph.from_edges(src, dst, weights, vertexNames=list(range(0, numVertices)), **optional)
+
+
+def random_graph(numVertices: int, edgeWeight = True, edgeDensity=0.1, **optional):
+    """Produces a random graph with given edge density, i.e. a graph with int((V²-V)*edgeDensity) distinct edges chosen uniformly at random (G(n,m) model). The edges are sampled with numpy without creating all V²-V candidate edges. The optional parameter 'seed' sets the seed or the np.random.Generator, 'sparse' the storage format of the graph."""
     if numVertices < 1:
         raise ValueError("The number of vertices have to be at least 1.")
     if edgeDensity > 1.0 or edgeDensity < 0:
         raise ValueError("The edge density should be within the range of [0,1].")
+    rng = _random_generator(optional)
     # Calculating the number of edges from the given edge density
-    numEdges = int((numVertices**2-numVertices) * edgeDensity)
+    numPairs = numVertices**2-numVertices
+    numEdges = int(numPairs * edgeDensity)
     
     # Generate edges
-    edges = [(i,j) for i in range(0,numVertices) for j in range(0,numVertices) if i != j]
-    edges = random.sample(edges,numEdges)
-    
-    # Create adjacency matrix
-    if edgeWeight:
-        mat = np.zeros((numVertices, numVertices), dtype= np.float64)
-    else: 
-        mat = np.zeros((numVertices, numVertices), dtype= np.int32)
-    for edge in edges:
-        if edgeWeight:
-            mat[edge[0]][edge[1]] = random.random()
-        else: mat[edge[0]][edge[1]] = 1.0
+    if numEdges > numPairs // 2:
+        # For dense graphs the missing edges are sampled instead
+        codes = np.setdiff1d(np.arange(numPairs, dtype=np.int64), _sample_codes(numPairs, numPairs - numEdges, rng), assume_unique=True)
+    else:
+        codes = _sample_codes(numPairs, numEdges, rng)
     
     # Generate and return graph
-    return Graph(mat, dtype = np.float64)
+    return _codes_to_graph(codes, numVertices, edgeWeight, rng, **{k: v for k, v in optional.items() if k != "seed"})
+
+
+def random_graph_gnp(numVertices: int, edgeProbability, edgeWeight = True, **optional):
+    """Produces a random graph, in which each of the V²-V possible edges exists independently with the given probability (G(n,p) model). The positions of the edges are sampled by geometric skipping, so the runtime is linear in the number of edges. The optional parameter 'seed' sets the seed or the np.random.Generator, 'sparse' the storage format of the graph."""
+    if numVertices < 1:
+        raise ValueError("The number of vertices have to be at least 1.")
+    if edgeProbability > 1.0 or edgeProbability < 0:
+        raise ValueError("The edge probability should be within the range of [0,1].")
+    rng = _random_generator(optional)
+    numPairs = numVertices**2-numVertices
     
+    if edgeProbability == 0:
+        codes = np.zeros(0, dtype=np.int64)
+    elif edgeProbability == 1:
+        codes = np.arange(numPairs, dtype=np.int64)
+    else:
+        # The gaps between consecutive edges are geometrically distributed, they are drawn in batches until all pairs are covered
+        chunks = []
+        last = -1
+        expected = numPairs * edgeProbability
+        batch = int(expected + 5 * np.sqrt(expected) + 16)
+        while last < numPairs:
+            positions = last + np.cumsum(rng.geometric(edgeProbability, batch))
+            chunks.append(positions[positions < numPairs])
+            last = positions[-1]
+            batch = max(16, batch // 4)
+        codes = np.concatenate(chunks).astype(np.int64)
+    
+    return _codes_to_graph(codes, numVertices, edgeWeight, rng, **{k: v for k, v in optional.items() if k != "seed"})
+
+
+def _sample_codes(numPairs, numEdges, rng):
+    """Samples 'numEdges' distinct edge codes from [0, numPairs) uniformly at random. Duplicate codes are rejected in batches, which is efficient as long as at most half of the codes are sampled."""
+    codes = np.unique(rng.integers(0, numPairs, numEdges, dtype=np.int64))
+    while len(codes) < numEdges:
+        missing = numEdges - len(codes)
+        # Some extra codes compensate for the expected number of duplicates
+        extra = rng.integers(0, numPairs, int(missing * (1 + len(codes) / numPairs)) + 16, dtype=np.int64)
+        codes = np.union1d(codes, extra)
+    if len(codes) > numEdges:
+        # Surplus codes are removed at random, so the result remains uniformly distributed
+        codes = np.sort(rng.choice(codes, numEdges, replace=False))
+    return codes
+    
+
+class _GrowableArray:
+    """Typed array, to which values can be appended. The capacity is doubled when it is exceeded, so appending runs in amortized constant time per value."""
+    
+    def __init__(self, dtype, capacity=1024):
+        self.__data = np.empty(capacity, dtype=dtype)
+        self.__size = 0
+        
+    def extend(self, values):
+        """Appends the given values."""
+        values = np.asarray(values, dtype=self.__data.dtype)
+        needed = self.__size + len(values)
+        if needed > len(self.__data):
+            self.__data.resize(max(needed, 2 * len(self.__data)), refcheck=False)
+        self.__data[self.__size:needed] = values
+        self.__size = needed
+        
+    def finish(self):
+        """Returns the array of all appended values. The unused capacity is released in place."""
+        self.__data.resize(self.__size, refcheck=False)
+        return self.__data
+
+
+def _rows_sorted(indptr, indices):
+    """Returns whether the adjacencies of each vertex in the CSR arrays are sorted by their end vertex without duplicates."""
+    if len(indices) < 2:
+        return True
+    increasing = np.diff(indices.astype(np.int64)) > 0
+    # Differences across two rows are not compared
+    increasing[indptr[1:-1][(indptr[1:-1] > 0) & (indptr[1:-1] < len(indices))] - 1] = True
+    return bool(np.all(increasing))
+
+
+def _index_dtype(size):
+    """Returns the smallest integer type that can hold the vertex indices of a graph with the given number of vertices"""
+    return np.int32 if size < np.iinfo(np.int32).max else np.int64
+
+
+def _edge_codes(g):
+    """Returns the edges of a graph encoded as startVertex*n+endVertex (n: number of vertices) in ascending order together with their weights."""
+    indptr, indices, weights = g.return_csr()
+    size = g.return_num_vertices()
+    code = np.repeat(np.arange(size, dtype=np.int64), np.diff(indptr)) * size + indices
+    # The rows of a graph are sorted, but other objects answering the queries of a graph may not be
+    if np.any(code[1:] < code[:-1]):
+        order = np.argsort(code, kind="stable")
+        code = code[order]
+        weights = weights[order]
+    return code, weights
+
+
+def _topological_order(indptr, indices):
+    """Kahn's algorithm on CSR arrays, which removes all vertices without incoming edges layer by layer with numpy operations. Returns the vertex indices in topological order as an array, which contains fewer vertices than the graph if the graph contains circles."""
+    size = len(indptr) - 1
+    indeg = np.bincount(indices, minlength=size)
+    frontier = np.flatnonzero(indeg == 0)
+    layers = []
+    while len(frontier) > 0:
+        layers.append(frontier)
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        # Positions of the outgoing edges of the frontier in 'indices'
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        targets = indices[positions]
+        indeg -= np.bincount(targets, minlength=size)
+        # Each vertex, whose last incoming edge has been removed, joins the next layer once
+        targets = np.unique(targets)
+        frontier = targets[indeg[targets] == 0]
+    return np.concatenate(layers) if len(layers) > 0 else np.zeros(0, dtype=np.int64)
+
+
+def _is_subgraph(sub, sup):
+    """Returns whether the graph 'sub' is a subgraph of the graph 'sup', i.e. whether its vertices are vertices of 'sup' and its edges are edges of 'sup' with equal weight. The vertices are matched by name."""
+    # The vertex indices of 'sub' are mapped to the vertex indices of 'sup' once
+    try:
+        index = np.fromiter(map(sup.return_vertexIndex, sub.return_names()), dtype=np.int64, count=sub.return_num_vertices())
+    except KeyError:
+        return False
+    indptr, indices, weights = sub.return_csr()
+    src = np.repeat(index, np.diff(indptr))
+    code = src * sup.return_num_vertices() + index[indices]
+    sup_code, sup_weights = _edge_codes(sup)
+    if len(sup_code) == 0:
+        return len(code) == 0
+    # Each edge is searched in the sorted edges of 'sup'
+    pos = np.minimum(np.searchsorted(sup_code, code), len(sup_code) - 1)
+    return bool(np.all(sup_code[pos] == code) and np.all(sup_weights[pos] == weights))
+
+
+# Results of the subgraph check, stored by the content hashes of both graphs
+_subgraph_memo = ResultCache(maxEntries=4096)
+
 
 class Graph:
     def __init__(self, graph, **optional):
-        """Constructor chooses either the adjacency list constructor or adjacency matrix constructor"""
+        """Constructor chooses either the adjacency list constructor or adjacency matrix constructor. If the optional parameter 'sparse' is set to True, the graph is only stored in compressed sparse row (CSR) format, so no dense adjacency matrix is allocated."""
+        if "sparse" in optional:
+            self.__sparse = bool(optional["sparse"])
+        else:
+            self.__sparse = False
         if type(graph)==np.ndarray: 
             self.__init_matrix(graph, **optional)
         elif type(graph)==list:
             self.__init_list(graph, **optional)
         else:
             raise TypeError("\'graph\' must be either a numpy array or a adjacency list [(i,j,w), ...].")
+        self.__finalize()
+        
+    @classmethod
+    def from_edges(cls, src, dst, weights=None, **optional):
+        """Bulk constructor, which creates a graph from numpy arrays of start vertices, end vertices and weights. The vertices are either given as indices or as names. The optional parameter 'vertexNames' sets the vertex order (the names of the indices), 'dtype' the weight type and 'sparse' the storage format. Without weights all edges have the weight 1. Duplicate edges are resolved in favour of the last one."""
+        graph = cls.__new__(cls)
+        if "sparse" in optional:
+            graph.__sparse = bool(optional["sparse"])
+        else:
+            graph.__sparse = False
+        graph.__init_edges(np.asarray(src), np.asarray(dst), weights, **optional)
+        graph.__finalize()
+        return graph
+        
+    @classmethod
+    def read_edgelist(cls, path, chunksize=1000000, **optional):
+        """Creates a graph from an edge list file, which is streamed in chunks of 'chunksize' edges, so the memory usage stays close to the size of the final graph. Text files contain one edge 'start end [weight]' per line, separated by the optional parameter 'delimiter' (default: whitespace). Lines starting with 'comments' (default: '#') are skipped and edges without a weight have the weight 1. Vertex names are interned in the order of their first occurrence unless 'vertexNames' is given, 'nodeType' converts them (default: str). If the optional parameter 'binary' is set to a structured numpy dtype with the fields 'src', 'dst' and optionally 'weight', the file is read as fixed-width binary records, whose vertices are indices. The weights are cast to 'dtype' (default: float64). The graph is stored in sparse format unless 'sparse' is set to False. Duplicate edges are resolved in favour of the last one."""
+        if chunksize < 1:
+            raise ValueError("\'chunksize\' has to be at least 1.")
+        weight_type = optional["dtype"] if "dtype" in optional else np.float64
+        
+        if "binary" in optional:
+            record = np.dtype(optional["binary"])
+            if record.names is None or "src" not in record.names or "dst" not in record.names:
+                raise TypeError("\'binary\' has to be a structured dtype with the fields \'src\' and \'dst\'.")
+            # The number of records is known from the file size, so the arrays are allocated only once
+            capacity = max(os.path.getsize(path) // record.itemsize, 1)
+            src = _GrowableArray(record["src"], capacity)
+            dst = _GrowableArray(record["dst"], capacity)
+            weights = _GrowableArray(weight_type, capacity)
+            with open(path, "rb") as f:
+                while True:
+                    chunk = np.fromfile(f, dtype=record, count=chunksize)
+                    if len(chunk) == 0:
+                        break
+                    src.extend(chunk["src"])
+                    dst.extend(chunk["dst"])
+                    weights.extend(chunk["weight"] if "weight" in record.names else np.ones(len(chunk), dtype=weight_type))
+            names = {}
+            if "vertexNames" in optional:
+                names["vertexNames"] = optional["vertexNames"]
+        else:
+            src = _GrowableArray(np.int32)
+            dst = _GrowableArray(np.int32)
+            weights = _GrowableArray(weight_type)
+            delimiter = optional["delimiter"] if "delimiter" in optional else None
+            comments = optional["comments"] if "comments" in optional else "#"
+            node_type = optional["nodeType"] if "nodeType" in optional else str
+            # Hashmap name->index, which grows with every new name
+            if "vertexNames" in optional:
+                name_list = list(optional["vertexNames"])
+                index = {name_list[i]: i for i in range(0, len(name_list))}
+                fixed = True
+            else:
+                name_list = []
+                index = {}
+                fixed = False
+            line_number = 0
+            with open(path, "r", encoding="utf-8") as f:
+                while True:
+                    lines = list(islice(f, chunksize))
+                    if len(lines) == 0:
+                        break
+                    starts = []
+                    ends = []
+                    chunk_weights = []
+                    for line in lines:
+                        line_number += 1
+                        line = line.strip()
+                        if len(line) == 0 or (comments and line.startswith(comments)):
+                            continue
+                        parts = line.split(delimiter)
+                        if len(parts) < 2 or len(parts) > 3:
+                            raise ValueError("Line " + str(line_number) + " of the edge list has to contain a start vertex, an end vertex and optionally a weight.")
+                        edge = []
+                        for name in (node_type(parts[0].strip()), node_type(parts[1].strip())):
+                            i = index.get(name)
+                            if i is None:
+                                if fixed:
+                                    raise ValueError("The passed list of names does not contain the same node names as the node names from the edge list.")
+                                i = len(name_list)
+                                index[name] = i
+                                name_list.append(name)
+                            edge.append(i)
+                        starts.append(edge[0])
+                        ends.append(edge[1])
+                        chunk_weights.append(parts[2].strip() if len(parts) == 3 else 1)
+                    src.extend(starts)
+                    dst.extend(ends)
+                    weights.extend(np.array(chunk_weights, dtype=np.float64))
+            names = {"vertexNames": name_list}
+        
+        return cls.from_edges(src.finish(), dst.finish(), weights.finish(), dtype=weight_type, sparse=optional["sparse"] if "sparse" in optional else True, **names)
+        
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Loads a graph from a binary file created with 'save'. If 'mmap' is set (default), the arrays are mapped into memory with np.memmap instead of being read, so the graph is queryable without copying and all processes loading the same file share its pages. The loaded graph is stored in sparse format."""
+        with open(path, "rb") as f:
+            if f.read(len(_FILE_MAGIC)) != _FILE_MAGIC:
+                raise ValueError("The file does not contain a graph.")
+            header_length = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            header = json.loads(f.read(header_length).decode("utf-8"))
+        if header["version"] != _FILE_VERSION:
+            raise ValueError("The version of the graph file is not supported.")
+        arrays = {}
+        for key, (offset, dtype, length) in header["arrays"].items():
+            if length == 0:
+                arrays[key] = np.zeros(0, dtype=dtype)
+            elif mmap:
+                arrays[key] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(length,))
+            else:
+                arrays[key] = np.fromfile(path, dtype=dtype, count=length, offset=offset)
+        
+        graph = cls.__new__(cls)
+        graph.__sparse = True
+        graph.__size = header["size"]
+        graph.__type = np.dtype(header["arrays"]["weights"][1])
+        # Names are decoded, since a tuple of names is required for the name->index hashmap anyway
+        if header["names"] == "int":
+            graph.__name_list = arrays["names"].tolist()
+        else:
+            blob = arrays["names"].tobytes()
+            offsets = arrays["nameOffsets"].tolist()
+            graph.__name_list = [blob[offsets[i]:offsets[i+1]].decode("utf-8") for i in range(0, graph.__size)]
+        graph.__names = dict(zip(graph.__name_list, range(0, graph.__size)))
+        graph.__indptr = arrays["indptr"]
+        graph.__indices = arrays["indices"]
+        graph.__weights = arrays["weights"]
+        graph.__indeg = arrays["indeg"]
+        if not _rows_sorted(graph.__indptr, graph.__indices):
+            # Files of older versions may contain the rows of dense graphs in the order of their adjacency list, which are sorted in memory
+            src = np.repeat(np.arange(graph.__size, dtype=np.int64), np.diff(graph.__indptr))
+            graph.__init_csr(src, np.asarray(graph.__indices, dtype=np.int64), np.asarray(graph.__weights), True)
+        graph.__finalize()
+        return graph
+        
+    def save(self, path):
+        """Stores the graph in a binary file, which consists of a header followed by the page-aligned arrays of the CSR format, the input degrees and the vertex names. Only integer or string vertex names can be stored. The file can be loaded with 'Graph.load'."""
+        arrays = [("indptr", self.__indptr), ("indices", self.__indices), ("weights", self.__weights), ("indeg", self.__indeg)]
+        if all(isinstance(x, (int, np.integer)) and not isinstance(x, bool) for x in self.__name_list):
+            names = "int"
+            arrays.append(("names", np.array(self.__name_list, dtype=np.int64)))
+        elif all(isinstance(x, str) for x in self.__name_list):
+            names = "str"
+            encoded = [x.encode("utf-8") for x in self.__name_list]
+            offsets = np.zeros(self.__size + 1, dtype=np.int64)
+            np.cumsum([len(x) for x in encoded], out=offsets[1:])
+            arrays.append(("names", np.frombuffer(b"".join(encoded), dtype=np.uint8)))
+            arrays.append(("nameOffsets", offsets))
+        else:
+            raise TypeError("Only graphs with integer or string vertex names can be stored.")
+        
+        # The header is enlarged page by page until the offsets of the arrays fit into it
+        pages = 1
+        while True:
+            offset = pages * _PAGE_SIZE
+            layout = {}
+            for key, arr in arrays:
+                layout[key] = (offset, np.dtype(arr.dtype).newbyteorder("=").str, len(arr))
+                offset += -(-arr.nbytes // _PAGE_SIZE) * _PAGE_SIZE
+            header = json.dumps({"version": _FILE_VERSION, "size": self.__size, "names": names, "arrays": layout}).encode("utf-8")
+            if len(_FILE_MAGIC) + 8 + len(header) <= pages * _PAGE_SIZE:
+                break
+            pages += 1
+        
+        with open(path, "wb") as f:
+            f.write(_FILE_MAGIC)
+            f.write(np.array([len(header)], dtype="<u8").tobytes())
+            f.write(header)
+            for key, arr in arrays:
+                f.seek(layout[key][0])
+                np.ascontiguousarray(arr).tofile(f)
+            # The file covers the last page completely
+            f.truncate(offset)
+        
+    def __finalize(self):
+        """Restricts the access to the attributes to read-only, after one of the constructors has been executed"""
         # To keep the attributes immutable, they are stored as tuples
-        self.__adj = tuple([tuple(x) for x in self.__adj])
         self.__name_list = tuple(self.__name_list)
-        # __mat Access restriction to read-only
-        self.__mat = np.copy(self.__mat)
-        self.__mat.flags.writeable = False
+        if not self.__sparse:
+            self.__adj = tuple(self.__adj)
+            # __mat Access restriction to read-only
+            self.__mat.flags.writeable = False
+            # Input degree of each vertex
+            self.__indeg = np.count_nonzero(self.__mat, axis=0)
+        elif self.__indeg is None:
+            self.__indeg = np.bincount(self.__indices, minlength=self.__size)
+        # Lookups in the CSR arrays search the adjacencies of a vertex by bisection
+        if not _rows_sorted(self.__indptr, self.__indices):
+            raise ValueError("The adjacencies of each vertex in the CSR arrays have to be sorted by their end vertex.")
+        # CSR arrays are read-only as well
+        for arr in (self.__indptr, self.__indices, self.__weights, self.__indeg):
+            arr.flags.writeable = False
+            
+        # Transposed CSR arrays, which are created on demand
+        self.__reverse_csr = None
+        # Hash of the content, which is computed on demand
+        self.__hash = None
         
     def __init_list(self, adjlist, **optional): 
         """Adjacency list constructor, which creates a graph from the given adjacency list"""
 		# Error handling
         if any([len(x)!=3 for x in adjlist]):
             raise TypeError("The adjacency list may only have entries of the form (i,j,weight).")
-        elif any(x[2]<=0 for x in adjlist):
+        starts, ends, weights = zip(*adjlist) if len(adjlist) > 0 else ((), (), ())
+        weights = np.array(weights)
+        if np.any(weights<=0):
             raise ValueError("Weights must be > 0.")
-        elif any(x[0]==x[1] for x in adjlist):
-            raise ValueError("The graph must not contain circles of length 1.")
         
         if "vertexNames" in optional:
             node_order = optional["vertexNames"]
@@ -69,31 +436,38 @@ class Graph:
         
         # List of names
         if node_order == None:
-            self.__name_list = list(set([y for x in [(x[0],x[1]) for x in adjlist] for y in x]))
+            self.__name_list = list(set(starts).union(ends))
         else:
             self.__name_list = node_order
-            if not set([y for x in [(x[0],x[1]) for x in adjlist] for y in x]).issubset(set(node_order)):
+            if not set(starts).union(ends).issubset(set(node_order)):
                 raise ValueError("The passed list of names does not contain the same node names as the node names from the adjacency list.")
             
         # Number of edges
         self.__size = len(self.__name_list)
         # Hashmap name->index
         self.__names = {self.__name_list[i]: i for i in range(0,self.__size)}
-        # adjacency matrix
-        self.__mat = np.zeros((self.__size, self.__size), dtype=self.__type)
-        # adjacency list
-        self.__adj = [[] for i in range(0,self.__size)]
-        # Used to cast the values to the given datatype
-        cast_to = np.array([0,0], dtype=self.__type)[0]
-        for edge in adjlist:
-            i = self.__names[edge[0]]
-            j = self.__names[edge[1]]
-            # Cast weights to given datatype
-            self.__adj[i].append((j, type(cast_to)(edge[2])))            
-            self.__mat[i][j] = type(cast_to)(edge[2])
-            
-        # List of known supergraphs
-        self.__supergraph = []
+        
+        src = np.fromiter((self.__names[x] for x in starts), dtype=np.int64, count=len(starts))
+        dst = np.fromiter((self.__names[x] for x in ends), dtype=np.int64, count=len(ends))
+        if np.any(src==dst):
+            raise ValueError("The graph must not contain circles of length 1.")
+        # Cast weights to given datatype
+        weights = weights.astype(self.__type)
+        
+        if self.__sparse:
+            # Only the edge arrays are built, duplicate edges are resolved in favour of the last one
+            self.__init_csr(src, dst, weights, True)
+        else:
+            # The CSR arrays are sorted like in sparse mode, duplicate edges are resolved in favour of the last one
+            self.__init_csr(src, dst, weights, True)
+            # adjacency matrix
+            self.__mat = np.zeros((self.__size, self.__size), dtype=self.__type)
+            self.__mat[src, dst] = weights
+            # adjacency list, which keeps the order of the given adjacency list
+            self.__adj = [[] for v in range(0, self.__size)]
+            for i, j, w in zip(src.tolist(), dst.tolist(), weights.tolist()):
+                self.__adj[i].append((j, w))
+            self.__adj = [tuple(x) for x in self.__adj]
         
     def __init_matrix(self, adjacencyMatrix, **optional):
         """Adjacency matrix constructor, which creates a graph from the given adjacency matrix"""
@@ -125,22 +499,143 @@ class Graph:
             self.__name_list = [i for i in range(0,self.__size)]
             self.__names = {self.__name_list[i]:i for i in range(0,self.__size)}
             
-        # Adjacency matrix
-        self.__mat = adjacencyMatrix
-        # Adjacency matrix
-        self.__adj = [[(i,self.__mat[vertices][i]) for i in np.arange(self.__size) if self.__mat[vertices][i]>0] for vertices in np.arange(0,self.__size)]
+        # np.nonzero traverses the matrix row by row, so the CSR arrays are sorted
+        src, dst = np.nonzero(adjacencyMatrix)
+        self.__init_csr(src, dst, adjacencyMatrix[src, dst], False)
+        if not self.__sparse:
+            # Adjacency matrix
+            self.__mat = np.copy(adjacencyMatrix)
+            # Adjacency list
+            self.__adj = self.__adjacencies_from_csr()
+            
+    def __init_edges(self, src, dst, weights, **optional):
+        """Edge array constructor, which creates a graph from numpy arrays of start vertices, end vertices and weights using vectorized operations only"""
+        # Error handling
+        if src.ndim!=1 or src.shape!=dst.shape:
+            raise TypeError("\'src\' and \'dst\' have to be one-dimensional arrays of the same length.")
+        if weights is None:
+            weights = np.ones(len(src), dtype=optional["dtype"] if "dtype" in optional else np.int32)
+        else:
+            weights = np.asarray(weights)
+            if weights.shape!=src.shape:
+                raise TypeError("\'weights\' has to be a one-dimensional array with one weight per edge.")
+        self.__type = optional["dtype"] if "dtype" in optional else weights.dtype
+        if np.dtype(self.__type).kind not in "if":
+            raise TypeError("Weights have to be of the type \'float*\' or \'int*\'.")
+        elif np.any(weights<=0):
+            raise ValueError("Weights must be > 0.")
+        
+        if "vertexNames" in optional:
+            self.__name_list = list(optional["vertexNames"])
+            if len(set(self.__name_list)) != len(self.__name_list):
+                raise ValueError("Vertex names are not unique.")
+        else:
+            self.__name_list = None
         
-        # List of known supergraphs
-        self.__supergraph = []
+        if src.dtype.kind in "iu" and dst.dtype.kind in "iu":
+            # Vertices are given as indices
+            if self.__name_list is None:
+                size = int(max(src.max(), dst.max())) + 1 if len(src) > 0 else 0
+                self.__name_list = list(range(0, size))
+            size = len(self.__name_list)
+            if len(src) > 0 and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= size):
+                raise ValueError("The vertex indices have to be within the range of the given vertex names.")
+            # Signed indices are kept in their type to save memory, unsigned ones would turn into floats when combined with signed integers
+            if src.dtype.kind == "u":
+                src = src.astype(np.int64)
+            if dst.dtype.kind == "u":
+                dst = dst.astype(np.int64)
+        elif self.__name_list is None:
+            # Vertices are given as names, which are interned in sorted order
+            names, inverse = np.unique(np.concatenate((src, dst)), return_inverse=True)
+            self.__name_list = names.tolist()
+            src, dst = inverse[:len(src)], inverse[len(src):]
+        else:
+            # Vertices are given as names, which are looked up in the sorted list of names
+            names = np.array(self.__name_list)
+            order = np.argsort(names, kind="stable")
+            sorted_names = names[order]
+            edge_names = np.concatenate((src, dst))
+            pos = np.minimum(np.searchsorted(sorted_names, edge_names), max(len(names) - 1, 0))
+            if len(edge_names) > 0 and (len(names) == 0 or np.any(sorted_names[pos] != edge_names)):
+                raise ValueError("The passed list of names does not contain the same node names as the node names from the adjacency list.")
+            src, dst = order[pos[:len(src)]], order[pos[len(src):]]
+        if np.any(src==dst):
+            raise ValueError("The graph must not contain circles of length 1.")
         
+        self.__size = len(self.__name_list)
+        # Hashmap name->index
+        self.__names = dict(zip(self.__name_list, range(0, self.__size)))
+        # Duplicate edges are removed and the adjacencies are sorted
+        self.__init_csr(src, dst, weights.astype(self.__type, copy=False), True)
+        if not self.__sparse:
+            # Adjacency matrix
+            self.__mat = np.zeros((self.__size, self.__size), dtype=self.__type)
+            self.__mat[np.repeat(np.arange(self.__size), np.diff(self.__indptr)), self.__indices] = self.__weights
+            # Adjacency list
+            self.__adj = self.__adjacencies_from_csr()
+        
+    def __init_csr(self, src, dst, weights, unique):
+        """Creates the compressed sparse row (CSR) arrays from the given edge arrays. If 'unique' is set, the edges of each vertex are sorted by their end vertex and duplicate edges are removed."""
+        if unique:
+            # Each edge is encoded by a single integer, which is faster to sort than the pair of vertices
+            code = src.astype(np.int64) * self.__size + dst
+            if np.any(code[1:] < code[:-1]):
+                # The sorting is stable, so the last of several duplicate edges is kept
+                order = np.argsort(code, kind="stable")
+                code = code[order]
+                weights = weights[order]
+                del order
+            keep = np.ones(len(code), dtype=bool)
+            keep[:-1] = code[1:] != code[:-1]
+            code = code[keep]
+            weights = weights[keep]
+            del keep
+            # Start and end vertices are decoded from the sorted codes, the offsets are the positions of the first code of each vertex
+            self.__indptr = np.searchsorted(code, np.arange(self.__size + 1, dtype=np.int64) * self.__size)
+            self.__indices = (code % max(self.__size, 1)).astype(_index_dtype(self.__size))
+        else:
+            order = np.argsort(src, kind="stable")
+            src, dst, weights = src[order], dst[order], weights[order]
+            # Offsets of the adjacencies of each vertex
+            self.__indptr = np.zeros(self.__size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=self.__size), out=self.__indptr[1:])
+            # End vertices of all edges
+            self.__indices = dst.astype(_index_dtype(self.__size))
+        self.__indptr = self.__indptr.astype(np.int64, copy=False)
+        # Weights of all edges
+        self.__weights = np.asarray(weights, dtype=self.__type)
+        # The input degrees are computed when the construction is finished
+        self.__indeg = None
+        
+    def __adjacencies_from_csr(self):
+        """Creates the adjacency list from the CSR arrays"""
+        indptr = self.__indptr.tolist()
+        indices = self.__indices.tolist()
+        weights = self.__weights.tolist()
+        return [tuple(zip(indices[indptr[v]:indptr[v+1]], weights[indptr[v]:indptr[v+1]])) for v in range(0, self.__size)]
+        
+    def __find_edge(self, startVertex, endVertex):
+        """Returns the position of the edge (startVertex, endVertex) in the CSR arrays or -1 if the edge does not exist. Only available in sparse mode, where the adjacencies are sorted."""
+        begin = self.__indptr[startVertex]
+        end = self.__indptr[startVertex + 1]
+        pos = begin + np.searchsorted(self.__indices[begin:end], endVertex)
+        if pos < end and self.__indices[pos] == endVertex:
+            return pos
+        return -1
         
     # Getter-methods
     def is_adjacent(self, startVertex: np.int_ , endVertex: np.int_):
         """Returns whether the start node is adjacent to the end node"""
+        if self.__sparse:
+            return self.__find_edge(startVertex, endVertex) >= 0
         return self.__mat[startVertex][endVertex]>0
 		
     def return_weight(self, startVertex: np.int, endVertex:np.int):
         """Returns the weight of an edge (startVertex, endVertex)"""
+        if self.__sparse:
+            pos = self.__find_edge(startVertex, endVertex)
+            return self.__weights[pos] if pos >= 0 else self.__weights.dtype.type(0)
         return self.__mat[startVertex][endVertex]
 		
     def return_num_vertices(self):
@@ -149,28 +644,86 @@ class Graph:
 		
     def return_num_edges(self):
         """Returns the number of edges of the graph"""
-        return sum(map(lambda x: len(x),self.__adj))
+        return len(self.__indices)
         
     def return_outdeg(self, vertex: np.int_):
         """Returns the output degree of the selected node"""
-        return len(self.__adj[vertex])
+        return self.__indptr[vertex + 1] - self.__indptr[vertex]
         
     def return_indeg(self, vertex: np.int_):
         """Returns the output degree of the selected node"""
-        return sum(map(lambda x: x>0,self.__mat[:,vertex]))
+        return self.__indeg[vertex]
         
     def return_adjacencies(self, vertex: np.int_):
         """Returns all nodes that are adjacent to the selected node with the corresponding edge weight"""
+        if self.__sparse:
+            begin = self.__indptr[vertex]
+            end = self.__indptr[vertex + 1]
+            return tuple(zip(self.__indices[begin:end].tolist(), self.__weights[begin:end].tolist()))
         return self.__adj[vertex]
         
     def return_adjacencyMatrix(self):
-        """Returns the adjacency matrix of the graph"""
+        """Returns the adjacency matrix of the graph. In sparse mode the matrix is created on demand."""
+        if self.__sparse:
+            warn(Warning("The graph is stored in sparse format, so the dense adjacency matrix has to be created. This needs memory quadratic in the number of vertices."))
+            mat = np.zeros((self.__size, self.__size), dtype=self.__weights.dtype)
+            mat[np.repeat(np.arange(self.__size), np.diff(self.__indptr)), self.__indices] = self.__weights
+            mat.flags.writeable = False
+            return mat
         return self.__mat
         
     def return_adjacencyList(self):
         """Returns the adjacency list of the graph"""
+        if self.__sparse:
+            return tuple(self.return_adjacencies(v) for v in range(0,self.__size))
         return self.__adj
         
+    def return_csr(self):
+        """Returns the graph in compressed sparse row format as a tuple (indptr, indices, weights). The adjacencies of vertex v are stored in indices[indptr[v]:indptr[v+1]] with the corresponding weights, sorted by their end vertex and without duplicates."""
+        return self.__indptr, self.__indices, self.__weights
+        
+    def return_reverseCsr(self):
+        """Returns the transposed graph in compressed sparse row format as a tuple (indptr, indices, weights), i.e. indices[indptr[v]:indptr[v+1]] are the vertices with an edge to vertex v. The arrays are created on the first call."""
+        if self.__reverse_csr is None:
+            rows = np.repeat(np.arange(self.__size, dtype=self.__indices.dtype), np.diff(self.__indptr))
+            # Sorting the edges by end vertex, the start vertices of each end vertex remain sorted
+            order = np.argsort(self.__indices, kind="stable")
+            indptr = np.zeros(self.__size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.__indices, minlength=self.__size), out=indptr[1:])
+            self.__reverse_csr = (indptr, rows[order], self.__weights[order])
+            for arr in self.__reverse_csr:
+                arr.flags.writeable = False
+        return self.__reverse_csr
+        
+    def return_topologicalOrder(self):
+        """Returns the vertex indices in topological order as an array, i.e. each edge leads from an earlier to a later vertex (Kahn's algorithm). Raises a ValueError if the graph contains circles."""
+        indptr, indices, weights = self.return_csr()
+        order = _topological_order(indptr, indices)
+        if len(order) < self.return_num_vertices():
+            raise ValueError("The graph contains circles and has no topological order.")
+        return order
+        
+    def return_nbytes(self):
+        """Returns an estimate of the memory occupied by the graph in bytes"""
+        nbytes = sum(arr.nbytes for arr in (self.__indptr, self.__indices, self.__weights, self.__indeg))
+        if self.__reverse_csr is not None:
+            nbytes += sum(arr.nbytes for arr in self.__reverse_csr)
+        if not self.__sparse:
+            nbytes += self.__mat.nbytes + sys.getsizeof(self.__adj) + sum(sys.getsizeof(x) for x in self.__adj)
+            # Each adjacency is a tuple of the index and the weight, estimated from the first one
+            if len(self.__indices) > 0:
+                first = next(x[0] for x in self.__adj if len(x) > 0)
+                nbytes += len(self.__indices) * (sys.getsizeof(first) + sys.getsizeof(first[0]) + sys.getsizeof(first[1]))
+        # Names are stored in a tuple and in a dictionary, estimated from the first name
+        nbytes += sys.getsizeof(self.__name_list) + sys.getsizeof(self.__names)
+        if self.__size > 0:
+            nbytes += self.__size * sys.getsizeof(self.__name_list[0])
+        return nbytes
+        
+    def is_sparse(self):
+        """Returns whether the graph is stored in sparse format only"""
+        return self.__sparse
+        
     def return_weightType(self):
         """Returns the data type of the edge weights"""
         return self.__type
@@ -187,31 +740,37 @@ class Graph:
         """Returns the name of a node, given an index"""
         return self.__name_list[index]
     
+    def return_hash(self):
+        """Returns a hash of the names, edges and weights of the graph as a hexadecimal string, which is equal for graphs of equal content and stable across processes. The hash is computed on the first call."""
+        if self.__hash is None:
+            code, weights = _edge_codes(self)
+            content = hashlib.blake2b(digest_size=16)
+            content.update(repr(self.__name_list).encode("utf-8"))
+            content.update(code.tobytes())
+            content.update(weights.dtype.str.encode("utf-8"))
+            content.update(np.ascontiguousarray(weights).tobytes())
+            self.__hash = content.hexdigest()
+        return self.__hash
+    
     def is_subgraph_of(self, other):
-        """Returns 'True' if the considered graph is a subgraph of the given graph, otherwise 'False'"""
-        # If it is already recognized that it is a subgraph this procedure can be skipped.
-        if other in self.__supergraph :
-            return True
-        
-        if type(self)!=type(other):
+        """Returns 'True' if the considered graph is a subgraph of the given graph, otherwise 'False'. Results are stored by the content hashes of both graphs."""
+        # Both modules import this one, so they are imported on demand
+        from graph_results import _Subgraph
+        from graph_mutable import MutableGraph
+        if not isinstance(other, (Graph, _Subgraph)):
             raise TypeError("Only works between graphs.")
         elif other.return_num_vertices() == 0:
             return False
-        elif self.return_num_vertices() == 0:
+        elif self.return_num_vertices() == 0 or other is self:
             return True
-        names_to_check = self.return_names()
-        # Checks if the vertices are a subset
-        if not set(names_to_check).issubset(set(other.return_names())):
-            return False
-        
-        # Traverses each node and checks if the adjacencies build a subset.
-        # To do so, the node indices must be replaced by node names.
-        # This is laborious, but only needs to be done once.
-        for name in names_to_check:
-            selflist  = set(map(lambda x: (self.return_vertexName(x[0]),x[1]), self.return_adjacencies(self.return_vertexIndex(name))))
-            otherlist = set(map(lambda x: (other.return_vertexName(x[0]),x[1]), other.return_adjacencies(other.return_vertexIndex(name))))
-            if not selflist.issubset(otherlist):
-                return False
-        self.__supergraph.append(other)
-        
-        return True
+        # Paths and trees returned by the algorithms have no hash, and the hash of a mutable graph belongs to a frozen copy of its current version, which is replaced by each change
+        memoizable = not any(isinstance(x, (_Subgraph, MutableGraph)) for x in (self, other))
+        if not memoizable:
+            return _is_subgraph(self, other)
+        # If it is already recognized whether it is a subgraph this procedure can be skipped.
+        key = (self.return_hash(), other.return_hash())
+        known = _subgraph_memo.get(key)
+        if known is None:
+            known = _is_subgraph(self, other)
+            _subgraph_memo.put(key, known, 0)
+        return known
@@ -0,0 +1,253 @@
+import numpy as np
+import math
+from heapq import heappush, heappop
+
+from graph import Graph
+from graph_dijkstra import Dijkstra
+from graph_results import Path
+from graph_mutable import MutableGraph
+
+
+def _reverse_graph(g):
+    """Creates the graph with reversed edges, whose shortest paths to a vertex are the shortest paths from it in the given graph."""
+    indptr, indices, weights = g.return_csr()
+    sources = np.repeat(np.arange(g.return_num_vertices()), np.diff(indptr))
+    return Graph.from_edges(indices, sources, weights, vertexNames=list(range(0, g.return_num_vertices())), sparse=True)
+
+
+def _avoid(dist, parent, lower, covered):
+    """Avoid heuristic of Goldberg and Harrelson on the shortest path tree given by 'dist' and 'parent' (-1 for the root and unreached vertices). The weight of a vertex is the gap between its distance and the lower bound 'lower' of the current landmarks. The size of a vertex is the sum of the weights of its subtree, or 0 if the subtree contains a landmark ('covered'). Starting at the root, the child of the largest size is followed down to a leaf, which is returned, or None if all sizes are 0."""
+    reached = np.flatnonzero(dist < math.inf)
+    size = np.where(dist < math.inf, dist - lower, 0.0)
+    covered = covered.copy()
+    # Children have larger distances than their parents, so the subtrees are accumulated from the largest distance downwards
+    for v in reached[np.argsort(-dist[reached], kind="stable")].tolist():
+        p = parent[v]
+        if covered[v]:
+            size[v] = 0
+            if p >= 0:
+                covered[p] = True
+        elif p >= 0:
+            size[p] += size[v]
+    children = {}
+    for v in reached.tolist():
+        if parent[v] >= 0 and size[v] > 0:
+            children.setdefault(int(parent[v]), []).append(v)
+    root = int(reached[np.argmin(dist[reached])])
+    if size[root] <= 0:
+        return None
+    v = root
+    while v in children:
+        v = max(children[v], key=lambda c: size[c])
+    return v if v != root else None
+
+
+def _astar(indptr, indices, weights, source, target, potential):
+    """A* search on CSR lists from the source to the target, which settles the vertices in the order of their distance plus the potential, a lower bound of their distance to the target. Vertices with an infinite potential cannot reach the target and are not pushed. Returns the distance and the path as a tuple of vertex indices, which is empty if the target is not reachable."""
+    dist = {source: 0}
+    prev = {source: None}
+    settled = set()
+    # Potentials are computed once per vertex
+    bounds = {}
+    heap = [(potential(source), source)]
+    while heap:
+        key, u = heappop(heap)
+        if u in settled:
+            continue
+        if u == target:
+            path = [u]
+            while prev[path[-1]] is not None:
+                path.append(prev[path[-1]])
+            return dist[u], tuple(path[::-1])
+        settled.add(u)
+        d = dist[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist.get(v, math.inf):
+                h = bounds.get(v)
+                if h is None:
+                    h = bounds[v] = potential(v)
+                if h == math.inf:
+                    continue
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt + h, v))
+    return math.inf, ()
+
+
+class ALT:
+
+    # Available heuristics to select the landmarks
+    selections = ("farthest", "avoid")
+
+    def __init__(self, g: Graph, **optional):
+        """Constructor of the landmark index (A*, Landmarks, Triangle inequality) for point-to-point queries on a static graph. 'g' should contain the graph to be considered. The optional parameter 'landmarks' sets the number of landmarks (default: 8) or a list of landmark vertices, 'selection' the heuristic choosing them: 'farthest' (default) adds the vertex farthest from the landmarks chosen so far, 'avoid' adds a leaf of the shortest path tree of a random vertex in a region badly covered by the lower bounds. 'seed' seeds the random choices. The distances from and to each landmark are computed by Dijkstra objects, to which the optional parameter 'engine' is passed on."""
+        self.__graph = g
+        size = g.return_num_vertices()
+        count = optional["landmarks"] if "landmarks" in optional else 8
+        self.__selection = optional["selection"] if "selection" in optional else "farthest"
+        if self.__selection not in ALT.selections:
+            raise ValueError("\'selection\' has to be one of " + str(ALT.selections) + ".")
+        engine = {"engine": optional["engine"]} if "engine" in optional else {}
+        self.__rng = np.random.default_rng(optional["seed"] if "seed" in optional else None)
+        self.__forward_dijkstra = Dijkstra(g, cacheBytes=0, **engine)
+        self.__backward_dijkstra = Dijkstra(_reverse_graph(g), cacheBytes=0, **engine)
+        # Distances from the landmarks (forward) and to the landmarks (backward), one row per landmark
+        self.__landmarks = []
+        self.__forward = np.zeros((0, size))
+        self.__backward = np.zeros((0, size))
+        if isinstance(count, (int, np.integer)):
+            if count < 1:
+                raise ValueError("At least one landmark is required.")
+            for i in range(0, min(count, size)):
+                self.__add_landmark(self.__select())
+        else:
+            for landmark in count:
+                if not 0 <= landmark < size:
+                    raise ValueError("The landmarks have to be vertex indices of the graph.")
+                self.__add_landmark(int(landmark))
+        self.__lists = None
+        # The index does not follow changes of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
+
+    @classmethod
+    def load(cls, g: Graph, path):
+        """Loads an index stored with 'save' for the given graph. A ValueError is raised if the file was created for another graph."""
+        with np.load(path) as data:
+            if str(data["hash"]) != g.return_hash():
+                raise ValueError("The index was created for another graph.")
+            index = cls.__new__(cls)
+            index.__graph = g
+            index.__selection = str(data["selection"])
+            index.__landmarks = data["landmarks"].tolist()
+            index.__forward = data["forward"]
+            index.__backward = data["backward"]
+        index.__rng = None
+        index.__forward_dijkstra = None
+        index.__backward_dijkstra = None
+        index.__lists = None
+        if isinstance(g, MutableGraph):
+            g.add_listener(index.__graph_changed)
+        return index
+
+    def save(self, path):
+        """Stores the landmarks and their distances together with the hash of the graph in a .npz file, which can be loaded with 'ALT.load'."""
+        self.__check()
+        np.savez(path, landmarks=np.array(self.__landmarks, dtype=np.int64), forward=self.__forward, backward=self.__backward,
+                 selection=np.array(self.__selection), hash=np.array(self.__graph.return_hash()))
+
+    def return_graph(self):
+        """Returns the considered graph."""
+        return self.__graph
+
+    def return_landmarks(self):
+        """Returns the landmark vertices as a tuple."""
+        return tuple(self.__landmarks)
+
+    def return_bounds(self, startVertex, endVertex):
+        """Returns a lower and an upper bound of the distance between the given start and end vertex in O(k) for k landmarks. By the triangle inequality the distance is at least d(L, end) - d(L, start) and d(start, L) - d(end, L) and at most d(start, L) + d(L, end) for every landmark L."""
+        self.__check()
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        if startVertex == endVertex:
+            return 0.0, 0.0
+        forward = self.__forward
+        backward = self.__backward
+        with np.errstate(invalid="ignore"):
+            gaps = np.concatenate((forward[:, endVertex] - forward[:, startVertex], backward[:, startVertex] - backward[:, endVertex]))
+        # Differences of two infinite distances do not bound anything
+        gaps = gaps[~np.isnan(gaps)]
+        lower = max(0.0, float(gaps.max())) if len(gaps) > 0 else 0.0
+        upper = float(np.min(backward[:, startVertex] + forward[:, endVertex]))
+        return lower, upper
+
+    def return_distance(self, startVertex, endVertex):
+        """Returns the length of the shortest path between the given start and end vertex, 'inf' if no path exists."""
+        return self.__query(startVertex, endVertex)[0]
+
+    def return_path(self, startVertex, endVertex):
+        """Returns the shortest path between the given start and end vertex as a tuple of vertex indices, which is empty if no path exists. The path is searched by A* with the lower bounds of the landmarks."""
+        return self.__query(startVertex, endVertex)[1]
+
+    def return_shortestPath(self, startVertex, endVertex):
+        """Returns the shortest path between specified start and end vertex as a path, which answers the queries of the Graph class."""
+        path = self.return_path(startVertex, endVertex)
+        return Path(self.__graph, path if len(path) > 1 else ())
+
+    def __query(self, startVertex, endVertex):
+        """Searches the shortest path by A* and returns its length and its vertices."""
+        self.__check()
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        if startVertex == endVertex:
+            return 0, (startVertex,)
+        indptr, indices, weights, forward, backward = self.__query_lists()
+        to_target = forward[endVertex]
+        from_target = backward[endVertex]
+        def potential(v):
+            # inf - inf is nan, for which both comparisons are False
+            bound = 0
+            for a, b in zip(to_target, forward[v]):
+                if a - b > bound:
+                    bound = a - b
+            for a, b in zip(backward[v], from_target):
+                if a - b > bound:
+                    bound = a - b
+            return bound
+        return _astar(indptr, indices, weights, startVertex, endVertex, potential)
+
+    def __query_lists(self):
+        """Returns the CSR arrays and the distances of the landmarks per vertex as lists, which are created once."""
+        if self.__lists is None:
+            indptr, indices, weights = self.__graph.return_csr()
+            self.__lists = (indptr.tolist(), indices.tolist(), weights.tolist(), self.__forward.T.tolist(), self.__backward.T.tolist())
+        return self.__lists
+
+    def __select(self):
+        """Selects the next landmark with the chosen heuristic."""
+        size = self.__graph.return_num_vertices()
+        candidates = np.setdiff1d(np.arange(size), self.__landmarks)
+        if self.__selection == "avoid" and len(self.__landmarks) > 0:
+            root = int(self.__rng.choice(candidates))
+            dist = np.array(self.__forward_dijkstra.return_shortestPathLengths(root), dtype=np.float64)
+            parent = np.array([-1 if p is None else p for p in self.__forward_dijkstra.return_parent(root)], dtype=np.int64)
+            with np.errstate(invalid="ignore"):
+                gaps = np.concatenate((self.__forward - self.__forward[:, root:root + 1], self.__backward[:, root:root + 1] - self.__backward))
+            lower = np.max(np.where(np.isnan(gaps), 0, np.maximum(gaps, 0)), axis=0)
+            covered = np.zeros(size, dtype=bool)
+            covered[self.__landmarks] = True
+            landmark = _avoid(dist, parent, lower, covered)
+            if landmark is not None:
+                return landmark
+        if len(self.__landmarks) == 0:
+            # The first landmark is the vertex farthest from a random vertex
+            start = int(self.__rng.choice(candidates))
+            far = np.array(self.__forward_dijkstra.return_shortestPathLengths(start), dtype=np.float64) + np.array(self.__backward_dijkstra.return_shortestPathLengths(start), dtype=np.float64)
+        else:
+            # Distance to the closest landmark in both directions, unreachable vertices are the farthest
+            far = np.min(self.__forward + self.__backward, axis=0)
+        far = far[candidates]
+        return int(candidates[np.argmax(far)])
+
+    def __add_landmark(self, landmark):
+        """Computes the distances from and to the given landmark."""
+        forward = np.array(self.__forward_dijkstra.return_shortestPathLengths(landmark), dtype=np.float64)
+        backward = np.array(self.__backward_dijkstra.return_shortestPathLengths(landmark), dtype=np.float64)
+        self.__landmarks.append(landmark)
+        self.__forward = np.vstack((self.__forward, forward))
+        self.__backward = np.vstack((self.__backward, backward))
+
+    def __check(self):
+        """Raises a ValueError if the graph has been changed after the creation of the index."""
+        if self.__forward is None:
+            raise ValueError("The graph has been changed, the index has to be created again.")
+
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which invalidates the index, since its bounds may be wrong after a change."""
+        self.__forward = None
+        self.__backward = None
+        self.__lists = None
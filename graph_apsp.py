@@ -0,0 +1,177 @@
+import numpy as np
+import os
+import tempfile
+from warnings import warn
+
+from graph import Graph
+from graph_results import Path
+from graph_mutable import MutableGraph
+
+
+# Bytes of a tile of rows, which is updated for all vertices of a block while it stays in the cache
+_tile_bytes = 2**20
+
+
+def _available_memory():
+    """Returns the free physical memory in bytes or None if it cannot be determined."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _matrix(shape, dtype, fill, path=None):
+    """Creates a matrix filled with the given value, in a memory-mapped .npy file if a path is given."""
+    if path is None:
+        return np.full(shape, fill, dtype=dtype)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    # The file is filled in tiles of rows
+    rows = max(1, _tile_bytes // max(shape[1] * out.itemsize, 1))
+    for first in range(0, shape[0], rows):
+        out[first:first + rows] = fill
+    return out
+
+
+def _relax(dist, pred, column, row, predRow):
+    """Min-plus update of the rows 'dist' by the paths over one intermediate vertex k: dist[i, j] = min(dist[i, j], column[i] + row[j]), where 'column' is the column k of 'dist' and 'row' the row of k. Improved entries take the predecessor of j on the path from k, 'predRow'."""
+    candidate = column + row
+    if pred is None:
+        np.minimum(dist, candidate, out=dist)
+        return
+    better = candidate < dist
+    np.copyto(dist, candidate, where=better)
+    np.copyto(pred, np.broadcast_to(predRow, pred.shape), where=better)
+
+
+def _floyd_warshall(dist, pred, block):
+    """Blocked Floyd–Warshall on the distance matrix 'dist' and the predecessor matrix 'pred' (or None), which are updated in place. The vertices are processed in blocks K of the given size: the rows K are closed over the intermediate vertices K first, then all other rows are updated tile by tile with the closed rows K. A tile is updated once per vertex of K while it stays in the cache, and each update is a single numpy operation on the whole tile."""
+    size = dist.shape[0]
+    tile = max(1, _tile_bytes // max(size * dist.itemsize, 1))
+    for first in range(0, size, block):
+        last = min(first + block, size)
+        rows = dist[first:last]
+        predRows = pred[first:last] if pred is not None else None
+        for k in range(first, last):
+            _relax(rows, predRows, rows[:, k:k + 1], dist[k], None if pred is None else pred[k])
+        for start, stop in ((0, first), (last, size)):
+            for low in range(start, stop, tile):
+                current = dist[low:min(low + tile, stop)]
+                currentPred = pred[low:min(low + tile, stop)] if pred is not None else None
+                for k in range(first, last):
+                    _relax(current, currentPred, current[:, k:k + 1], dist[k], None if pred is None else pred[k])
+
+
+class FloydWarshall:
+    
+    def __init__(self, g: Graph, **optional):
+        """Constructor of the class of all-pairs shortest paths for dense graphs. 'g' should contain the graph to be considered. On the first query a blocked Floyd–Warshall computes the matrix of path lengths and the matrix of predecessors with numpy min-plus operations in O(V³). The optional parameter 'dtype' (np.float64 or np.float32) sets the data type of the path lengths, 'block' the number of intermediate vertices per block (default: 128) and 'predecessors' set to False skips the predecessors, which makes the computation faster, but only the path lengths can be queried then. With the optional parameters 'path' and 'predecessorPath' the matrices are stored in memory-mapped .npy files. If they are not given and the matrices do not fit into the free memory, they are stored in temporary files."""
+        self.__graph = g
+        self.__dtype = np.dtype(optional["dtype"] if "dtype" in optional else np.float64)
+        if self.__dtype.kind != "f":
+            raise TypeError("\'dtype\' has to be a floating point type.")
+        self.__block = int(optional["block"]) if "block" in optional else 128
+        if self.__block < 1:
+            raise ValueError("\'block\' has to be at least 1.")
+        self.__with_pred = bool(optional["predecessors"]) if "predecessors" in optional else True
+        self.__path = optional["path"] if "path" in optional else None
+        self.__pred_path = optional["predecessorPath"] if "predecessorPath" in optional else None
+        # Matrices of the path lengths and of the predecessors, which are computed on the first query
+        self.__dist = None
+        self.__pred = None
+        # Directory of the temporary files, which is deleted together with the object
+        self.__directory = None
+        # The matrices are computed again after a change of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
+            
+    def return_graph(self):
+        """Returns the considered graph."""
+        return self.__graph
+        
+    def return_distances(self):
+        """Returns the matrix of the lengths of the shortest paths, whose entry (i, j) is the length from vertex i to vertex j and 'inf' if j is not reachable."""
+        self.__compute()
+        return self.__dist
+        
+    def return_predecessors(self):
+        """Returns the matrix of predecessors, whose entry (i, j) is the vertex before j on the shortest path from i to j, and -1 for i == j and unreachable vertices."""
+        self.__compute()
+        if self.__pred is None:
+            raise ValueError("The predecessors have not been computed, since \'predecessors\' was set to False.")
+        return self.__pred
+        
+    def return_shortestPathLengths(self, startVertex):
+        """Returns a list of the shortest paths starting from the specified start vertex."""
+        return tuple(self.return_distances()[startVertex].tolist())
+        
+    def return_parent(self, startVertex):
+        """Returns a list of parent nodes for the shortest paths starting from the specified start vertex."""
+        return tuple(None if p < 0 else p for p in self.return_predecessors()[startVertex].tolist())
+        
+    def return_path(self, startVertex, endVertex):
+        """Returns the shortest path between the specified start and end vertex as a tuple of vertex indices, which is empty if no path exists."""
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        pred = self.return_predecessors()[startVertex]
+        if endVertex != startVertex and pred[endVertex] < 0:
+            return ()
+        path = [endVertex]
+        while path[-1] != startVertex:
+            path.append(int(pred[path[-1]]))
+        return tuple(path[::-1])
+        
+    def return_shortestPath(self, startVertex, endVertex):
+        """Returns the shortest path between specified start and end vertex as a path, which answers the queries of the Graph class."""
+        path = self.return_path(startVertex, endVertex)
+        return Path(self.__graph, path if len(path) > 1 else ())
+        
+    def __compute(self):
+        """Computes the matrices of path lengths and predecessors, if they do not exist yet."""
+        if self.__dist is not None:
+            return
+        size = self.__graph.return_num_vertices()
+        pred_dtype = np.int32 if size < 2**31 else np.int64
+        path, pred_path = self.__path, self.__pred_path
+        needed = size * size * (self.__dtype.itemsize + (np.dtype(pred_dtype).itemsize if self.__with_pred else 0))
+        available = _available_memory()
+        if path is None and available is not None and needed > available:
+            path = self.__temporary()
+            pred_path = self.__temporary() if self.__with_pred and pred_path is None else pred_path
+            warn(Warning("The matrices of all-pairs shortest paths do not fit into the free memory and are stored in " + str(path) + (" and " + str(pred_path) if pred_path is not None else "") + "."))
+        indptr, indices, weights = self.__graph.return_csr()
+        sources = np.repeat(np.arange(size), np.diff(indptr))
+        dist = _matrix((size, size), self.__dtype, np.inf, path)
+        dist[sources, indices] = weights
+        diagonal = np.arange(size)
+        dist[diagonal, diagonal] = 0
+        if self.__with_pred:
+            pred = _matrix((size, size), pred_dtype, -1, pred_path)
+            pred[sources, indices] = sources
+            pred[diagonal, diagonal] = -1
+        else:
+            pred = None
+        _floyd_warshall(dist, pred, self.__block)
+        for matrix in (dist, pred):
+            if isinstance(matrix, np.memmap):
+                matrix.flush()
+            if matrix is not None:
+                matrix.flags.writeable = False
+        self.__dist, self.__pred = dist, pred
+        
+    def __temporary(self):
+        """Creates a temporary .npy file in the directory of the object and returns its path."""
+        if self.__directory is None:
+            # TemporaryDirectory removes itself with all files when it is garbage collected
+            self.__directory = tempfile.TemporaryDirectory()
+        handle, path = tempfile.mkstemp(suffix=".npy", dir=self.__directory.name)
+        os.close(handle)
+        return path
+        
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which drops the computed matrices and their temporary files."""
+        self.__dist = None
+        self.__pred = None
+        if self.__directory is not None:
+            self.__directory.cleanup()
+            self.__directory = None
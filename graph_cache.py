@@ -0,0 +1,226 @@
+import sys
+import weakref
+import numpy as np
+from collections import OrderedDict
+from threading import RLock
+
+
+def _sizeof(value):
+    """Estimates the memory occupied by a value in bytes. Numpy arrays and graphs report their size themselves, long tuples and lists are estimated from their first item."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "return_nbytes"):
+        return value.return_nbytes()
+    if isinstance(value, (tuple, list)):
+        size = sys.getsizeof(value)
+        if len(value) > 16:
+            return size + len(value) * _sizeof(value[0])
+        return size + sum(_sizeof(x) for x in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+
+    # Available eviction policies
+    policies = ("lru", "lfu")
+
+    def __init__(self, maxBytes=None, **optional):
+        """Constructor of the result cache. 'maxBytes' limits the estimated memory of all stored values (default: no limit). The optional parameter 'maxEntries' limits the number of stored values and 'policy' selects the eviction policy: 'lru' (default) evicts the least recently used value, 'lfu' the least frequently used value, where ties are evicted in least recently used order."""
+        if maxBytes != None and maxBytes < 0:
+            raise ValueError("\'maxBytes\' has to be >= 0.")
+        self.__max_bytes = maxBytes
+        if "maxEntries" in optional:
+            self.__max_entries = optional["maxEntries"]
+            if self.__max_entries != None and self.__max_entries < 0:
+                raise ValueError("\'maxEntries\' has to be >= 0.")
+        else:
+            self.__max_entries = None
+        if "policy" in optional:
+            self.__policy = optional["policy"]
+            if self.__policy not in ResultCache.policies:
+                raise ValueError("\'policy\' has to be one of " + str(ResultCache.policies) + ".")
+        else:
+            self.__policy = "lru"
+
+        # Stored values with their sizes and use counts: key -> [value, nbytes, count]
+        self.__entries = {}
+        # Keys grouped by use count, each group ordered from least to most recently used. With LRU all keys are in group 0.
+        self.__groups = {}
+        # Keys, which are tuples, grouped by their first element (the owner)
+        self.__owners = {}
+        self.__nbytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        # The cache may be shared by algorithm objects used in several threads
+        self.__lock = RLock()
+
+    def get(self, key, default=None):
+        """Returns the value stored under the given key or 'default' if there is none. Counts a hit or a miss."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return default
+            self.__hits += 1
+            self.__touch(key, entry)
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """Stores the value under the given key and evicts other values until the limits are satisfied. 'nbytes' is the size of the value in bytes, which is estimated if not given. Values larger than the byte limit are not stored."""
+        if nbytes == None:
+            nbytes = _sizeof(value)
+        with self.__lock:
+            count = 0
+            if key in self.__entries:
+                count = self.__entries[key][2]
+                self.__discard(key)
+            if self.__max_bytes != None and nbytes > self.__max_bytes:
+                return
+            # Other values are evicted before the new value is stored, so with LFU a new value is not evicted right away
+            while len(self.__entries) > 0 and ((self.__max_bytes != None and self.__nbytes + nbytes > self.__max_bytes) or (self.__max_entries != None and len(self.__entries) >= self.__max_entries)):
+                self.__evict()
+            if self.__max_entries == 0:
+                return
+            self.__entries[key] = [value, nbytes, count]
+            self.__groups.setdefault(count, OrderedDict())[key] = None
+            if type(key) == tuple and len(key) > 0:
+                self.__owners.setdefault(key[0], set()).add(key)
+            self.__nbytes += nbytes
+
+    def peek(self, key, default=None):
+        """Returns the value stored under the given key or 'default' if there is none, without counting a hit or a miss and without marking the key as used."""
+        entry = self.__entries.get(key)
+        return default if entry is None else entry[0]
+
+    def return_keys(self, owner):
+        """Returns a list of all keys, which are tuples starting with the given owner."""
+        with self.__lock:
+            return list(self.__owners.get(owner, ()))
+
+    def remove(self, key):
+        """Removes the value stored under the given key, if there is one."""
+        with self.__lock:
+            if key in self.__entries:
+                self.__discard(key)
+
+    def remove_owner(self, owner):
+        """Removes all values whose key is a tuple starting with the given owner."""
+        with self.__lock:
+            for key in list(self.__owners.get(owner, ())):
+                self.__discard(key)
+
+    def clear(self):
+        """Removes all values. The counters are kept."""
+        with self.__lock:
+            self.__entries = {}
+            self.__groups = {}
+            self.__owners = {}
+            self.__nbytes = 0
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    # Getter-methods
+    def return_maxBytes(self):
+        """Returns the limit of the memory of all stored values in bytes (None for no limit)."""
+        return self.__max_bytes
+
+    def return_maxEntries(self):
+        """Returns the limit of the number of stored values (None for no limit)."""
+        return self.__max_entries
+
+    def return_policy(self):
+        """Returns the eviction policy."""
+        return self.__policy
+
+    def return_nbytes(self):
+        """Returns the estimated memory of all stored values in bytes."""
+        return self.__nbytes
+
+    def return_hits(self):
+        """Returns the number of lookups, which found a value."""
+        return self.__hits
+
+    def return_misses(self):
+        """Returns the number of lookups, which found no value."""
+        return self.__misses
+
+    def return_evictions(self):
+        """Returns the number of values evicted to satisfy the limits."""
+        return self.__evictions
+
+    def return_stats(self):
+        """Returns a dictionary of the counters, the number of stored values and their memory."""
+        return {"hits": self.__hits, "misses": self.__misses, "evictions": self.__evictions, "entries": len(self.__entries), "nbytes": self.__nbytes}
+
+    # Subfunctions
+    def __touch(self, key, entry):
+        """Marks the given key as most recently used and with LFU increments its use count."""
+        group = self.__groups[entry[2]]
+        if self.__policy == "lru":
+            group.move_to_end(key)
+            return
+        del group[key]
+        if len(group) == 0:
+            del self.__groups[entry[2]]
+        entry[2] += 1
+        self.__groups.setdefault(entry[2], OrderedDict())[key] = None
+
+    def __discard(self, key):
+        """Removes the given key from the entries and its group."""
+        value, nbytes, count = self.__entries.pop(key)
+        group = self.__groups[count]
+        del group[key]
+        if len(group) == 0:
+            del self.__groups[count]
+        if type(key) == tuple and len(key) > 0:
+            owned = self.__owners[key[0]]
+            owned.discard(key)
+            if len(owned) == 0:
+                del self.__owners[key[0]]
+        self.__nbytes -= nbytes
+
+    def __evict(self):
+        """Evicts the least recently used key of the group with the smallest use count."""
+        group = self.__groups[min(self.__groups)]
+        self.__discard(next(iter(group)))
+        self.__evictions += 1
+
+
+# Cache used by all algorithm objects, which are not given a cache of their own
+_default_cache = ResultCache(256 * 2**20)
+
+
+def return_default_cache():
+    """Returns the cache used by all algorithm objects, which are not given a cache of their own."""
+    return _default_cache
+
+
+def set_default_cache(cache: ResultCache):
+    """Sets the cache used by algorithm objects created afterwards, which are not given a cache of their own."""
+    global _default_cache
+    if not isinstance(cache, ResultCache):
+        raise TypeError("\'cache\' has to be a ResultCache.")
+    _default_cache = cache
+
+
+def _owner_cache(owner, optional):
+    """Returns the cache selected by the optional parameters of an algorithm object: 'cache' passes a ResultCache, 'cacheBytes' creates a LRU cache of its own with the given byte limit, otherwise the default cache is used. The values of the owner are removed from the cache as soon as the owner is garbage collected. Returns the cache and the key prefix of the owner."""
+    if "cache" in optional:
+        cache = optional["cache"]
+        if not isinstance(cache, ResultCache):
+            raise TypeError("\'cache\' has to be a ResultCache.")
+    elif "cacheBytes" in optional:
+        cache = ResultCache(optional["cacheBytes"])
+    else:
+        cache = _default_cache
+    # Unlike id(owner), a new object cannot be reused as a key prefix by another owner
+    prefix = object()
+    weakref.finalize(owner, cache.remove_owner, prefix)
+    return cache, prefix
@@ -0,0 +1,236 @@
+import numpy as np
+import math
+from heapq import heappush, heappop
+
+from graph import Graph
+from graph_results import Path
+from graph_mutable import MutableGraph
+
+
+def _witness(out, source, avoid, limit, maxSettled):
+    """Local Dijkstra search from the source in the remaining graph 'out' (vertex -> {vertex: weight}) without the vertex 'avoid'. It stops at the distance 'limit' or after 'maxSettled' settled vertices. Returns the tentative distances, which are upper bounds of the distances in the remaining graph."""
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > limit or settled >= maxSettled:
+            break
+        settled += 1
+        for v, w in out[u].items():
+            if v == avoid:
+                continue
+            alt = d + w
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heappush(heap, (alt, v))
+    return dist
+
+
+def _shortcuts(out, inc, x, maxSettled):
+    """Returns the shortcuts (u, v, weight) required by the contraction of x: for each pair of an incoming edge (u, x) and an outgoing edge (x, v) the path u, x, v is kept as a shortcut unless a witness search finds a path from u to v of at most the same length without x."""
+    shortcuts = []
+    outgoing = list(out[x].items())
+    if not outgoing:
+        return shortcuts
+    for u, first in inc[x].items():
+        targets = [(v, first + second) for v, second in outgoing if v != u]
+        if not targets:
+            continue
+        dist = _witness(out, u, x, max(length for v, length in targets), maxSettled)
+        shortcuts.extend((u, v, length) for v, length in targets if dist.get(v, math.inf) > length)
+    return shortcuts
+
+
+def _csr(size, edges):
+    """Creates CSR arrays (indptr, indices, weights, middle) from a list of edges (u, v, weight, middle)."""
+    if edges:
+        src, dst, weights, middle = (list(x) for x in zip(*edges))
+    else:
+        src, dst, weights, middle = [], [], [], []
+    src = np.array(src, dtype=np.int64)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=size), out=indptr[1:])
+    return indptr, np.array(dst, dtype=np.int64)[order], np.array(weights)[order], np.array(middle, dtype=np.int64)[order]
+
+
+def _ch_query(up, down, source, target):
+    """Bidirectional Dijkstra on the upward graph 'up' from the source and on the reversed downward graph 'down' from the target, both as CSR lists (indptr, indices, weights). Both searches only climb to vertices of higher rank and meet at the highest vertex of the shortest path. A settled vertex is stalled, i.e. its edges are not relaxed, if a vertex of higher rank reached by the same search leads to it on a shorter path, which the edges of the other graph reveal. A search stops as soon as its smallest tentative distance is not smaller than the best path found. Returns the length, the meeting vertex and the parents of both searches."""
+    dists = ({source: 0}, {target: 0})
+    parents = ({source: None}, {target: None})
+    heaps = ([(0, source)], [(0, target)])
+    graphs = (up, down)
+    best = math.inf
+    meet = None
+    while True:
+        tops = [heap[0][0] if heap else math.inf for heap in heaps]
+        side = 0 if tops[0] <= tops[1] else 1
+        if tops[side] >= best:
+            break
+        dist, other, parent, heap = dists[side], dists[1 - side], parents[side], heaps[side]
+        indptr, indices, weights = graphs[side]
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        if u in other and d + other[u] < best:
+            best = d + other[u]
+            meet = u
+        # Stall on demand: the edges of the other graph at u come from vertices of higher rank
+        stallIndptr, stallIndices, stallWeights = graphs[1 - side]
+        if any(dist.get(stallIndices[k], math.inf) + stallWeights[k] < d for k in range(stallIndptr[u], stallIndptr[u + 1])):
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                parent[v] = u
+                heappush(heap, (alt, v))
+    return best, meet, parents
+
+
+class ContractionHierarchy:
+
+    def __init__(self, g: Graph, **optional):
+        """Constructor of the contraction hierarchy of a graph for fast point-to-point queries on a static graph. 'g' should contain the graph to be considered. The vertices are contracted in the order of their edge difference (shortcuts added minus edges removed) plus the number of contracted neighbours, which is updated lazily. Contracting a vertex adds a shortcut for each path over it, for which a witness search settling at most 'witnessLimit' vertices (optional parameter, default: 64) finds no path of the same length. A smaller limit makes the preprocessing faster, but adds more shortcuts. The edges to vertices of higher rank form the upward graph, the edges from vertices of higher rank the downward graph, both are stored as CSR arrays."""
+        self.__graph = g
+        self.__witness_limit = int(optional["witnessLimit"]) if "witnessLimit" in optional else 64
+        if self.__witness_limit < 1:
+            raise ValueError("\'witnessLimit\' has to be at least 1.")
+        self.__contract()
+        # The hierarchy does not follow changes of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
+
+    def return_graph(self):
+        """Returns the considered graph."""
+        return self.__graph
+
+    def return_rank(self):
+        """Returns the rank of each vertex, i.e. the position of the vertex in the contraction order, as an array."""
+        return self.__rank
+
+    def return_num_shortcuts(self):
+        """Returns the number of shortcuts added by the contraction."""
+        return self.__num_shortcuts
+
+    def return_upwardCsr(self):
+        """Returns the upward graph as CSR arrays (indptr, indices, weights, middle), which contain the edges to vertices of higher rank. 'middle' is the contracted vertex of a shortcut and -1 for an edge of the graph."""
+        return self.__up
+
+    def return_downwardCsr(self):
+        """Returns the reversed downward graph as CSR arrays (indptr, indices, weights, middle), i.e. indices[indptr[v]:indptr[v+1]] are the vertices of higher rank with an edge to vertex v. 'middle' is the contracted vertex of a shortcut and -1 for an edge of the graph."""
+        return self.__down
+
+    def return_distance(self, startVertex, endVertex):
+        """Returns the length of the shortest path between the given start and end vertex, 'inf' if no path exists."""
+        return self.__search(startVertex, endVertex)[0]
+
+    def return_path(self, startVertex, endVertex):
+        """Returns the shortest path between the given start and end vertex as a tuple of vertex indices, which is empty if no path exists. The shortcuts of the path in the hierarchy are unpacked into edges of the graph."""
+        length, meet, (forward, backward) = self.__search(startVertex, endVertex)
+        if meet is None:
+            return ()
+        # Edges of the path in the hierarchy, up from the start vertex and down to the end vertex
+        vertices = [meet]
+        while forward[vertices[-1]] is not None:
+            vertices.append(forward[vertices[-1]])
+        vertices.reverse()
+        while backward[vertices[-1]] is not None:
+            vertices.append(backward[vertices[-1]])
+        path = [startVertex]
+        for u, v in zip(vertices, vertices[1:]):
+            path.extend(self.__unpack(u, v))
+        return tuple(path)
+
+    def return_shortestPath(self, startVertex, endVertex):
+        """Returns the shortest path between specified start and end vertex as a path, which answers the queries of the Graph class."""
+        path = self.return_path(startVertex, endVertex)
+        return Path(self.__graph, path if len(path) > 1 else ())
+
+    def __contract(self):
+        """Contracts all vertices and creates the upward and the downward graph."""
+        size = self.__graph.return_num_vertices()
+        indptr, indices, weights = self.__graph.return_csr()
+        indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+        # Remaining graph with shortcuts as outgoing and incoming edges per vertex
+        out = [dict(zip(indices[indptr[u]:indptr[u + 1]], weights[indptr[u]:indptr[u + 1]])) for u in range(0, size)]
+        inc = [{} for v in range(0, size)]
+        for u in range(0, size):
+            for v, w in out[u].items():
+                inc[v][u] = w
+        # Contracted vertex of each shortcut (u, v)
+        middle = {}
+        deleted = [0] * size
+        rank = np.zeros(size, dtype=np.int64)
+        up = []
+        down = []
+        self.__num_shortcuts = 0
+        heap = [(len(_shortcuts(out, inc, x, self.__witness_limit)) - len(out[x]) - len(inc[x]), x) for x in range(0, size)]
+        heap.sort()
+        position = 0
+        while heap:
+            priority, x = heappop(heap)
+            shortcuts = _shortcuts(out, inc, x, self.__witness_limit)
+            priority = len(shortcuts) - len(out[x]) - len(inc[x]) + deleted[x]
+            # Lazy update: a vertex, whose priority has grown, is put back
+            if heap and priority > heap[0][0]:
+                heappush(heap, (priority, x))
+                continue
+            for u, v, length in shortcuts:
+                if length < out[u].get(v, math.inf):
+                    out[u][v] = length
+                    inc[v][u] = length
+                    middle[(u, v)] = x
+                    self.__num_shortcuts += 1
+            rank[x] = position
+            position += 1
+            # All remaining neighbours are contracted later and thus have a higher rank
+            for v, w in out[x].items():
+                up.append((x, v, w, middle.get((x, v), -1)))
+                del inc[v][x]
+                deleted[v] += 1
+            for u, w in inc[x].items():
+                down.append((x, u, w, middle.get((u, x), -1)))
+                del out[u][x]
+                deleted[u] += 1
+            out[x] = {}
+            inc[x] = {}
+        self.__rank = rank
+        self.__middle = middle
+        self.__up = _csr(size, up)
+        self.__down = _csr(size, down)
+        self.__lists = tuple(tuple(x.tolist() for x in csr[:3]) for csr in (self.__up, self.__down))
+
+    def __search(self, startVertex, endVertex):
+        """Searches the shortest path in the hierarchy and returns its length, the meeting vertex and the parents of both searches."""
+        if self.__lists is None:
+            raise ValueError("The graph has been changed, the contraction hierarchy has to be created again.")
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        if startVertex == endVertex:
+            return 0, startVertex, ({startVertex: None}, {startVertex: None})
+        return _ch_query(*self.__lists, startVertex, endVertex)
+
+    def __unpack(self, u, v):
+        """Replaces the edge (u, v) of the hierarchy recursively by the edges of the graph. Returns the vertices after u."""
+        vertices = []
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            x = self.__middle.get((a, b))
+            if x is None:
+                vertices.append(b)
+            else:
+                # The second half is unpacked after the first one
+                stack.append((x, b))
+                stack.append((a, x))
+        return vertices
+
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which invalidates the hierarchy, since its shortcuts may be wrong after a change."""
+        self.__lists = None
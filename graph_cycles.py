@@ -1,20 +1,69 @@
 import numpy as np
 
-from graph import Graph
+from graph import Graph, _index_dtype
 from graph_explo import Graphexploration
 from graph_dijkstra import Dijkstra
+from graph_mutable import MutableGraph
+from graph_scc import StrongComponents, is_acyclic, _induced_components
+from graph_stats import Stats, _no_phase
+
+def _johnson_circuits(adj, start, maxLength):
+    """Circuit search of Johnson's algorithm, which yields all elementary circles through the vertex 'start' within the strongly connected component given by 'adj' as lists of vertices beginning with 'start'. Vertices are blocked while they cannot lead back to the start vertex, so each circle costs O(V+E). With 'maxLength', the circles are searched by a depth-limited search without blocking, since a vertex, that cannot be continued to a short circle on one path, may be on a shorter path later."""
+    path = [start]
+    blocked = {start}
+    # Vertices to unblock together with a vertex
+    b = {}
+    closed = set()
+    calls = [(start, list(adj[start]))]
+    while calls:
+        v, neighbors = calls[-1]
+        if neighbors:
+            w = neighbors.pop()
+            if w == start:
+                yield list(path)
+                closed.update(path)
+            elif w not in blocked and (maxLength is None or len(path) < maxLength):
+                path.append(w)
+                calls.append((w, list(adj[w])))
+                closed.discard(w)
+                blocked.add(w)
+                continue
+        if not neighbors:
+            # Without blocking, only the vertices of the path are blocked
+            if maxLength is not None or v in closed:
+                # Unblocking v and all vertices, that are blocked because of it
+                pending = [v]
+                while pending:
+                    u = pending.pop()
+                    if u in blocked:
+                        blocked.discard(u)
+                        pending.extend(b.pop(u, ()))
+            else:
+                for w in adj[v]:
+                    b.setdefault(w, set()).add(v)
+            calls.pop()
+            path.pop()
+
 
 class Circle:
     
     def __init__(self, g: Graph, **optional):
-        """Constructor for the circle class. 'g' should contain the graph to be considered. The optional parameter 'explo' should be set to a graph exploration class instance to avoid redundant computations. If minimal (by edge weight) circles instead of small circles are desired, the 'dijkstra' parameter should be set to an instance of the Dijkstra class."""
+        """Constructor for the circle class. 'g' should contain the graph to be considered. The optional parameter 'explo' should be set to a graph exploration class instance to avoid redundant computations. If minimal (by edge weight) circles instead of small circles are desired, the 'dijkstra' parameter should be set to an instance of the Dijkstra class. A Stats object passed by the optional parameter 'stats' measures the test for circles as phase 'search' and the creation of the circles as phase 'results'; it is passed on to the graph exploration created by this class."""
         self.__graph = g
+        if "stats" in optional:
+            self.__stats = optional["stats"]
+            if not isinstance(self.__stats, Stats):
+                raise TypeError("\'stats\' has to be a Stats object.")
+        else:
+            self.__stats = None
         if "explo" in optional:
             self.__explo = optional["explo"]
             if not isinstance(self.__explo, Graphexploration):
                 raise TypeError("The given \'explo\' argument contains no instance of the graph exploration class.")
             elif self.__explo.return_graph() != g:
                 raise ValueError("The given graph exploration class does not consider the given graph.")
+        elif self.__stats is not None:
+            self.__explo = Graphexploration(g, stats=self.__stats)
         else:
             self.__explo = Graphexploration(g)
         if "dijkstra" in optional:
@@ -28,14 +77,33 @@ class Circle:
             
         self.__cycles = []
         self.__num_cycles = -1
+        # Strongly connected components, which restrict the search for circles
+        self.__components = StrongComponents(g)
+        self.__acyclic = None
+        # The circles are searched again after a change of the edges of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
         
     def return_graph(self):
         """Returns the considered graph."""
         return self.__graph
     
     def is_acyclic(self):
-        """Returns 'True' if the graph does not contain circles."""
-        return self.return_numCircles() == 0
+        """Returns 'True' if the graph does not contain circles. Without already found circles, a single DFS stopping at the first circle decides it."""
+        if self.__num_cycles >= 0:
+            return self.__num_cycles == 0
+        if self.__acyclic is None:
+            with self.__phase("search"):
+                self.__acyclic = is_acyclic(self.__graph)
+        return self.__acyclic
+        
+    def return_stats(self):
+        """Returns the Stats object, which counts the work of this object, or None."""
+        return self.__stats
+        
+    def return_components(self):
+        """Returns the strongly connected components of the graph, which are used to restrict the search for circles."""
+        return self.__components
     
     def return_numCircles(self):
         """Returns the number of found minimal circles. Under certain circumstances not all circles are found."""
@@ -53,17 +121,54 @@ class Circle:
             self.__extract_cycles()
             return self.__cycles
             
+    def iter_cycles(self, max_length=None, limit=None):
+        """Generator of all elementary circles of the graph (Johnson's algorithm), which runs per strongly connected component. Each circle is yielded as an array of vertex indices beginning with its smallest vertex index, the edge back to it is not repeated. 'max_length' restricts the circles to at most this number of edges, 'limit' stops after this number of circles. The circles are created lazily, so the memory does not depend on the number of circles."""
+        if max_length is not None and max_length < 2:
+            return
+        indptr, indices = (x.tolist() for x in self.__graph.return_csr()[:2])
+        dtype = _index_dtype(self.__graph.return_num_vertices())
+        count = 0
+        # Components are processed from a stack, the remainder of a component without its smallest vertex is split into components again. Vertices of components of size 1 are not on any circle.
+        labels = self.__components.return_labels()
+        cyclic = self.__components.return_cyclicVertices()
+        # Grouped by component, each group sorted by vertex index
+        cyclic = cyclic[np.argsort(labels[cyclic], kind="stable")]
+        pending = [x.tolist() for x in np.split(cyclic, np.flatnonzero(np.diff(labels[cyclic])) + 1)] if len(cyclic) > 0 else []
+        while pending:
+            component = pending.pop()
+            members = set(component)
+            adj = {v: [w for w in indices[indptr[v]:indptr[v + 1]] if w in members] for v in component}
+            for cycle in _johnson_circuits(adj, component[0], max_length):
+                yield np.array(cycle, dtype=dtype)
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+            pending.extend(sorted(c) for c in _induced_components(indptr, indices, component[1:]) if len(c) > 1)
+            
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which drops the found circles if an edge has been changed. A new vertex has no edges and does not change the circles."""
+        if kind == "edge":
+            self.__cycles = []
+            self.__num_cycles = -1
+            self.__acyclic = None
+            
+    def __phase(self, name):
+        """Returns a context manager measuring the given phase, which does nothing without statistics."""
+        return _no_phase if self.__stats is None else self.__stats.phase(name)
+        
     def __extract_cycles(self):
         """Function to extract the minimum circles contained in the graph g."""
         backedges = self.__explo.return_backwardedges()
         for back in backedges:
             forward_path = self.__path_mode.return_shortestPath(back[1], back[0])
-            cycle_mat = np.copy(forward_path.return_adjacencyMatrix())
-            # Use names to convert the indices, because the node indices are not the same, since a path does not necessarily have the same adjacency matrix as the origin graph.
-            i_path = forward_path.return_vertexIndex(self.__graph.return_vertexName(back[0]))
-            j_path = forward_path.return_vertexIndex(self.__graph.return_vertexName(back[1]))
-            cycle_mat[i_path, j_path] = self.__graph.return_weight(back[0], back[1])
-            self.__cycles.append(Graph(cycle_mat, vertexNames=forward_path.return_names()))
+            # The edges of the path are taken by name, because the node indices are not the same, since a path does not necessarily have the same adjacency matrix as the origin graph.
+            cycle_list = [(forward_path.return_vertexName(i), forward_path.return_vertexName(j), w) for i in range(0, forward_path.return_num_vertices()) for j, w in forward_path.return_adjacencies(i)]
+            # Close the circle with the backward edge
+            cycle_list.append((self.__graph.return_vertexName(back[0]), self.__graph.return_vertexName(back[1]), self.__graph.return_weight(back[0], back[1])))
+            with self.__phase("results"):
+                self.__cycles.append(Graph(cycle_list, dtype=self.__graph.return_weightType(), vertexNames=forward_path.return_names(), sparse=self.__graph.is_sparse()))
+                if self.__stats is not None:
+                    self.__stats.add("resultsBuilt")
             
         self.__cycles = tuple(self.__cycles)
         self.__num_cycles = len(backedges)
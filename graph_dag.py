@@ -0,0 +1,146 @@
+import numpy as np
+import math
+
+from graph import Graph, _topological_order
+from graph_cache import _owner_cache
+from graph_results import Path, Tree
+from graph_mutable import MutableGraph
+
+
+def _dag_relax(indptr, indices, weights, order, position, startVertex):
+    """Computes shortest paths in an acyclic graph by relaxing the edges of each reachable vertex in topological order, which runs in O(V+E). 'order' is the topological order and 'position' the position of each vertex in it, both as lists. Only vertices after the start vertex in the order can be reached. Among several parents on shortest paths the one with the smallest distance and then the smallest index is chosen, so the parents are the same as those of the heap search. Returns a list of distances and a list of parents."""
+    size = len(indptr) - 1
+    dist = [math.inf] * size
+    prev = [None] * size
+    dist[startVertex] = 0
+    for i in range(position[startVertex], size):
+        u = order[i]
+        d = dist[u]
+        if d == math.inf:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+            elif alt == dist[v] and prev[v] is not None and (d, u) < (dist[prev[v]], prev[v]):
+                # On ties the parent is the vertex settled first by Dijkstra's algorithm, i.e. the one of smallest distance and index
+                prev[v] = u
+    return dist, prev
+
+
+class DagPaths:
+    
+    def __init__(self, g: Graph, **optional):
+        """Constructor of the class of shortest and longest paths in acyclic graphs. 'g' should contain the graph to be considered, a ValueError is raised on the first query if it contains circles. The edges are relaxed in topological order, so each start vertex costs O(V+E). Computed results are stored in the ResultCache passed by the optional parameter 'cache', in a cache of its own limited to 'cacheBytes' bytes or by default in the cache returned by graph_cache.return_default_cache()."""
+        self.__graph = g
+        # Path lengths and parents as well as trees of shortest and longest paths are stored in the cache under keys starting with the prefix
+        self.__cache, self.__prefix = _owner_cache(self, optional)
+        # Topological order, positions in it and the CSR arrays with positive and negated weights as lists
+        self.__order = None
+        # Results are computed again after a change of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
+            
+    def return_graph(self):
+        """Returns the considered graph."""
+        return self.__graph
+        
+    def return_cache(self):
+        """Returns the cache, in which computed results are stored."""
+        return self.__cache
+        
+    def return_topologicalOrder(self):
+        """Returns the vertex indices in topological order as an array."""
+        return np.array(self.__lists()[0], dtype=np.int64)
+        
+    def return_shortestPathLengths(self, startVertex):
+        """Returns the lengths of the shortest paths from the specified start vertex, where 'inf' marks unreachable vertices."""
+        return self.__result(startVertex, False)[0]
+        
+    def return_parent(self, startVertex):
+        """Returns the parents of the vertices on the shortest paths from the specified start vertex, where None marks the start vertex and unreachable vertices."""
+        return self.__result(startVertex, False)[1]
+        
+    def return_longestPathLengths(self, startVertex):
+        """Returns the lengths of the longest paths from the specified start vertex, where '-inf' marks unreachable vertices."""
+        return self.__result(startVertex, True)[0]
+        
+    def return_longestParent(self, startVertex):
+        """Returns the parents of the vertices on the longest paths from the specified start vertex, where None marks the start vertex and unreachable vertices."""
+        return self.__result(startVertex, True)[1]
+        
+    def return_shortestPaths(self, startVertex):
+        """Returns a tree consisting of the shortest paths starting from the specified start vertex."""
+        return self.__tree(startVertex, False)
+        
+    def return_longestPaths(self, startVertex):
+        """Returns a tree consisting of the longest paths starting from the specified start vertex."""
+        return self.__tree(startVertex, True)
+        
+    def return_path(self, startVertex, endVertex):
+        """Returns the shortest path between the specified start and end vertex as a tuple of vertex indices, which is empty if no path exists."""
+        return self.__path(startVertex, endVertex, False)
+        
+    def return_longestPath(self, startVertex, endVertex):
+        """Returns the longest path between the specified start and end vertex as a tuple of vertex indices, which is empty if no path exists."""
+        return self.__path(startVertex, endVertex, True)
+        
+    def return_shortestPath(self, startVertex, endVertex):
+        """Returns the shortest path between specified start and end vertex as a path, which answers the queries of the Graph class."""
+        path = self.return_path(startVertex, endVertex)
+        return Path(self.__graph, path if len(path) > 1 else ())
+        
+    def __lists(self):
+        """Returns the topological order, the positions and the CSR arrays with positive and negated weights as lists, which are created once."""
+        if self.__order is None:
+            indptr, indices, weights = self.__graph.return_csr()
+            order = _topological_order(indptr, indices)
+            if len(order) < len(indptr) - 1:
+                raise ValueError("The graph contains circles, paths can be computed in topological order only in acyclic graphs.")
+            position = np.empty(len(order), dtype=np.int64)
+            position[order] = np.arange(len(order))
+            # Longest paths are the shortest paths with negated weights
+            self.__order = (order.tolist(), position.tolist(), indptr.tolist(), indices.tolist(), weights.tolist(), (-weights).tolist())
+        return self.__order
+        
+    def __result(self, startVertex, longest):
+        """Returns the path lengths and the parents of the shortest or longest paths starting from the specified start vertex. Already computed results are taken from the cache."""
+        key = (self.__prefix, "longest" if longest else "shortest", startVertex)
+        result = self.__cache.get(key)
+        if result is None:
+            order, position, indptr, indices, weights, negated = self.__lists()
+            dist, prev = _dag_relax(indptr, indices, negated if longest else weights, order, position, startVertex)
+            if longest:
+                dist = [-d for d in dist]
+            result = (tuple(dist), tuple(prev))
+            self.__cache.put(key, result)
+        return result
+        
+    def __tree(self, startVertex, longest):
+        """Returns the tree of shortest or longest paths starting from the specified start vertex."""
+        key = (self.__prefix, "longestTree" if longest else "tree", startVertex)
+        tree = self.__cache.get(key)
+        if tree is None:
+            tree = Tree(self.__graph, self.__result(startVertex, longest)[1], startVertex)
+            self.__cache.put(key, tree)
+        return tree
+        
+    def __path(self, startVertex, endVertex, longest):
+        """Follows the parents from the end vertex back to the start vertex."""
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        prev = self.__result(startVertex, longest)[1]
+        if endVertex != startVertex and prev[endVertex] is None:
+            return ()
+        path = [endVertex]
+        while path[-1] != startVertex:
+            path.append(prev[path[-1]])
+        return tuple(path[::-1])
+        
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which removes all results after a change of the graph."""
+        self.__order = None
+        self.__cache.remove_owner(self.__prefix)
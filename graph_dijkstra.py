@@ -1,88 +1,690 @@
 import numpy as np
 import math
+from heapq import heapify, heappush, heappop
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 
-from graph import Graph
+from graph import Graph, _topological_order
+from graph_parallel import run_many
+from graph_cache import _owner_cache
+from graph_results import Path, Tree
+from graph_mutable import MutableGraph, _is_decrease
+from graph_dag import _dag_relax
+from graph_stats import Stats, _no_phase
+from graph_explo import _gather
+
+
+def _dijkstra_init(size, startVertex):
+    """Creates the state of a search with the given start vertex as a tuple of distances, parents, settled flags and the heap."""
+    dist = [math.inf] * size
+    prev = [None] * size
+    settled = [False] * size
+    dist[startVertex] = 0
+    return dist, prev, settled, [(0, startVertex)]
+
+
+def _dijkstra_top(state):
+    """Removes outdated entries from the top of the heap of the given search state and returns the smallest tentative distance of an unsettled vertex (inf if there is none)."""
+    dist, prev, settled, heap = state
+    while heap and settled[heap[0][1]]:
+        heappop(heap)
+    return heap[0][0] if heap else math.inf
+
+
+def _dijkstra_resume(indptr, indices, weights, state, target=None, counts=None):
+    """Continues the search of the given state on CSR arrays until the target vertex is settled or, if no target is given, until all reachable vertices are settled. The state is updated in place, so the search can be resumed by later queries. If the list 'counts' is given, the numbers of heap pushes and pops are added to its first two items. Returns whether the target vertex is settled."""
+    dist, prev, settled, heap = state
+    if target is not None and settled[target]:
+        return True
+    # Only pushes are counted in the loop, the pops follow from the size of the heap
+    size = len(heap)
+    pushes = 0
+    found = target is None
+    while heap:
+        d, u = heappop(heap)
+        # Outdated heap entries are skipped instead of being removed on a decrease of the key
+        if settled[u]:
+            continue
+        settled[u] = True
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt, v))
+                pushes += 1
+        # The outgoing edges of the target are relaxed before stopping, so the state stays consistent
+        if u == target:
+            found = True
+            break
+    if counts is not None:
+        counts[0] += pushes
+        counts[1] += size + pushes - len(heap)
+    return found
+
+
+def _dijkstra_heap(indptr, indices, weights, startVertex, counts=None):
+    """Dijkstra's algorithm on the CSR arrays of a graph using a binary heap with lazy deletion. Runs in O((V+E) log V) and returns a list of distances and a list of parents. See _dijkstra_resume for 'counts'."""
+    state = _dijkstra_init(len(indptr) - 1, startVertex)
+    if counts is not None:
+        # The start vertex is pushed by the initialization
+        counts[0] += 1
+    _dijkstra_resume(indptr, indices, weights, state, counts=counts)
+    return state[0], state[1]
+
+
+def _dijkstra_bidirectional(csr, reverse, state, target, counts=None):
+    """Bidirectional Dijkstra between the start vertex of the forward search 'state' and the target vertex. The backward search runs on the transposed CSR arrays 'reverse'. The side with the smaller tentative distance is expanded until the sum of the smallest tentative distances of both sides reaches the length of the best path found. If the list 'counts' is given, the numbers of heap pushes and pops of both searches and the numbers of vertices settled and edges relaxed by the backward search are added to its items. Returns the path as a tuple of vertex indices, which is empty if no path exists."""
+    backward = _dijkstra_init(len(csr[0]) - 1, target)
+    size = len(state[3]) + 1
+    pushes = 0
+    sides = ((csr, state, backward), (reverse, backward, state))
+    best = state[0][target]
+    meet = target if best < math.inf else None
+    while True:
+        top_forward = _dijkstra_top(state)
+        top_backward = _dijkstra_top(backward)
+        if top_forward + top_backward >= best:
+            break
+        (indptr, indices, weights), (dist, prev, settled, heap), other = sides[0 if top_forward <= top_backward else 1]
+        other_dist = other[0]
+        d, u = heappop(heap)
+        settled[u] = True
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt, v))
+                pushes += 1
+            # A vertex reached by both searches closes a path
+            if alt + other_dist[v] < best:
+                best = alt + other_dist[v]
+                meet = v
+    if counts is not None:
+        # The target is pushed by the initialization of the backward search
+        counts[0] += pushes + 1
+        counts[1] += size + pushes - len(state[3]) - len(backward[3])
+        settled = [v for v in range(0, len(backward[2])) if backward[2][v]]
+        counts[2] += len(settled)
+        counts[3] += sum(reverse[0][v + 1] - reverse[0][v] for v in settled)
+    if meet is None:
+        return ()
+    path = []
+    v = meet
+    while v is not None:
+        path.append(v)
+        v = state[1][v]
+    path.reverse()
+    # The parents of the backward search lead to the target
+    v = backward[1][meet]
+    while v is not None:
+        path.append(v)
+        v = backward[1][v]
+    return tuple(path)
+
+
+def _dijkstra_affected(dist, prev, settled, startVertex, endVertex, oldWeight, newWeight):
+    """Returns whether changing the weight of the edge (startVertex, endVertex) from 'oldWeight' to 'newWeight' (0 for a missing edge) can change the result of a search with the given distances and parents. 'settled' are the flags of a stopped search or None for a complete search."""
+    if _is_decrease(oldWeight, newWeight):
+        # The parents depend on the order of relaxation, so an equally short path through the edge changes the result as well
+        if settled is None:
+            reached = dist[startVertex] < math.inf
+        else:
+            reached = settled[startVertex]
+        return reached and dist[startVertex] + newWeight <= dist[endVertex]
+    # A more expensive or removed edge only matters, if it is an edge of the tree of shortest paths
+    return prev[endVertex] == startVertex
+
+
+def _dijkstra_decrease(g, dist, prev, startVertex, endVertex, weight):
+    """Repairs the distances and parents of a complete search in place after the edge (startVertex, endVertex) has been added or made cheaper with the new weight. Only the vertices, whose distance decreases, are visited by a Dijkstra search starting at the end vertex. Returns whether a distance has changed."""
+    alt = dist[startVertex] + weight
+    if not alt < dist[endVertex]:
+        return False
+    dist[endVertex] = alt
+    prev[endVertex] = startVertex
+    heap = [(alt, endVertex)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in g.return_adjacencies(u):
+            alt = d + w
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt, v))
+    return True
+
+
+def _dijkstra_increase(g, dist, prev, startVertex, endVertex):
+    """Repairs the distances and parents of a complete search in place after the edge (startVertex, endVertex) has been removed or made more expensive (Ramalingam and Reps). The subtree of the end vertex in the tree of shortest paths is collected, its vertices get the best distance over edges from outside of the subtree and a Dijkstra search within the subtree completes the distances. Returns whether the result has changed."""
+    if prev[endVertex] != startVertex:
+        return False
+    # The subtree is collected along the outgoing edges, so only the affected region is visited
+    affected = {endVertex}
+    stack = [endVertex]
+    while stack:
+        u = stack.pop()
+        for v, w in g.return_adjacencies(u):
+            if prev[v] == u and v not in affected:
+                affected.add(v)
+                stack.append(v)
+    heap = []
+    for v in affected:
+        dist[v] = math.inf
+        prev[v] = None
+    for v in affected:
+        for u, w in g.return_inAdjacencies(v):
+            if u not in affected and dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+                prev[v] = u
+        if dist[v] < math.inf:
+            heap.append((dist[v], v))
+    heapify(heap)
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in g.return_adjacencies(u):
+            alt = d + w
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt, v))
+    return True
+
+
+def _dijkstra_lengths(indptr, indices, weights, startVertex):
+    """Kernel for the computation of path lengths from several sources. Indexing the memoryviews of the arrays is as fast as indexing lists, but avoids copying the arrays."""
+    return _dijkstra_heap(indptr.data, indices.data, weights.data, startVertex)[0]
+
+
+# Number of vertices, from which on the relaxation of a bucket is split over the threads of delta-stepping
+_delta_parallel = 8192
+
+
+def _delta_tune(indptr, weights):
+    """Chooses the bucket width of delta-stepping from the edge weights. Following Meyer and Sanders the width is the mean weight divided by the mean out-degree, so a bucket is expected to reach about one new vertex per vertex, but it is at least the median weight, since every bucket costs a few numpy operations."""
+    if len(weights) == 0:
+        return 1.0
+    degree = len(weights) / max(len(indptr) - 1, 1)
+    return float(max(np.mean(weights) / degree, np.median(weights)))
+
+
+def _delta_split(indptr, indices, weights, delta):
+    """Splits the CSR arrays into the light edges with a weight of at most delta and the heavy edges. Returns both as tuples of CSR arrays with float64 weights."""
+    size = len(indptr) - 1
+    rows = np.repeat(np.arange(size), np.diff(indptr))
+    weights = weights.astype(np.float64)
+    parts = []
+    for mask in (weights <= delta, weights > delta):
+        ptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[mask], minlength=size), out=ptr[1:])
+        parts.append((ptr, indices[mask], weights[mask]))
+    return parts
+
+
+def _delta_relax(csr, vertices, dist, pool=None, workers=1):
+    """Relaxes the edges of the given vertices in the CSR arrays 'csr' with numpy operations and updates the distances in place. With a thread pool, large sets of vertices are split into one part per worker, whose candidate distances are computed concurrently. Returns the vertices whose distance decreased."""
+    indptr, indices, weights = csr
+    def candidates(part):
+        positions, sources = _gather(indptr, indices, part)
+        targets = indices[positions]
+        alt = dist[sources] + weights[positions]
+        better = alt < dist[targets]
+        return targets[better], alt[better]
+    if pool is not None and len(vertices) >= _delta_parallel:
+        parts = list(pool.map(candidates, np.array_split(vertices, workers)))
+        targets = np.concatenate([p[0] for p in parts])
+        alt = np.concatenate([p[1] for p in parts])
+    else:
+        targets, alt = candidates(vertices)
+    # Only the smallest candidate of each vertex is kept
+    order = np.lexsort((alt, targets))
+    targets = targets[order]
+    first = np.ones(len(targets), dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    targets = targets[first]
+    dist[targets] = alt[order][first]
+    return targets
+
+
+def _delta_stepping(light, heavy, startVertex, delta, pool=None, workers=1):
+    """Delta-stepping (Meyer and Sanders) on CSR arrays. Starting with the smallest tentative distance m of an unsettled vertex, the vertices in [m, m+delta) form a bucket, whose light edges are relaxed until no distance in the bucket decreases anymore. Then the heavy edges of the bucket are relaxed once, since they cannot lead back into it, and its vertices are settled. Each relaxation handles all vertices of the bucket at once. 'light' and 'heavy' are the CSR arrays created by _delta_split. Returns the distances as float64 array."""
+    size = len(light[0]) - 1
+    dist = np.full(size, np.inf)
+    dist[startVertex] = 0
+    settled = np.zeros(size, dtype=bool)
+    # Reached vertices, which are not yet settled, possibly repeated
+    pending = np.array([startVertex], dtype=np.int64)
+    while len(pending) > 0:
+        pending = np.unique(pending[~settled[pending]])
+        if len(pending) == 0:
+            break
+        upper = dist[pending].min() + delta
+        inside = dist[pending] < upper
+        frontier = pending[inside]
+        pending = pending[~inside]
+        bucket = []
+        while len(frontier) > 0:
+            bucket.append(frontier)
+            changed = _delta_relax(light, frontier, dist, pool, workers)
+            inside = dist[changed] < upper
+            frontier = changed[inside]
+            pending = np.concatenate((pending, changed[~inside]))
+        bucket = np.unique(np.concatenate(bucket))
+        settled[bucket] = True
+        pending = np.concatenate((pending, _delta_relax(heavy, bucket, dist, pool, workers)))
+    return dist
+
+
+def _delta_parents(indptr, indices, weights, dist, startVertex):
+    """Determines the parents of the shortest paths from the distances. The heap settles the vertices in the order of their distance and their index and keeps the first parent reaching the final distance, so among the edges (u, v) with dist[u] + weight == dist[v] the one with the smallest (dist[u], u) is chosen. Returns the parents as int64 array with -1 for the start vertex and unreachable vertices."""
+    size = len(indptr) - 1
+    sources = np.repeat(np.arange(size), np.diff(indptr))
+    tight = (dist[sources] < math.inf) & (dist[sources] + weights == dist[indices])
+    sources, targets = sources[tight], indices[tight]
+    order = np.lexsort((sources, dist[sources], targets))
+    sources, targets = sources[order], targets[order]
+    first = np.ones(len(targets), dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    parent = np.full(size, -1, dtype=np.int64)
+    parent[targets[first]] = sources[first]
+    parent[startVertex] = -1
+    return parent
 
 
 class Dijkstra:
     
-    def __init__(self, g: Graph):
-        """Constructor of the Dijkstra class. 'g' should contain the graph to be considered."""
+    # Available engines to compute the shortest paths
+    engines = ("heap", "scan", "delta")
+    
+    def __init__(self, g: Graph, **optional):
+        """Constructor of the Dijkstra class. 'g' should contain the graph to be considered. The optional parameter 'engine' selects the implementation: 'heap' (default) uses a binary heap and runs in O((V+E) log V), 'scan' is the original O(V²) implementation, which searches the vertex with minimal distance in a list, 'delta' is delta-stepping, which relaxes the edges of whole buckets of vertices with numpy operations. The bucket width of 'delta' is tuned from the edge weights or set by the optional parameter 'delta'; with the optional parameter 'workers' larger than 1, large buckets are relaxed by a pool of this number of threads. Computed results are stored in the ResultCache passed by the optional parameter 'cache', in a cache of its own limited to 'cacheBytes' bytes or by default in the cache returned by graph_cache.return_default_cache(). If the optional parameter 'dynamic' is True and 'g' is a MutableGraph, the results of complete searches are repaired after changes of the graph instead of being removed. If the graph is acyclic, complete searches of the 'heap' engine relax the edges in topological order in O(V+E) instead of using the heap, with the same parents on paths of equal length; the optional parameter 'dag' set to False disables this. A Stats object passed by the optional parameter 'stats' counts the work of the searches and measures the time of the phases 'construction', 'search' and 'results'."""
         self.__graph = g
-        self.__min_length = [None for i in range(0,g.return_num_vertices())]
-        self.__prev = [None for i in range(0,g.return_num_vertices())]
-        self.__min_length_graphs = [None for i in range(0,g.return_num_vertices())]
-        self.__shortest_paths = {}
+        if "stats" in optional:
+            self.__stats = optional["stats"]
+            if not isinstance(self.__stats, Stats):
+                raise TypeError("\'stats\' has to be a Stats object.")
+        else:
+            self.__stats = None
+        if "engine" in optional:
+            self.__engine = optional["engine"]
+            if self.__engine not in Dijkstra.engines:
+                raise ValueError("\'engine\' has to be one of " + str(Dijkstra.engines) + ".")
+        else:
+            self.__engine = "heap"
+        if "delta" in optional:
+            self.__delta = optional["delta"]
+            if not self.__delta > 0:
+                raise ValueError("\'delta\' has to be a positive number.")
+        else:
+            self.__delta = None
+        if "workers" in optional:
+            self.__workers = int(optional["workers"])
+            if self.__workers < 1:
+                raise ValueError("\'workers\' has to be at least 1.")
+        else:
+            self.__workers = 1
+        if "dynamic" in optional:
+            self.__dynamic = bool(optional["dynamic"])
+        else:
+            self.__dynamic = False
+        if "dag" in optional:
+            self.__dag = bool(optional["dag"])
+        else:
+            self.__dag = True
+        # Topological order and positions in it as lists, False if the graph contains circles, None if not yet determined
+        self.__order = None
+        # The CSR arrays are converted to lists once, since indexing lists is faster than indexing numpy arrays in pure Python loops
+        self.__csr_lists = None
+        self.__reverse_lists = None
+        # Light and heavy edges of delta-stepping and the tuned bucket width
+        self.__delta_csr = None
+        self.__tuned_delta = None
+        # Path lengths and parents, graphs of shortest paths and states of searches, which were stopped at a target vertex and can be resumed by later queries from the same start vertex, are stored in the cache under keys starting with the prefix
+        self.__cache, self.__prefix = _owner_cache(self, optional)
         
-        self.__warn_weighted = not np.any((self.__graph.return_adjacencyMatrix() != 0) * (self.__graph.return_adjacencyMatrix() != 1))
+        # Whether all edges have the weight 1, which is determined on demand
+        self.__warn_weighted = None
+        # Changes of a mutable graph only remove the affected results
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
             
     def return_graph(self):
         """Returns the considered graph."""
         return self.__graph
         
+    def return_cache(self):
+        """Returns the cache, in which computed results are stored."""
+        return self.__cache
+        
+    def return_stats(self):
+        """Returns the Stats object, which counts the work of this object, or None."""
+        return self.__stats
+        
+    def return_engine(self):
+        """Returns the name of the engine used to compute the shortest paths."""
+        return self.__engine
+        
+    def return_delta(self):
+        """Returns the bucket width of the 'delta' engine, which is tuned from the edge weights if it was not given."""
+        if self.__delta is not None:
+            return self.__delta
+        if self.__tuned_delta is None:
+            indptr, indices, weights = self.__graph.return_csr()
+            self.__tuned_delta = _delta_tune(indptr, weights)
+        return self.__tuned_delta
+        
+    def is_dynamic(self):
+        """Returns whether results are repaired after changes of a mutable graph."""
+        return self.__dynamic
+        
+    def is_consistent(self, startVertex):
+        """Compares the path lengths from the specified start vertex with a new computation on the current graph and checks that each parent lies on a shortest path. Returns 'True' if the stored result is consistent."""
+        dist, prev = self.__result(startVertex)
+        expected = _dijkstra_heap(*(x.tolist() for x in self.__graph.return_csr()), startVertex)[0]
+        # Repaired distances may be summed up along other paths of the same length
+        if not all(math.isclose(a, b, rel_tol=1e-9) for a, b in zip(dist, expected)):
+            return False
+        for v in range(0, len(dist)):
+            if v == startVertex or dist[v] == math.inf:
+                if prev[v] is not None:
+                    return False
+            elif prev[v] is None or not self.__graph.is_adjacent(prev[v], v) or not math.isclose(dist[prev[v]] + self.__graph.return_weight(prev[v], v), dist[v], rel_tol=1e-9):
+                return False
+        return True
+        
     def return_shortestPaths(self, startVertex):
-        """Returns a graph consisting of the shortest paths starting from the specified start vertex."""
+        """Returns a tree consisting of the shortest paths starting from the specified start vertex. The tree answers the queries of the Graph class, to_graph() converts it into a Graph."""
         # Already computed results are stored and returned if required
-        if self.__min_length_graphs[startVertex] != None:
-            return self.__min_length_graphs[startVertex]
-        else:
-            self.__dijkstra(startVertex)
-            return self.__min_length_graphs[startVertex]
+        tree = self.__lookup((self.__prefix, "tree", startVertex))
+        if tree is None:
+            tree = self.__create_shortestPathsGraph(startVertex)
+        return tree
         
     def return_shortestPath(self, startVertex, endVertex):
-        """Returns a graph consisting of the shortest path between specified start and end vertex."""
+        """Returns the shortest path between specified start and end vertex as a path, which answers the queries of the Graph class. to_graph() converts it into a Graph."""
         # Already computed results are stored and returned if required
-        if (startVertex, endVertex) in self.__shortest_paths:
-            return self.__shortest_paths[(startVertex, endVertex)]
-        
-        prev = self.return_parent(startVertex)
-        # If no path exists:
-        if prev[endVertex] == None or startVertex==endVertex:
-            return Graph(np.zeros((0, 0), dtype=np.int),vertexNames="")
-        
-        # Build up path
-        sub_mat = np.zeros((len(prev), len(prev)), dtype=np.int)
-        sub_list = []
-        j = endVertex
-        i = prev[j]
-        orig_mat = self.__graph.return_adjacencyMatrix()
-        while i != None:
-            sub_list.append((self.__graph.return_vertexName(i),self.__graph.return_vertexName(j),orig_mat[i][j]))
-            j = i
-            i = prev[j]
-            
-        # Inherit vertex order from the original graph:
-        name_order = self.__graph.return_names()
-        name_order = [x for x in name_order if x in list(zip(*sub_list))[0] or x in list(zip(*sub_list))[1]]
-        out = Graph(sub_list, dtype=self.__graph.return_weightType(),  vertexNames=name_order)
-        self.__shortest_paths[(startVertex, endVertex)] = out
+        out = self.__lookup((self.__prefix, "path", startVertex, endVertex))
+        if out is not None:
+            return out
+        
+        path = self.return_path(startVertex, endVertex)
+        # If no path exists, the path is empty
+        with self.__phase("results"):
+            out = Path(self.__graph, path if len(path) > 1 else ())
+            if self.__stats is not None:
+                self.__stats.add("resultsBuilt")
+        self.__cache.put((self.__prefix, "path", startVertex, endVertex), out)
         return out
+        
+    def return_path(self, startVertex, endVertex, **optional):
+        """Returns the shortest path between the specified start and end vertex as a tuple of vertex indices, which is empty if no path exists. The search stops as soon as the end vertex is settled. By default the state of the stopped search is kept and resumed by later queries from the same start vertex, the optional parameter 'keepState' set to False discards it. With the optional parameter 'bidirectional' set to True, a second search runs backwards from the end vertex on the transposed graph."""
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        if startVertex == endVertex:
+            return (startVertex,)
+        keep_state = optional["keepState"] if "keepState" in optional else True
+        bidirectional = optional["bidirectional"] if "bidirectional" in optional else False
+        
+        # Complete results and the original engine use the parents of the full search
+        result = self.__lookup((self.__prefix, "result", startVertex))
+        if result is not None or self.__engine == "scan":
+            prev = result[1] if result is not None else self.return_parent(startVertex)
+        else:
+            if self.__is_unweighted():
+                warn(Warning("The given graph contains no weighted edges. A calculation of shortest paths is possible using the Dijkstra algorithm, but the use of the width search would be more useful here."))
+            self.__prepare(bidirectional)
+            counts = [0, 0, 0, 0] if self.__stats is not None else None
+            state = self.__lookup((self.__prefix, "search", startVertex))
+            if state is None:
+                state = _dijkstra_init(size, startVertex)
+                if counts is not None:
+                    counts[0] += 1
+            path = None
+            before = np.array(state[2]) if counts is not None else None
+            with self.__phase("search"):
+                if bidirectional and not state[2][endVertex]:
+                    path = _dijkstra_bidirectional(self.__csr_lists, self.__reverse_lists, state, endVertex, counts)
+                else:
+                    _dijkstra_resume(*self.__csr_lists, state, endVertex, counts)
+                if counts is not None:
+                    self.__count_search(before, state[2], counts)
+            # The state is stored again, since its size has changed
+            if keep_state:
+                self.__cache.put((self.__prefix, "search", startVertex), state)
+            if path is not None:
+                return path
+            prev = state[1]
+        
+        if prev[endVertex] == None:
+            return ()
+        path = [endVertex]
+        while prev[path[-1]] != None:
+            path.append(prev[path[-1]])
+        return tuple(reversed(path))
             
     def return_shortestPathLengths(self, startVertex):
         """Returns a list of the shortest paths starting from the specified start vertex."""
-        # Already computed results are stored and returned if required
-        if self.__min_length[startVertex] != None:
-            return self.__min_length[startVertex]
-        else:
-            self.__dijkstra(startVertex)
-            return self.__min_length[startVertex]
+        return self.__result(startVertex)[0]
+        
+    def return_shortestPathLengths_many(self, sources, workers=None):
+        """Returns a matrix of shortest path lengths, whose i-th row contains the path lengths starting from the i-th of the given start vertices. The start vertices are distributed over 'workers' processes (default: number of CPUs), which share the arrays of the graph through shared memory."""
+        return run_many(self.__graph, sources, _dijkstra_lengths, np.float64, workers)
         
     def return_parent(self, startVertex):
         """Returns a list of parent nodes for the shortest paths starting from the specified start vertex."""
-        # Already computed results are stored and returned if required
-        if self.__min_length[startVertex] != None:
-            return self.__prev[startVertex]
-        else:
-            self.__dijkstra(startVertex)
-            return self.__prev[startVertex]
+        return self.__result(startVertex)[1]
+        
+    def __phase(self, name):
+        """Returns a context manager measuring the given phase, which does nothing without statistics."""
+        return _no_phase if self.__stats is None else self.__stats.phase(name)
+        
+    def __lookup(self, key):
+        """Returns the value stored in the cache under the given key or None and counts a hit or a miss in the statistics."""
+        value = self.__cache.get(key)
+        if self.__stats is not None:
+            self.__stats.add("cacheMisses" if value is None else "cacheHits")
+        return value
+        
+    def __prepare(self, reverse=False):
+        """Converts the CSR arrays and, if 'reverse' is True, the transposed CSR arrays to lists once."""
+        if self.__csr_lists is None or (reverse and self.__reverse_lists is None):
+            with self.__phase("construction"):
+                if self.__csr_lists is None:
+                    self.__csr_lists = tuple(x.tolist() for x in self.__graph.return_csr())
+                if reverse and self.__reverse_lists is None:
+                    self.__reverse_lists = tuple(x.tolist() for x in self.__graph.return_reverseCsr())
+                    
+    def __count_search(self, before, settled, counts):
+        """Adds the vertices settled and the edges relaxed by a search to the statistics. 'before' and 'settled' are the settled flags before (None for a new search) and after the search, 'counts' the numbers of heap operations and of the vertices and edges of a backward search."""
+        settled = np.asarray(settled, dtype=bool)
+        if before is not None:
+            settled = settled & ~before
+        outdeg = np.diff(self.__graph.return_csr()[0])
+        self.__stats.add("settled", int(np.count_nonzero(settled)) + counts[2])
+        self.__stats.add("relaxed", int(outdeg[settled].sum()) + counts[3])
+        self.__stats.add("heapPushes", counts[0])
+        self.__stats.add("heapPops", counts[1])
+        
+    def __is_unweighted(self):
+        """Returns whether all edges of the graph have the weight 1."""
+        if self.__warn_weighted is None:
+            self.__warn_weighted = not np.any(self.__graph.return_csr()[2] != 1)
+        return self.__warn_weighted
+        
+    def __topological_order(self):
+        """Determines the topological order of the graph once. Returns 'False' if the graph contains circles."""
+        if self.__order is None:
+            with self.__phase("construction"):
+                indptr, indices, weights = self.__graph.return_csr()
+                order = _topological_order(indptr, indices)
+                if len(order) < len(indptr) - 1:
+                    self.__order = False
+                else:
+                    position = np.empty(len(order), dtype=np.int64)
+                    position[order] = np.arange(len(order))
+                    self.__order = (order.tolist(), position.tolist())
+        return self.__order != False
+        
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which removes the cached results affected by a change of the graph."""
+        self.__csr_lists = None
+        self.__reverse_lists = None
+        self.__delta_csr = None
+        self.__tuned_delta = None
+        self.__warn_weighted = None
+        self.__order = None
+        keys = self.__cache.return_keys(self.__prefix)
+        if self.__dynamic:
+            keys = self.__repair(keys, kind, startVertex, endVertex, oldWeight, newWeight)
+        for key in keys:
+            value = self.__cache.peek(key)
+            if value is None:
+                continue
+            if kind == "vertex":
+                # A new vertex is not reachable, so complete results are extended and paths stay valid
+                if key[1] == "result":
+                    self.__cache.put(key, (value[0] + (math.inf,), value[1] + (None,)))
+                elif key[1] != "path":
+                    self.__cache.remove(key)
+            elif key[1] == "result" or key[1] == "search":
+                settled = value[2] if key[1] == "search" else None
+                if _dijkstra_affected(value[0], value[1], settled, startVertex, endVertex, oldWeight, newWeight):
+                    self.__cache.remove(key)
+                    if key[1] == "result":
+                        self.__cache.remove((self.__prefix, "tree", key[2]))
+            elif key[1] == "tree":
+                # Trees are checked together with their path lengths, without them the tree is removed
+                if self.__cache.peek((self.__prefix, "result", key[2])) is None:
+                    self.__cache.remove(key)
+            elif key[1] == "path":
+                # A cheaper edge may create a shorter path between any vertices
+                if _is_decrease(oldWeight, newWeight) or value.contains_edge(startVertex, endVertex):
+                    self.__cache.remove(key)
+        
+    def __repair(self, keys, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Repairs the distances and parents of all complete searches after a change of the graph. The results of repaired start vertices are replaced, all other keys are returned to be checked by the listener."""
+        repaired = set()
+        for key in keys:
+            if key[1] != "dynamic":
+                continue
+            state = self.__cache.peek(key)
+            if state is None:
+                continue
+            dist, prev = state
+            if kind == "vertex":
+                dist.append(math.inf)
+                prev.append(None)
+                changed = True
+            elif _is_decrease(oldWeight, newWeight):
+                changed = _dijkstra_decrease(self.__graph, dist, prev, startVertex, endVertex, newWeight)
+            else:
+                changed = _dijkstra_increase(self.__graph, dist, prev, startVertex, endVertex)
+            if changed:
+                # The cached copies are created again from the repaired lists on demand
+                self.__cache.remove((self.__prefix, "result", key[2]))
+                self.__cache.remove((self.__prefix, "tree", key[2]))
+                self.__cache.put(key, state)
+            repaired.add(key[2])
+        return [key for key in keys if key[1] != "dynamic" and not (key[2] in repaired and key[1] in ("result", "tree"))]
+        
+    def __result(self, startVertex):
+        """Returns the path lengths and the parents of the shortest paths starting from the specified start vertex. Already computed results are taken from the cache or created from a repaired result."""
+        result = self.__lookup((self.__prefix, "result", startVertex))
+        if result is None:
+            state = self.__lookup((self.__prefix, "dynamic", startVertex)) if self.__dynamic else None
+            if state is None:
+                result = self.__dijkstra(startVertex)
+            else:
+                result = (tuple(state[0]), tuple(state[1]))
+                self.__cache.put((self.__prefix, "result", startVertex), result)
+        return result
         
     def __dijkstra(self, startVertex):
-        """Executes Dijkstra's algorithm with the specified start vertex and creates a subgraph consisting of the shortest paths, a list of path lengths, and a list of parent vertices."""
+        """Executes Dijkstra's algorithm with the specified start vertex and creates a list of path lengths and a list of parent vertices."""
         
-        if self.__warn_weighted:
+        if self.__is_unweighted():
             warn(Warning("The given graph contains no weighted edges. A calculation of shortest paths is possible using the Dijkstra algorithm, but the use of the width search would be more useful here."))
         
+        counts = [0, 0, 0, 0] if self.__stats is not None else None
+        before = None
+        if self.__engine == "heap":
+            self.__prepare()
+            # A search stopped at a target vertex is continued instead of being repeated
+            state = self.__lookup((self.__prefix, "search", startVertex))
+            dag = state is None and self.__dag and self.__topological_order()
+            with self.__phase("search"):
+                if state is not None:
+                    self.__cache.remove((self.__prefix, "search", startVertex))
+                    if counts is not None:
+                        before = np.array(state[2])
+                    _dijkstra_resume(*self.__csr_lists, state, counts=counts)
+                    dist, prev = state[0], state[1]
+                elif dag:
+                    dist, prev = _dag_relax(*self.__csr_lists, *self.__order, startVertex)
+                else:
+                    dist, prev = _dijkstra_heap(*self.__csr_lists, startVertex, counts)
+                if counts is not None:
+                    # After a complete search exactly the reachable vertices are settled
+                    self.__count_search(before, np.array(dist) < math.inf, counts)
+        elif self.__engine == "delta":
+            dist, prev = self.__delta_stepping(startVertex)
+            if counts is not None:
+                self.__count_search(before, np.array(dist) < math.inf, counts)
+        else:
+            with self.__phase("search"):
+                dist, prev = self.__dijkstra_scan(startVertex)
+                if counts is not None:
+                    self.__count_search(before, np.array(dist) < math.inf, counts)
+
+        with self.__phase("results"):
+            result = (tuple(dist), tuple(prev))
+        self.__cache.put((self.__prefix, "result", startVertex), result)
+        if self.__dynamic:
+            # Lists, which are repaired in place after changes of the graph
+            self.__cache.put((self.__prefix, "dynamic", startVertex), [list(dist), list(prev)])
+        return result
+
+    def __create_shortestPathsGraph(self, startVertex):
+        """Creates a subgraph consisting of the shortest paths starting from the specified start vertex."""
+        parent = self.return_parent(startVertex)
+        with self.__phase("results"):
+            tree = Tree(self.__graph, parent, startVertex)
+            if self.__stats is not None:
+                self.__stats.add("resultsBuilt")
+        self.__cache.put((self.__prefix, "tree", startVertex), tree)
+        return tree
+        
+    def __delta_stepping(self, startVertex):
+        """Computes the shortest paths with delta-stepping. Returns a list of distances and a list of parents like the heap engine."""
+        indptr, indices, weights = self.__graph.return_csr()
+        delta = self.return_delta()
+        if self.__delta_csr is None:
+            with self.__phase("construction"):
+                self.__delta_csr = _delta_split(indptr, indices, weights, delta)
+        with self.__phase("search"):
+            if self.__workers > 1:
+                with ThreadPoolExecutor(self.__workers) as pool:
+                    dist = _delta_stepping(*self.__delta_csr, startVertex, delta, pool, self.__workers)
+            else:
+                dist = _delta_stepping(*self.__delta_csr, startVertex, delta)
+            parent = _delta_parents(indptr, indices, weights, dist, startVertex)
+        # Integer weights give integer distances like the heap engine
+        if np.issubdtype(weights.dtype, np.integer):
+            dist = [int(d) if d < math.inf else math.inf for d in dist.tolist()]
+        else:
+            dist = dist.tolist()
+        return dist, [None if p < 0 else p for p in parent.tolist()]
+        
+    def __dijkstra_scan(self, startVertex):
+        """Original implementation of Dijkstra's algorithm, which searches the vertex with minimal distance in a list. Returns a list of distances and a list of parents."""
         # Set of vertices not yet traversed, ordered by vertex indexes
         q   = list(range(0,self.__graph.return_num_vertices()))
         # List for the computed distances to the vertices
@@ -105,21 +707,4 @@ class Dijkstra:
                 if alt < dist[v[0]][0]:
                     dist[v[0]][0] = alt
                     prev[v[0]] = u
-
-        # Create subgraph consting of the shortest paths
-        sub_list = []
-        orig_mat = self.__graph.return_adjacencyMatrix()
-        for j in range(0,len(prev)):
-            i = prev[j]
-            if i!=None:
-                sub_list.append((self.__graph.return_vertexName(i),self.__graph.return_vertexName(j),orig_mat[i][j]))
-        if len(sub_list) > 0:
-            # Inherit vertex order from the original graph:
-            name_order = self.__graph.return_names()
-            name_order = [x for x in name_order if x in list(zip(*sub_list))[0] or x in list(zip(*sub_list))[1]]
-            self.__min_length_graphs[startVertex] = Graph(sub_list, dtype=self.__graph.return_weightType(), vertexNames=name_order)
-        else:
-            self.__min_length_graphs[startVertex] = Graph(np.array([[0]], dtype=self.__graph.return_weightType()), vertexNames=[self.__graph.return_vertexName(startVertex)])
-        
-        self.__min_length[startVertex] = tuple([x[0] for x in dist]) 
-        self.__prev[startVertex] = tuple(prev)
+        return [x[0] for x in dist], prev
@@ -4,231 +4,627 @@ from warnings import warn
 import math
 
 from graph import Graph
+from graph_parallel import run_many
+from graph_cache import _owner_cache
+from graph_results import Path, Tree
+from graph_mutable import MutableGraph
+from graph_stats import Stats, _no_phase
+
+
+def _gather(indptr, indices, vertices):
+    """Gathers the adjacencies of the given vertices from CSR arrays. Returns the positions of the edges in 'indices' and for each edge the vertex it belongs to."""
+    starts = indptr[vertices]
+    counts = indptr[vertices + 1] - starts
+    # Offset of each edge within the adjacencies of its vertex
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets, np.repeat(vertices, counts)
+
+
+def _bfs_frontier(indptr, indices, startVertex, reverse=None, alpha=14, beta=24):
+    """BFS on CSR arrays, which expands whole layers with numpy operations. Returns distances and parents as int32 arrays, where -1 marks unreached vertices (and the parent of the start vertex). If the transposed CSR arrays 'reverse' are given, layers are explored bottom-up (searching a parent for every unvisited vertex) as soon as the frontier has more than 1/alpha of the unexplored edges, until it shrinks below 1/beta of the vertices."""
+    size = len(indptr) - 1
+    dist = np.full(size, -1, dtype=np.int32)
+    parent = np.full(size, -1, dtype=np.int32)
+    outdeg = np.diff(indptr)
+    dist[startVertex] = 0
+    frontier = np.array([startVertex], dtype=np.int64)
+    unexplored_edges = outdeg.sum() - outdeg[startVertex]
+    bottom_up = False
+    level = 0
+    while frontier.size > 0:
+        level += 1
+        if reverse is not None:
+            frontier_edges = outdeg[frontier].sum()
+            if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                bottom_up = True
+            elif bottom_up and frontier.size < size / beta:
+                bottom_up = False
+        if bottom_up:
+            # Each unvisited vertex searches its incoming edges for a vertex of the frontier
+            in_frontier = np.zeros(size, dtype=bool)
+            in_frontier[frontier] = True
+            unvisited = np.flatnonzero(dist == -1)
+            pos, owner = _gather(reverse[0], reverse[1], unvisited)
+            hit = in_frontier[reverse[1][pos]]
+            owner, pred = owner[hit], reverse[1][pos[hit]]
+            # The first incoming edge from the frontier determines the parent
+            new, first = np.unique(owner, return_index=True)
+            parent[new] = pred[first]
+        else:
+            # The frontier pushes its outgoing edges to unvisited vertices
+            pos, owner = _gather(indptr, indices, frontier)
+            nbrs = indices[pos]
+            hit = dist[nbrs] == -1
+            nbrs, owner = nbrs[hit], owner[hit]
+            # The first discovery determines the parent, the new frontier keeps the order of discovery like a queue
+            first = np.sort(np.unique(nbrs, return_index=True)[1])
+            new = nbrs[first]
+            parent[new] = owner[first]
+        dist[new] = level
+        unexplored_edges -= outdeg[new].sum()
+        frontier = new.astype(np.int64)
+    return dist, parent
+
+
+def _bfs_init(size, startVertex):
+    """Creates the state of a BFS with the given start vertex as a list of distances, parents (-1 for undiscovered vertices), the queue and the position of its head."""
+    dist = [-1] * size
+    parent = [-1] * size
+    dist[startVertex] = 0
+    return [dist, parent, [startVertex], 0]
+
+
+def _bfs_resume(indptr, indices, state, target=None, other=None):
+    """Continues the BFS of the given state on CSR arrays vertex after vertex. The search stops after the vertex, whose adjacencies discovered the target vertex or a vertex discovered by the search 'other', and returns the latter. If 'other' is given, only the remaining vertices of the current layer are explored. The state is updated in place, so the search can be resumed by later queries. Returns the vertex at which the search stopped or -1."""
+    dist, parent, queue, head = state
+    other_dist = other[0] if other is not None else None
+    layer = dist[queue[head]] if head < len(queue) else -1
+    meet = -1
+    while head < len(queue) and meet < 0:
+        u = queue[head]
+        if other is not None and dist[u] != layer:
+            break
+        head += 1
+        d = dist[u] + 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if dist[v] < 0:
+                dist[v] = d
+                parent[v] = u
+                queue.append(v)
+                if v == target or (other is not None and other_dist[v] >= 0):
+                    meet = v
+    state[3] = head
+    return meet
+
+
+def _bfs_bidirectional(csr, reverse, state, target, counts=None):
+    """Bidirectional BFS on the arrays 'csr' (indptr, indices) between the start vertex of the forward search 'state' and the target vertex. The backward search runs on the transposed arrays 'reverse' (indptr, indices). Layer by layer the side with the smaller frontier is expanded until a vertex is discovered by both sides. If the list 'counts' is given, the numbers of vertices explored and edges scanned by the backward search are added to its first two items. Returns the path as a tuple of vertex indices, which is empty if no path exists."""
+    backward = _bfs_init(len(csr[0]) - 1, target)
+    # The forward search may be resumed within a layer, which has to be completed first
+    meet = _bfs_resume(csr[0], csr[1], state, other=backward)
+    sides = ((csr, state, backward), (reverse, backward, state))
+    while meet < 0:
+        forward_size = len(state[2]) - state[3]
+        backward_size = len(backward[2]) - backward[3]
+        # If one of the searches has finished, the target is not reachable
+        if forward_size == 0 or backward_size == 0:
+            break
+        (indptr, indices), current, other = sides[0 if forward_size <= backward_size else 1]
+        meet = _bfs_resume(indptr, indices, current, other=other)
+    if counts is not None:
+        explored = backward[2][:backward[3]]
+        counts[0] += len(explored)
+        counts[1] += sum(reverse[0][v + 1] - reverse[0][v] for v in explored)
+    if meet < 0:
+        return ()
+    path = []
+    v = meet
+    while v >= 0:
+        path.append(v)
+        v = state[1][v]
+    path.reverse()
+    # The parents of the backward search lead to the target
+    v = backward[1][meet]
+    while v >= 0:
+        path.append(v)
+        v = backward[1][v]
+    return tuple(path)
+
+
+def _bfs_affected(distStart, distEnd, parentEnd, startVertex, oldWeight, newWeight):
+    """Returns whether adding (oldWeight 0) or removing (newWeight 0) the edge from 'startVertex' to a vertex with the distance 'distEnd' and the parent 'parentEnd' can change the result of a complete BFS, in which 'startVertex' has the distance 'distStart'. Unreachable vertices have the distance 'inf'. A changed weight does not matter for the BFS."""
+    if oldWeight == 0:
+        # The parents depend on the order of the adjacencies, so an equally short path through the new edge changes the result as well
+        return distStart + 1 <= distEnd
+    if newWeight == 0:
+        return parentEnd == startVertex
+    return False
+
+
+def _bfs_lengths(indptr, indices, weights, startVertex):
+    """Kernel for the computation of BFS-distances from several start vertices."""
+    return _bfs_frontier(indptr, indices, startVertex)[0]
+
+
+def _msbfs(reverse, sources, out):
+    """Multi-source BFS on the transposed CSR arrays 'reverse' (indptr, indices), which runs up to 64 start vertices at once. Bit j of the uint64 words 'seen' and 'frontier' of a vertex tells whether the BFS of the j-th start vertex of the batch has discovered it and whether it belongs to its last layer. The next layer of a vertex is the OR of the frontier words of its predecessors. The distance from sources[i] to each vertex is written into row i of 'out', whose rows have to be filled with the largest value of its data type, which remains for unreachable vertices."""
+    indptr, indices = reverse
+    size = len(indptr) - 1
+    # Segments of vertices with predecessors, empty segments are not allowed by reduceat
+    has_pred = np.flatnonzero(np.diff(indptr) > 0)
+    starts = indptr[has_pred]
+    for first in range(0, len(sources), 64):
+        batch = np.asarray(sources[first:first + 64], dtype=np.int64)
+        rows = first + np.arange(len(batch))
+        seen = np.zeros(size, dtype=np.uint64)
+        np.bitwise_or.at(seen, batch, np.left_shift(np.uint64(1), np.arange(len(batch), dtype=np.uint64)))
+        frontier = seen.copy()
+        out[rows, batch] = 0
+        level = 0
+        while True:
+            level += 1
+            following = np.zeros(size, dtype=np.uint64)
+            if len(starts) > 0:
+                following[has_pred] = np.bitwise_or.reduceat(frontier[indices], starts)
+            following &= ~seen
+            reached = np.flatnonzero(following)
+            if len(reached) == 0:
+                break
+            seen[reached] |= following[reached]
+            frontier = following
+            # Bit j of a word is bit j % 8 of its (j // 8)-th byte in little-endian order
+            bits = np.unpackbits(following[reached].astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+            vertex, source = np.nonzero(bits)
+            out[rows[source], reached[vertex]] = level
+    return out
 
 
 class Graphexploration:
 
-    def __init__(self, graph: Graph):
-        """Constructor of the graph exploration class."""
+    # Available engines for the breadth first search
+    bfs_engines = ("queue", "frontier")
+
+    def __init__(self, graph: Graph, **optional):
+        """Constructor of the graph exploration class. The optional parameter 'bfs' selects the implementation of the BFS: 'queue' (default) explores vertex after vertex, 'frontier' expands whole layers with numpy operations on the CSR arrays of the graph. With 'frontier', the parameter 'directionOptimizing' set to True switches to bottom-up layers if the frontier is large. Computed results are stored in the ResultCache passed by the optional parameter 'cache', in a cache of its own limited to 'cacheBytes' bytes or by default in the cache returned by graph_cache.return_default_cache(). A Stats object passed by the optional parameter 'stats' counts the vertices explored and the edges scanned by the searches and measures the time of the phases 'construction', 'search' and 'results'."""
         self.__graph = graph
+        if "stats" in optional:
+            self.__stats = optional["stats"]
+            if not isinstance(self.__stats, Stats):
+                raise TypeError("\'stats\' has to be a Stats object.")
+        else:
+            self.__stats = None
+        if "bfs" in optional:
+            self.__bfs_engine = optional["bfs"]
+            if self.__bfs_engine not in Graphexploration.bfs_engines:
+                raise ValueError("\'bfs\' has to be one of " + str(Graphexploration.bfs_engines) + ".")
+        else:
+            self.__bfs_engine = "queue"
+        if "directionOptimizing" in optional:
+            self.__direction_optimizing = bool(optional["directionOptimizing"])
+        else:
+            self.__direction_optimizing = False
         
-        # Overview of already existing data for certain start vertices
-        # The first digit indicates the status regarding DFS data and the second digit regarding BFS data
-        # Example:  02 = no DFS data is available, BFS tree is available
-        #           12 = Data from depth search available, BFS tree available
-        # 2 - DFS tree is available
-        # 1 - Data from the depth search are available
-        # 0 - No data available
-        # 1 - Data from the breath search are available
-        # 2 - BFS tree is available
-
-        self.__data_check = np.zeros(self.__graph.return_num_vertices())
-        
-        # Data storage
-        self.__dfsNum = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__finNum = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__treeEdges = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__nonTreeEdges = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__backEdges = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__dfs_tree = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__bfs_dist = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__bfs_parent = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__bfs_tree = [None for i in range(0,self.__graph.return_num_vertices())]
-        self.__shortest_paths = {}
+        # Results of the DFS and the BFS, trees, paths and states of searches, which were stopped at a target vertex and can be resumed by later queries from the same start vertex, are stored in the cache under keys starting with the prefix
+        self.__cache, self.__prefix = _owner_cache(self, optional)
+        # CSR arrays as lists
+        self.__csr_lists = None
+        self.__reverse_lists = None
+        # Adjacencies sorted by edge weight, which are created on the first DFS
+        self.__sorted_adj = None
+        # Changes of a mutable graph only remove the affected results
+        if isinstance(graph, MutableGraph):
+            graph.add_listener(self.__graph_changed)
 
     # Getter-methods for data of the DFS
     def return_dfsNum(self, startVertex = 0):
         """Returns DFS-numbers to given start vertex."""
-        if self.__data_check[startVertex]//10 > 0:
-            return self.__dfsNum[startVertex]
-        else:
-            self.__depthsearch(startVertex)
-            return self.__dfsNum[startVertex]
+        return self.__dfs_data(startVertex)[0]
         
     def return_finNum(self, startVertex = 0):
         """Returns DFS-numbers to given start vertex."""
-        if self.__data_check[startVertex]//10 > 0:
-            return self.__finNum[startVertex]
-        else:
-            self.__depthsearch(startVertex)
-            return self.__finNum[startVertex]
+        return self.__dfs_data(startVertex)[1]
             
     def return_nontreeedges(self, startVertex = 0):
         """Returns the non-tree egdes of the DFS tree with the given start vertex."""
-        if self.__data_check[startVertex]//10 > 0:
-            return self.__nonTreeEdges[startVertex]
-        else:
-            self.__depthsearch(startVertex)
-            return self.__nonTreeEdges[startVertex]
+        return self.__dfs_data(startVertex)[3]
     
     def return_backwardedges(self, startVertex = 0):
         """Returns the backward egdes of the DFS tree with the given start vertex."""
-        if self.__data_check[startVertex]//10 > 0:
-            return self.__backEdges[startVertex]
-        else:
-            self.__depthsearch(startVertex)
-            return self.__backEdges[startVertex]
+        return self.__dfs_data(startVertex)[4]
             
     def return_dfs_tree(self, startVertex = 0):
         """Returns DFS-tree to given start vertex."""
-        if self.__data_check[startVertex]//10 == 2:
-            return self.__dfs_tree[startVertex]
-        elif self.__data_check[startVertex]//10 == 1:
-            self.__create_dfs_Tree(startVertex)
-            return self.__dfs_tree[startVertex]
-        else:
-            self.__depthsearch(startVertex)
-            self.__create_dfs_Tree(startVertex)
-            return self.__dfs_tree[startVertex]
+        tree = self.__lookup((self.__prefix, "dfsTree", startVertex))
+        if tree is None:
+            tree = self.__create_dfs_Tree(startVertex)
+        return tree
 	
     # Getter-methods for data of the BFS
     def return_bfsDist(self, startVertex = 0):
         """Returns BFS-distances to given start vertex."""
-        if self.__data_check[startVertex] % 10 > 0:
-            return self.__bfs_dist[startVertex]
-        else:
-            self.__breathsearch(startVertex)
-            return self.__bfs_dist[startVertex]
+        return self.__bfs_tuples(startVertex)[0]
             
     def return_bfsParent(self, startVertex = 0):
         """Returns parent vertex of each vertex of the BFS-tree with given start vertex as the root vertex."""
-        if self.__data_check[startVertex] % 10 > 0:
-            return self.__bfs_parent[startVertex]
+        return self.__bfs_tuples(startVertex)[1]
+        
+    def return_bfsDistArray(self, startVertex = 0):
+        """Returns BFS-distances to given start vertex as an int32 array, in which unreachable vertices have the distance -1."""
+        return self.__bfs_arrays(startVertex)[0]
+        
+    def return_bfsDist_many(self, sources, workers=None):
+        """Returns a matrix of BFS-distances, whose i-th row contains the distances to the i-th of the given start vertices as int32 values (-1 for unreachable vertices). The start vertices are distributed over 'workers' processes (default: number of CPUs), which share the arrays of the graph through shared memory."""
+        return run_many(self.__graph, sources, _bfs_lengths, np.int32, workers)
+        
+    def return_bfsDistMatrix(self, sources=None, **optional):
+        """Returns the matrix of BFS-distances, whose i-th row contains the distances from the i-th of the given start vertices (default: all vertices). A multi-source BFS runs 64 start vertices at once in the bits of uint64 words. The distances are stored as uint16 if the graph has less than 65535 vertices and as uint32 otherwise, unreachable vertices have the largest value of the data type. The optional parameter 'dtype' selects another unsigned integer type, 'path' stores the matrix in a memory-mapped .npy file instead of the memory, so it can be larger than the memory and loaded with np.load(path, mmap_mode="r")."""
+        size = self.__graph.return_num_vertices()
+        sources = np.arange(size) if sources is None else np.asarray(sources, dtype=np.int64).reshape(-1)
+        if np.any((sources < 0) | (sources >= size)):
+            raise ValueError("The sources have to be vertex indices of the graph.")
+        dtype = np.dtype(optional["dtype"] if "dtype" in optional else (np.uint16 if size < 65535 else np.uint32))
+        if dtype.kind != "u":
+            raise TypeError("\'dtype\' has to be an unsigned integer type.")
+        if size > np.iinfo(dtype).max:
+            raise ValueError("The distances of the graph do not fit into " + dtype.name + ".")
+        shape = (len(sources), size)
+        if "path" in optional:
+            out = np.lib.format.open_memmap(optional["path"], mode="w+", dtype=dtype, shape=shape)
+            out[...] = np.iinfo(dtype).max
         else:
-            self.__breathsearch(startVertex)
-            return self.__bfs_parent[startVertex]
+            out = np.full(shape, np.iinfo(dtype).max, dtype=dtype)
+        with self.__phase("search"):
+            _msbfs(self.__graph.return_reverseCsr()[:2], sources, out)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+        
+    def return_bfsParentArray(self, startVertex = 0):
+        """Returns parent vertex of each vertex of the BFS-tree with given start vertex as the root vertex as an int32 array, in which the root and unreachable vertices have the parent -1."""
+        return self.__bfs_arrays(startVertex)[1]
         
     def return_bfsSpanningTree(self, startVertex = 0):
         """Returns BFS-tree to given start vertex."""
-        if self.__data_check[startVertex] % 10 == 2:
-            return self.__bfs_tree[startVertex]
-        elif self.__data_check[startVertex] % 10 == 1:
-            self.__create_bfs_spanningTree(startVertex)
-            return self.__bfs_tree[startVertex]
-        else:
-            self.__breathsearch(startVertex)
-            self.__create_bfs_spanningTree(startVertex)
-            return self.__bfs_tree[startVertex]
+        tree = self.__lookup((self.__prefix, "bfsTree", startVertex))
+        if tree is None:
+            tree = self.__create_bfs_spanningTree(startVertex)
+        return tree
         
     def return_shortestPath(self, startVertex, endVertex):
-        """Returns a graph consisting of the shortest path between the given start and end vertex with respect to the number of edges."""
-        if (startVertex, endVertex) in self.__shortest_paths:
-            return self.__shortest_paths[(startVertex, endVertex)]
-        
-        prev = self.return_bfsParent(startVertex)
-        # If no path exists:
-        if prev[endVertex] == None :
-            return Graph(np.zeros((0, 0), dtype=np.int),vertexNames="")
-        
-        # Build up path
-        sub_mat = np.zeros((len(prev), len(prev)), dtype=np.int)
-        sub_list = []
-        j = endVertex
-        i = prev[j]
-        orig_mat = self.__graph.return_adjacencyMatrix()
-        while i != None:
-            sub_list.append((self.__graph.return_vertexName(i),self.__graph.return_vertexName(j),orig_mat[i][j]))
-            j = i
-            i = prev[j]
-            
-        name_order = self.__graph.return_names()
-        name_order = [x for x in name_order if x in list(zip(*sub_list))[0] or x in list(zip(*sub_list))[1]]
-        out = Graph(sub_list, dtype=self.__graph.return_weightType(),  vertexNames=name_order)
-        self.__shortest_paths[(startVertex, endVertex)] = out
+        """Returns the shortest path between the given start and end vertex with respect to the number of edges as a path, which answers the queries of the Graph class. to_graph() converts it into a Graph."""
+        out = self.__lookup((self.__prefix, "path", startVertex, endVertex))
+        if out is not None:
+            return out
+        
+        path = self.return_path(startVertex, endVertex)
+        # If no path exists, the path is empty
+        with self.__phase("results"):
+            out = Path(self.__graph, path if len(path) > 1 else ())
+            self.__count("resultsBuilt")
+        self.__cache.put((self.__prefix, "path", startVertex, endVertex), out)
         return out
         
+    def return_path(self, startVertex, endVertex, **optional):
+        """Returns the shortest path between the given start and end vertex with respect to the number of edges as a tuple of vertex indices, which is empty if no path exists. The BFS stops as soon as the end vertex is discovered. By default the state of the stopped search is kept and resumed by later queries from the same start vertex, the optional parameter 'keepState' set to False discards it. With the optional parameter 'bidirectional' set to True, a second BFS runs backwards from the end vertex on the transposed graph."""
+        size = self.__graph.return_num_vertices()
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+        if startVertex == endVertex:
+            return (startVertex,)
+        keep_state = optional["keepState"] if "keepState" in optional else True
+        bidirectional = optional["bidirectional"] if "bidirectional" in optional else False
+        
+        # The parents of a complete BFS are used if available
+        arrays = self.__lookup((self.__prefix, "bfsArrays", startVertex))
+        data = self.__lookup((self.__prefix, "bfs", startVertex)) if arrays is None else None
+        if arrays is not None:
+            prev = arrays[1].tolist()
+        elif data is not None:
+            prev = [-1 if p == None else p for p in data[1]]
+        else:
+            self.__prepare(bidirectional)
+            state = self.__lookup((self.__prefix, "search", startVertex))
+            if state is None:
+                state = _bfs_init(size, startVertex)
+            path = None
+            counts = [0, 0] if self.__stats is not None else None
+            head = state[3]
+            if state[0][endVertex] < 0:
+                with self.__phase("search"):
+                    if bidirectional:
+                        path = _bfs_bidirectional(self.__csr_lists, self.__reverse_lists, state, endVertex, counts)
+                    else:
+                        _bfs_resume(*self.__csr_lists, state, endVertex)
+                    if counts is not None:
+                        # The vertices explored by the forward search are the vertices removed from its queue
+                        self.__count_search(np.array(state[2][head:state[3]], dtype=np.int64), counts)
+            # The state is stored again, since its size has changed
+            if keep_state:
+                self.__cache.put((self.__prefix, "search", startVertex), state)
+            if path is not None:
+                return path
+            prev = state[1]
+        
+        if prev[endVertex] < 0:
+            return ()
+        path = [endVertex]
+        while prev[path[-1]] >= 0:
+            path.append(prev[path[-1]])
+        return tuple(reversed(path))
+        
     def return_graph(self):
         """Returns the considered graph."""
         return self.__graph
         
+    def return_stats(self):
+        """Returns the Stats object, which counts the work of this object, or None."""
+        return self.__stats
+        
+    def return_cache(self):
+        """Returns the cache, in which computed results are stored."""
+        return self.__cache
+        
     # Subfunctions for DFS
-    def __root(self, s, dfsNum, dfsPos):
-        dfsNum[s] = dfsPos
-        dfsPos += 1
-        return dfsPos
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which removes the cached results affected by a change of the graph."""
+        self.__csr_lists = None
+        self.__reverse_lists = None
+        self.__sorted_adj = None
+        for key in self.__cache.return_keys(self.__prefix):
+            value = self.__cache.peek(key)
+            if value is None:
+                continue
+            if key[1] == "dfs" or key[1] == "dfsTree":
+                # The DFS visits all vertices and depends on all edge weights
+                self.__cache.remove(key)
+            elif kind == "vertex":
+                # A new vertex is not reachable, so complete results are extended and paths stay valid
+                if key[1] == "bfs":
+                    self.__cache.put(key, (value[0] + (math.inf,), value[1] + (None,)))
+                elif key[1] == "bfsArrays":
+                    arrays = tuple(np.append(x, np.int32(-1)) for x in value)
+                    for x in arrays:
+                        x.flags.writeable = False
+                    self.__cache.put(key, arrays)
+                elif key[1] != "path":
+                    self.__cache.remove(key)
+            elif key[1] == "bfs" or key[1] == "bfsArrays":
+                dist, parent = value
+                if key[1] == "bfs":
+                    affected = _bfs_affected(dist[startVertex], dist[endVertex], parent[endVertex], startVertex, oldWeight, newWeight)
+                else:
+                    distStart = dist[startVertex] if dist[startVertex] >= 0 else math.inf
+                    distEnd = dist[endVertex] if dist[endVertex] >= 0 else math.inf
+                    affected = _bfs_affected(distStart, distEnd, parent[endVertex], startVertex, oldWeight, newWeight)
+                if affected:
+                    self.__cache.remove(key)
+                    self.__cache.remove((self.__prefix, "bfsTree", key[2]))
+            elif key[1] == "bfsTree":
+                # Trees are checked together with their BFS, without it the tree is removed. The tree contains the edge weights as well.
+                if self.__cache.peek((self.__prefix, "bfs", key[2])) is None and self.__cache.peek((self.__prefix, "bfsArrays", key[2])) is None:
+                    self.__cache.remove(key)
+                elif oldWeight != 0 and newWeight != 0 and value.return_parentArray()[endVertex] == startVertex:
+                    self.__cache.remove(key)
+            elif key[1] == "search":
+                # A stopped search may already have passed the start vertex of a new edge
+                dist, parent = value[0], value[1]
+                if (oldWeight == 0 and dist[startVertex] >= 0) or (newWeight == 0 and parent[endVertex] == startVertex):
+                    self.__cache.remove(key)
+            elif key[1] == "path":
+                # A new edge may create a shorter path between any vertices
+                if oldWeight == 0 or value.contains_edge(startVertex, endVertex):
+                    self.__cache.remove(key)
         
-    def __traverseNonTreeEdge(self, v, w, dfsNum, finNum, nonTreeEdges, backEdges):
-        # Store non-tree and backward edges
-        nonTreeEdges.append([v,w])
-        if (not dfsNum[v] < dfsNum[w]) and (not finNum[w] < finNum[v]) and finNum[w] == 0:
-            backEdges.append([v,w])
-    
-    def __traverseTreeEdge(self, v, w, dfsNum, dfsPos, treeEdges):
-        dfsNum[w] = dfsPos
+    def __phase(self, name):
+        """Returns a context manager measuring the given phase, which does nothing without statistics."""
+        return _no_phase if self.__stats is None else self.__stats.phase(name)
+        
+    def __count(self, name, n=1):
+        """Adds n to the given counter of the statistics, if statistics are recorded."""
+        if self.__stats is not None:
+            self.__stats.add(name, n)
+        
+    def __lookup(self, key):
+        """Returns the value stored in the cache under the given key or None and counts a hit or a miss in the statistics."""
+        value = self.__cache.get(key)
+        self.__count("cacheMisses" if value is None else "cacheHits")
+        return value
+        
+    def __prepare(self, reverse=False):
+        """Converts the CSR arrays and, if 'reverse' is True, the transposed CSR arrays to lists once."""
+        if self.__csr_lists is None or (reverse and self.__reverse_lists is None):
+            with self.__phase("construction"):
+                if self.__csr_lists is None:
+                    self.__csr_lists = tuple(x.tolist() for x in self.__adjacency_csr()[:2])
+                if reverse and self.__reverse_lists is None:
+                    self.__reverse_lists = tuple(x.tolist() for x in self.__graph.return_reverseCsr()[:2])
+                    
+    def __adjacency_csr(self):
+        """Returns the adjacencies in CSR format (indptr, indices, weights) in the order of the adjacency list, in which the searches traverse the edges."""
+        if self.__graph.is_sparse():
+            # In sparse format the adjacency list is given by the CSR arrays
+            return self.__graph.return_csr()
+        # The CSR rows are sorted by end vertex, but the adjacency list of a graph created from an adjacency list keeps the given order
+        adjacencies = self.__graph.return_adjacencyList()
+        indptr = np.zeros(len(adjacencies) + 1, dtype=np.int64)
+        np.cumsum([len(x) for x in adjacencies], out=indptr[1:])
+        indices = np.fromiter((w for x in adjacencies for w, weight in x), dtype=np.int64, count=indptr[-1])
+        weights = np.fromiter((weight for x in adjacencies for w, weight in x), dtype=self.__graph.return_weightType(), count=indptr[-1])
+        return indptr, indices, weights
+        
+    def __count_search(self, explored, counts=(0, 0)):
+        """Adds the explored vertices, given as an array, and their outgoing edges to the statistics together with the numbers of vertices and edges of a backward search in 'counts'."""
+        outdeg = np.diff(self.__graph.return_csr()[0])
+        self.__stats.add("settled", len(explored) + counts[0])
+        self.__stats.add("relaxed", int(outdeg[explored].sum()) + counts[1])
+        
+    def __sorted_adjacencies(self):
+        """Returns the adjacencies of all vertices in CSR format as lists, where the adjacencies of each vertex are sorted by edge weight. The sorting is done only once per graph."""
+        if self.__sorted_adj is None:
+            with self.__phase("construction"):
+                self.__sort_adjacencies()
+        return self.__sorted_adj
+        
+    def __sort_adjacencies(self):
+        """Sorts the adjacencies of all vertices by edge weight."""
+        indptr, indices, weights = self.__adjacency_csr()
+        rows = np.repeat(np.arange(self.__graph.return_num_vertices()), np.diff(indptr))
+        # The edges are given in the order of the adjacency list and lexsort is stable, so edges of equal weight keep that order
+        order = np.lexsort((weights, rows))
+        self.__sorted_adj = (indptr.tolist(), indices[order].tolist())
+        
+    def __dfs(self, s, dfsNum, dfsPos, finNum, finPos, treeEdges, nonTreeEdges, backEdges):
+        """Performs the actual DFS prozedure starting from the root s. Instead of recursion an explicit stack is used, so the depth of the DFS-tree is not limited."""
+        indptr, indices = self.__sorted_adjacencies()
+        # Position of the next outgoing edge to be traversed for each vertex on the stack
+        next_edge = {s: indptr[s]}
+        stack = [s]
+        dfsNum[s] = dfsPos
         dfsPos += 1
-        # Store tree edge
-        treeEdges.append([v,w])
-        return dfsPos
-        
-    def __backtrack(self, u, v, finNum, finPos):
-        finNum[v] = finPos
-        finPos += 1
-        return finPos
-        
-    def __dfs(self, u, v, dfsNum, dfsPos, finNum, finPos, treeEdges, nonTreeEdges, backEdges): # erkunde v, von u kommend
-        """Performs the actual DFS prozedure."""
-        if dfsNum[v] == 0: # If v has not been marked, mark v as active
-            dfsNum[v] = dfsPos
-            dfsPos += 1
-        # Iterate over all outgoing edges of v. If edges are weighted, traverse edge with minimal weight first
-        for w in sorted(self.__graph.return_adjacencies(v), key=lambda edge: edge[1]):
-            if dfsNum[w[0]] != 0: # If w has already been traversed:
-                self.__traverseNonTreeEdge(v,w[0], dfsNum, finNum, nonTreeEdges, backEdges)
-            else: # If w has not been traversed yet
-                dfsPos = self.__traverseTreeEdge(v, w[0], dfsNum, dfsPos, treeEdges)
-                dfsPos, finPos = self.__dfs(v, w[0], dfsNum, dfsPos, finNum, finPos, treeEdges, nonTreeEdges, backEdges)
-        finPos = self.__backtrack(u, v, finNum, finPos) # Knoten v als beendet markieren
+        while stack:
+            v = stack[-1]
+            k = next_edge[v]
+            # Iterate over all outgoing edges of v. If edges are weighted, traverse edge with minimal weight first
+            if k < indptr[v + 1]:
+                next_edge[v] = k + 1
+                w = indices[k]
+                if dfsNum[w] != 0: # If w has already been traversed:
+                    # Store non-tree and backward edges
+                    nonTreeEdges.append([v,w])
+                    if dfsNum[w] <= dfsNum[v] and finNum[w] == 0:
+                        backEdges.append([v,w])
+                else: # If w has not been traversed yet
+                    dfsNum[w] = dfsPos
+                    dfsPos += 1
+                    # Store tree edge
+                    treeEdges.append([v,w])
+                    next_edge[w] = indptr[w]
+                    stack.append(w)
+            else:
+                # Mark vertex v as finished
+                finNum[v] = finPos
+                finPos += 1
+                del next_edge[v]
+                stack.pop()
         return dfsPos, finPos
     
     def __dfs_init(self, dfsNum, finNum, dfsPos, finPos, treeEdges, nonTreeEdges, backEdges, startVertex):
-        vertexList = list(np.arange(self.__graph.return_num_vertices()))
+        vertexList = list(range(0, self.__graph.return_num_vertices()))
         vertexList.remove(startVertex)
         vertexList = [startVertex] + vertexList
         for s in vertexList:
             if dfsNum[s] == 0:
-                dfsPos = self.__root(s, dfsNum, dfsPos)
-                dfsPos, finPos = self.__dfs(s, s, dfsNum, dfsPos, finNum, finPos, treeEdges, nonTreeEdges, backEdges)
+                dfsPos, finPos = self.__dfs(s, dfsNum, dfsPos, finNum, finPos, treeEdges, nonTreeEdges, backEdges)
     
     def __depthsearch(self, startVertex):
         """Executes the depth search with given start vertex on the graph."""
-        # Arrays to store the temporal DFS-numbers, the final DFS-numbers as well as all tree, non-tree and backward edges
-        dfsNum = np.zeros(self.__graph.return_num_vertices())
-        finNum = np.zeros(self.__graph.return_num_vertices())
+        # Lists to store the temporal DFS-numbers, the final DFS-numbers as well as all tree, non-tree and backward edges
+        dfsNum = [0] * self.__graph.return_num_vertices()
+        finNum = [0] * self.__graph.return_num_vertices()
         treeEdges = []
         nonTreeEdges = []
         backEdges = []
 
         dfsPos = 1
         finPos = 1
-        self.__dfs_init(dfsNum, finNum, dfsPos, finPos, treeEdges, nonTreeEdges, backEdges, startVertex)
+        self.__sorted_adjacencies()
+        with self.__phase("search"):
+            self.__dfs_init(dfsNum, finNum, dfsPos, finPos, treeEdges, nonTreeEdges, backEdges, startVertex)
+            if self.__stats is not None:
+                # The DFS restarts until all vertices are explored
+                self.__count_search(np.arange(len(dfsNum)))
+        dfsNum = np.array(dfsNum, dtype=np.float64)
+        finNum = np.array(finNum, dtype=np.float64)
         # Store computed values
-        self.__dfsNum[startVertex] = tuple(dfsNum)
-        self.__finNum[startVertex] = tuple(finNum)
-        self.__treeEdges[startVertex] = tuple(treeEdges)
-        self.__nonTreeEdges[startVertex] = tuple(nonTreeEdges)
-        self.__backEdges[startVertex] = tuple(backEdges)
-        self.__data_check[startVertex] = 10 + self.__data_check[startVertex]%10
+        data = (tuple(dfsNum), tuple(finNum), tuple(treeEdges), tuple(nonTreeEdges), tuple(backEdges))
+        self.__cache.put((self.__prefix, "dfs", startVertex), data)
+        return data
+        
+    def __dfs_data(self, startVertex):
+        """Returns the DFS-numbers, the finishing numbers and the tree, non-tree and backward edges of the DFS with the given start vertex. Already computed results are taken from the cache."""
+        data = self.__lookup((self.__prefix, "dfs", startVertex))
+        if data is None:
+            data = self.__depthsearch(startVertex)
+        return data
         
     def __create_dfs_Tree(self, startVertex):
         """Creates a DFS-tree with the given start vertex."""
-        sub_list = []
-        orig_mat = self.__graph.return_adjacencyMatrix()
-        edges = self.__treeEdges[startVertex]
-        for e in edges:
-            sub_list.append( (self.__graph.return_vertexName(e[0]),self.__graph.return_vertexName(e[1]),orig_mat[e[0]][e[1]]) )
-            
+        edges = self.__dfs_data(startVertex)[2]
+        with self.__phase("results"):
+            src, dst = np.array(edges, dtype=np.int64).reshape(-1, 2).T
+            tree = Tree.from_edges(self.__graph, src, dst, startVertex)
+            self.__count("resultsBuilt")
         # Store computed values
-        if len(sub_list) > 0:
-            name_order = self.__graph.return_names()
-            name_order = [x for x in name_order if x in list(zip(*sub_list))[0] or x in list(zip(*sub_list))[1]]
-            self.__dfs_tree[startVertex] = Graph(sub_list, dtype=self.__graph.return_weightType(), vertexNames=name_order)
-        else: # Special case: No edges
-            self.__dfs_tree[startVertex] =  Graph(np.array([[0]], dtype=self.__graph.return_weightType()), vertexNames=[self.__graph.return_vertexName(startVertex)])
-        
-        self.__data_check[startVertex] = 20 + self.__data_check[startVertex]%10
+        self.__cache.put((self.__prefix, "dfsTree", startVertex), tree)
+        return tree
 
+    def __bfs_tuples(self, startVertex):
+        """Returns the BFS-distances and parents as tuples with 'inf' and 'None' for unreachable vertices. Already computed results are taken from the cache or converted from the stored arrays."""
+        data = self.__lookup((self.__prefix, "bfs", startVertex))
+        if data is None:
+            arrays = self.__lookup((self.__prefix, "bfsArrays", startVertex))
+            if arrays is None:
+                data, arrays = self.__breathsearch(startVertex)
+            if data is None:
+                data = self.__bfs_arrays_to_tuples(startVertex, arrays)
+        return data
+        
+    def __bfs_arrays(self, startVertex):
+        """Returns the BFS-distances and parents as int32 arrays with -1 for unreachable vertices. Already computed results are taken from the cache or converted from the stored tuples."""
+        arrays = self.__lookup((self.__prefix, "bfsArrays", startVertex))
+        if arrays is None:
+            data = self.__lookup((self.__prefix, "bfs", startVertex))
+            if data is None:
+                data, arrays = self.__breathsearch(startVertex)
+            if arrays is None:
+                arrays = self.__bfs_tuples_to_arrays(startVertex, data)
+        return arrays
+        
     def __breathsearch(self, startVertex = 0):
-        """Executes the BFS with the given start vertex."""
+        """Executes the BFS with the given start vertex using the selected engine. Returns the results as tuples or as arrays, depending on the engine, and None for the other representation."""
+        if self.__bfs_engine == "frontier":
+            indptr, indices, weights = self.__graph.return_csr()
+            reverse = self.__graph.return_reverseCsr() if self.__direction_optimizing else None
+            with self.__phase("search"):
+                dist, parent = _bfs_frontier(indptr, indices, startVertex, reverse)
+                if self.__stats is not None:
+                    self.__count_search(np.flatnonzero(dist >= 0))
+            # Print warning if not all vertices have been visited by the BFS
+            if np.any(dist < 0):
+                warn(Warning("During the executed width search, not all nodes in the graph could be reached from the selected start node."))
+            dist.flags.writeable = False
+            parent.flags.writeable = False
+            arrays = (dist, parent)
+            self.__cache.put((self.__prefix, "bfsArrays", startVertex), arrays)
+            return None, arrays
+        else:
+            with self.__phase("search"):
+                data = self.__breathsearch_queue(startVertex)
+                if self.__stats is not None:
+                    self.__count_search(np.flatnonzero(np.array(data[0]) != math.inf))
+            return data, None
+            
+    def __bfs_arrays_to_tuples(self, startVertex, arrays):
+        """Converts the BFS results stored as int32 arrays into tuples with 'inf' and 'None' for unreachable vertices."""
+        dist, parent = arrays
+        data = (tuple(np.where(dist < 0, math.inf, dist.astype(np.float64))), tuple(None if p < 0 else p for p in parent.tolist()))
+        self.__cache.put((self.__prefix, "bfs", startVertex), data)
+        return data
+        
+    def __bfs_tuples_to_arrays(self, startVertex, data):
+        """Converts the BFS results stored as tuples into int32 arrays with -1 for unreachable vertices."""
+        dist = np.array(data[0])
+        dist = np.where(dist == math.inf, -1, dist).astype(np.int32)
+        parent = np.array([-1 if p == None else p for p in data[1]], dtype=np.int32)
+        dist.flags.writeable = False
+        parent.flags.writeable = False
+        arrays = (dist, parent)
+        self.__cache.put((self.__prefix, "bfsArrays", startVertex), arrays)
+        return arrays
+        
+    def __breathsearch_queue(self, startVertex = 0):
+        """Executes the BFS with the given start vertex, exploring vertex after vertex."""
 
         dist = np.array([math.inf for i in range(0,self.__graph.return_num_vertices())]) # Stores distances of each vertex to the root
         parent = np.array([None for i in range(0,self.__graph.return_num_vertices())]) # Stores parent of each vertex
@@ -260,25 +656,16 @@ class Graphexploration:
         # Set parent of the root vertex to none
         parent[startVertex] = None
         # Store computed values
-        self.__bfs_dist[startVertex] = tuple(dist)
-        self.__bfs_parent[startVertex] = tuple(parent)
-        self.__data_check[startVertex] += 1
+        data = (tuple(dist), tuple(parent))
+        self.__cache.put((self.__prefix, "bfs", startVertex), data)
+        return data
         
     def __create_bfs_spanningTree(self, startVertex = 0):
         """Creates BFS-tree with given start vertex."""
-        sub_list = []
-        orig_mat = self.__graph.return_adjacencyMatrix()
-        prev = self.__bfs_parent[startVertex]
-        for j in range(0,len(prev)):
-            i = prev[j]
-            if i!=None:
-                sub_list.append((self.__graph.return_vertexName(i),self.__graph.return_vertexName(j),orig_mat[i][j]))
+        parent = self.return_bfsParent(startVertex)
+        with self.__phase("results"):
+            tree = Tree(self.__graph, parent, startVertex)
+            self.__count("resultsBuilt")
         # Store computed values
-        if len(sub_list) > 0:
-            name_order = self.__graph.return_names()
-            name_order = [x for x in name_order if x in list(zip(*sub_list))[0] or x in list(zip(*sub_list))[1]]
-            self.__bfs_tree[startVertex] = Graph(sub_list, dtype=self.__graph.return_weightType(), vertexNames=name_order)
-        else: # Special case: No edges
-            self.__bfs_tree[startVertex] =  Graph(np.array([[0]], dtype=self.__graph.return_weightType()), vertexNames=[self.__graph.return_vertexName(startVertex)])
-        
-        self.__data_check[startVertex] += 2
+        self.__cache.put((self.__prefix, "bfsTree", startVertex), tree)
+        return tree
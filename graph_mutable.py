@@ -0,0 +1,241 @@
+import numpy as np
+import sys
+import weakref
+from warnings import warn
+
+from graph import Graph
+
+
+def _is_decrease(oldWeight, newWeight):
+    """Returns whether a change of an edge from 'oldWeight' to 'newWeight', where 0 stands for a missing edge, adds the edge or makes it cheaper."""
+    return newWeight != 0 and (oldWeight == 0 or newWeight < oldWeight)
+
+
+class MutableGraph(Graph):
+    """Graph, whose vertices and edges can be changed. Each change increments a version counter and is reported to the registered listeners, so algorithm objects can invalidate only the affected results. The edges are stored in a dictionary per vertex, the CSR arrays and all other representations are created on demand from a frozen copy of the current version."""
+
+    def __init__(self, graph=None, **optional):
+        """Constructor of the mutable graph. 'graph' is either a Graph, whose content is copied, or the adjacency matrix or list accepted by the Graph class together with its optional parameters. Without 'graph' an empty graph is created, whose weight type is given by the optional parameter 'dtype' (default: float64)."""
+        if graph is None:
+            self.__type = np.dtype(optional["dtype"] if "dtype" in optional else np.float64)
+            self.__name_list = []
+            self.__out = []
+            self.__in = []
+        else:
+            if not isinstance(graph, Graph):
+                graph = Graph(graph, **optional)
+            self.__type = np.dtype(graph.return_weightType())
+            self.__name_list = list(graph.return_names())
+            indptr, indices, weights = graph.return_csr()
+            indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+            # Outgoing and incoming edges of each vertex as dictionaries {vertex: weight}
+            self.__out = [dict(zip(indices[indptr[v]:indptr[v + 1]], weights[indptr[v]:indptr[v + 1]])) for v in range(0, len(self.__name_list))]
+            self.__in = [{} for v in range(0, len(self.__name_list))]
+            for v in range(0, len(self.__name_list)):
+                for w, weight in self.__out[v].items():
+                    self.__in[w][v] = weight
+        self.__names = {self.__name_list[i]: i for i in range(0, len(self.__name_list))}
+        self.__num_edges = sum(len(x) for x in self.__out)
+        self.__version = 0
+        # Frozen copy of the current version, which is created on demand
+        self.__frozen = None
+        self.__listeners = []
+
+    @classmethod
+    def from_edges(cls, src, dst, weights=None, **optional):
+        """Bulk constructor, which creates a mutable graph from numpy arrays of start vertices, end vertices and weights. See Graph.from_edges."""
+        return cls(Graph.from_edges(src, dst, weights, **dict(optional, sparse=True)))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Loads a mutable graph from a binary file created with 'save'. See Graph.load."""
+        return cls(Graph.load(path, mmap))
+
+    def save(self, path):
+        """Stores the current version of the graph in a binary file. See Graph.save."""
+        self.to_graph().save(path)
+
+    def to_graph(self):
+        """Returns the current version as an immutable graph in sparse format. The graph is created once per version."""
+        if self.__frozen is None:
+            size = len(self.__name_list)
+            src = np.repeat(np.arange(size, dtype=np.int64), [len(x) for x in self.__out])
+            dst = np.fromiter((w for x in self.__out for w in x), dtype=np.int64, count=self.__num_edges)
+            weights = np.fromiter((weight for x in self.__out for weight in x.values()), dtype=self.__type, count=self.__num_edges)
+            self.__frozen = Graph.from_edges(src, dst, weights, vertexNames=self.__name_list, dtype=self.__type, sparse=True)
+        return self.__frozen
+
+    # Methods to change the graph
+    def add_vertex(self, name=None):
+        """Adds a vertex without edges and returns its index. Without name, the vertex is named by its index."""
+        index = len(self.__name_list)
+        if name is None:
+            name = index
+        if name in self.__names:
+            raise ValueError("A vertex named " + repr(name) + " already exists.")
+        self.__name_list.append(name)
+        self.__names[name] = index
+        self.__out.append({})
+        self.__in.append({})
+        self.__changed("vertex", index, index, 0, 0)
+        return index
+
+    def add_edge(self, startVertex, endVertex, weight=1):
+        """Adds the edge (startVertex, endVertex) with the given weight."""
+        self.__check_vertices(startVertex, endVertex)
+        if endVertex in self.__out[startVertex]:
+            raise ValueError("The edge already exists, its weight can be changed with set_weight.")
+        if startVertex == endVertex:
+            raise ValueError("The graph must not contain circles of length 1.")
+        weight = self.__check_weight(weight)
+        self.__out[startVertex][endVertex] = weight
+        self.__in[endVertex][startVertex] = weight
+        self.__num_edges += 1
+        self.__changed("edge", startVertex, endVertex, 0, weight)
+
+    def remove_edge(self, startVertex, endVertex):
+        """Removes the edge (startVertex, endVertex)."""
+        self.__check_vertices(startVertex, endVertex)
+        if endVertex not in self.__out[startVertex]:
+            raise ValueError("The edge does not exist.")
+        weight = self.__out[startVertex].pop(endVertex)
+        del self.__in[endVertex][startVertex]
+        self.__num_edges -= 1
+        self.__changed("edge", startVertex, endVertex, weight, 0)
+
+    def set_weight(self, startVertex, endVertex, weight):
+        """Changes the weight of the edge (startVertex, endVertex)."""
+        self.__check_vertices(startVertex, endVertex)
+        if endVertex not in self.__out[startVertex]:
+            raise ValueError("The edge does not exist.")
+        weight = self.__check_weight(weight)
+        old = self.__out[startVertex][endVertex]
+        if weight == old:
+            return
+        self.__out[startVertex][endVertex] = weight
+        self.__in[endVertex][startVertex] = weight
+        self.__changed("edge", startVertex, endVertex, old, weight)
+
+    def return_version(self):
+        """Returns the version of the graph, which is incremented by each change."""
+        return self.__version
+
+    def add_listener(self, callback):
+        """Registers a function, which is called after each change as callback(kind, startVertex, endVertex, oldWeight, newWeight). 'kind' is 'edge' for a change of an edge, where a weight of 0 stands for a missing edge, or 'vertex' for a new vertex, whose index is passed as start and end vertex. Bound methods are referenced weakly, so listening does not keep algorithm objects alive."""
+        if hasattr(callback, "__self__"):
+            self.__listeners.append(weakref.WeakMethod(callback))
+        else:
+            self.__listeners.append(lambda: callback)
+
+    def remove_listener(self, callback):
+        """Unregisters a function registered with add_listener."""
+        self.__listeners = [x for x in self.__listeners if x() is not None and x() != callback]
+
+    # Getter-methods
+    def is_adjacent(self, startVertex, endVertex):
+        """Returns whether the start node is adjacent to the end node"""
+        return endVertex in self.__out[startVertex]
+
+    def return_weight(self, startVertex, endVertex):
+        """Returns the weight of an edge (startVertex, endVertex)"""
+        return self.__type.type(self.__out[startVertex].get(endVertex, 0))
+
+    def return_num_vertices(self):
+        """Returns the number of nodes of the graph"""
+        return len(self.__name_list)
+
+    def return_num_edges(self):
+        """Returns the number of edges of the graph"""
+        return self.__num_edges
+
+    def return_outdeg(self, vertex):
+        """Returns the output degree of the selected node"""
+        return len(self.__out[vertex])
+
+    def return_indeg(self, vertex):
+        """Returns the input degree of the selected node"""
+        return len(self.__in[vertex])
+
+    def return_adjacencies(self, vertex):
+        """Returns all nodes that are adjacent to the selected node with the corresponding edge weight, ordered by vertex index"""
+        return tuple(sorted(self.__out[vertex].items()))
+
+    def return_inAdjacencies(self, vertex):
+        """Returns all nodes with an edge to the selected node with the corresponding edge weight, ordered by vertex index"""
+        return tuple(sorted(self.__in[vertex].items()))
+
+    def return_adjacencyMatrix(self):
+        """Returns the adjacency matrix of the current version, which is created on demand."""
+        return self.to_graph().return_adjacencyMatrix()
+
+    def return_adjacencyList(self):
+        """Returns the adjacency list of the graph"""
+        return tuple(self.return_adjacencies(v) for v in range(0, len(self.__name_list)))
+
+    def return_csr(self):
+        """Returns the current version in compressed sparse row format. See Graph.return_csr."""
+        return self.to_graph().return_csr()
+
+    def return_reverseCsr(self):
+        """Returns the transposed current version in compressed sparse row format. See Graph.return_reverseCsr."""
+        return self.to_graph().return_reverseCsr()
+
+    def return_nbytes(self):
+        """Returns an estimate of the memory occupied by the graph in bytes"""
+        nbytes = sys.getsizeof(self.__out) + sys.getsizeof(self.__in) + 2 * sum(sys.getsizeof(x) for x in self.__out)
+        nbytes += sys.getsizeof(self.__name_list) + sys.getsizeof(self.__names)
+        if self.__frozen is not None:
+            nbytes += self.__frozen.return_nbytes()
+        return nbytes
+
+    def is_sparse(self):
+        """Returns whether the graph is stored in sparse format only, which is always the case for mutable graphs"""
+        return True
+
+    def return_weightType(self):
+        """Returns the data type of the edge weights"""
+        return self.__type
+
+    def return_names(self):
+        """Returns the names of the nodes of the graph"""
+        return tuple(self.__name_list)
+
+    def return_vertexIndex(self, name):
+        """Returns the index of a node, given a name"""
+        return self.__names[name]
+
+    def return_vertexName(self, index):
+        """Returns the name of a node, given an index"""
+        return self.__name_list[index]
+
+    def return_hash(self):
+        """Returns a hash of the content of the current version. See Graph.return_hash."""
+        return self.to_graph().return_hash()
+
+    # Subfunctions
+    def __check_vertices(self, startVertex, endVertex):
+        """Raises an error if one of the vertices is not a vertex index of the graph."""
+        size = len(self.__name_list)
+        if not (0 <= startVertex < size and 0 <= endVertex < size):
+            raise ValueError("The start and end vertex have to be vertex indices of the graph.")
+
+    def __check_weight(self, weight):
+        """Casts the weight to the weight type of the graph and raises an error if it is not positive."""
+        if weight <= 0:
+            raise ValueError("Weights must be > 0.")
+        cast = self.__type.type(weight)
+        if cast != weight:
+            warn(Warning("The weight has been cast to the weight type of the graph."))
+        return cast.item()
+
+    def __changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Increments the version, drops the frozen copy and informs the listeners about a change."""
+        self.__version += 1
+        self.__frozen = None
+        alive = []
+        for ref in self.__listeners:
+            callback = ref()
+            if callback is not None:
+                alive.append(ref)
+                callback(kind, startVertex, endVertex, oldWeight, newWeight)
+        self.__listeners = alive
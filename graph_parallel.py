@@ -0,0 +1,95 @@
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from graph import Graph
+
+
+# Arrays of the graph and the result matrix, attached once per worker process
+_worker_arrays = {}
+
+
+def _share(arr):
+    """Copies an array into a new shared memory block. Returns the block and a picklable descriptor (name, shape, dtype) to attach to it."""
+    block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)
+    shared[...] = arr
+    return block, (block.name, arr.shape, arr.dtype.str)
+
+
+def _attach(descriptor):
+    """Attaches to the shared memory block of the given descriptor. Returns the block and the array stored in it."""
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(descriptors, out_descriptor):
+    """Initializer of the worker processes, which attaches the CSR arrays and the result matrix without copying them."""
+    blocks = []
+    arrays = []
+    for descriptor in descriptors:
+        block, arr = _attach(descriptor)
+        blocks.append(block)
+        arrays.append(arr)
+    block, out = _attach(out_descriptor)
+    blocks.append(block)
+    # The blocks have to be referenced as long as the arrays are used
+    _worker_arrays["blocks"] = blocks
+    _worker_arrays["csr"] = arrays
+    _worker_arrays["out"] = out
+
+
+def _run_chunk(kernel, rows, sources):
+    """Executes the kernel for a chunk of sources in a worker process and writes the results into the shared result matrix."""
+    indptr, indices, weights = _worker_arrays["csr"]
+    out = _worker_arrays["out"]
+    for row, source in zip(rows, sources):
+        out[row] = kernel(indptr, indices, weights, source)
+    return len(rows)
+
+
+def run_many(g: Graph, sources, kernel, dtype, workers=None):
+    """Executes kernel(indptr, indices, weights, source) for each of the given sources and returns a matrix of the given data type, whose i-th row is the result for sources[i]. 'kernel' has to be a module level function returning one value per vertex. If 'workers' is larger than 1 (default: number of CPUs), the sources are distributed over a pool of processes, which share the CSR arrays of the graph and the result matrix through shared memory."""
+    sources = [int(s) for s in sources]
+    size = g.return_num_vertices()
+    if any(s < 0 or s >= size for s in sources):
+        raise ValueError("The sources have to be vertex indices of the graph.")
+    if workers == None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(sources))
+
+    csr = g.return_csr()
+    if workers <= 1:
+        out = np.empty((len(sources), size), dtype=dtype)
+        for row, source in enumerate(sources):
+            out[row] = kernel(*csr, source)
+        return out
+
+    blocks = []
+    out = None
+    try:
+        descriptors = []
+        for arr in csr:
+            block, descriptor = _share(np.ascontiguousarray(arr))
+            blocks.append(block)
+            descriptors.append(descriptor)
+        block, out_descriptor = _share(np.empty((len(sources), size), dtype=dtype))
+        blocks.append(block)
+        out = np.ndarray((len(sources), size), dtype=dtype, buffer=block.buf)
+
+        # Several chunks per worker balance sources of different cost
+        chunk = max(1, -(-len(sources) // (4 * workers)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(descriptors, out_descriptor)) as pool:
+            futures = [pool.submit(_run_chunk, kernel, list(range(i, min(i + chunk, len(sources)))), sources[i:i + chunk]) for i in range(0, len(sources), chunk)]
+            for future in futures:
+                future.result()
+        # The result is copied out of the shared memory, which is released afterwards
+        return np.array(out)
+    finally:
+        # The view on the shared memory has to be released before the block can be closed
+        out = None
+        for block in blocks:
+            block.close()
+            block.unlink()
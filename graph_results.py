@@ -0,0 +1,261 @@
+import numpy as np
+from collections.abc import Sequence
+
+from graph import Graph, _is_subgraph
+from graph_mutable import MutableGraph
+
+
+def _edge_weights(g: Graph, src, dst):
+    """Returns the weights of the edges (src[i], dst[i]) of the graph as an array."""
+    if not g.is_sparse():
+        return g.return_adjacencyMatrix()[src, dst]
+    indptr, indices, weights = g.return_csr()
+    # In sparse format the adjacencies of each vertex are sorted, so all edges are searched at once by a binary search within the rows
+    lo = indptr[src]
+    hi = indptr[src + 1]
+    active = lo < hi
+    while np.any(active):
+        mid = (lo + hi) // 2
+        less = active & (indices[np.where(active, mid, 0)] < dst)
+        lo = np.where(less, mid + 1, lo)
+        hi = np.where(active & ~less, mid, hi)
+        active = lo < hi
+    return weights[lo]
+
+
+class NameView(Sequence):
+    """Read-only sequence of the names of some vertices of a graph, which looks the names up on access instead of copying them."""
+
+    def __init__(self, g: Graph, vertices):
+        self.__graph = g
+        self.__vertices = vertices
+
+    def __len__(self):
+        return len(self.__vertices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self.__graph.return_vertexName(v) for v in self.__vertices[index].tolist())
+        return self.__graph.return_vertexName(self.__vertices[index])
+
+    def __eq__(self, other):
+        if isinstance(other, (NameView, tuple, list)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "NameView(" + repr(tuple(self)) + ")"
+
+
+class _Subgraph:
+    """Subgraph of a graph given by its edges, which answers the queries of the Graph class on its own arrays. Vertices are numbered in the order of the original graph. Other methods of the Graph class are forwarded to a Graph, which is created on the first such call."""
+
+    def __init__(self, g: Graph, src, dst, vertices=None):
+        """'src' and 'dst' are the start and end vertices of the edges as vertex indices of the graph 'g'. 'vertices' are additional vertices without edges."""
+        self.__graph = g
+        # Version of a mutable graph, whose edges the subgraph is made of
+        self.__version = g.return_version() if isinstance(g, MutableGraph) else None
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        extra = np.asarray(vertices if vertices is not None else [], dtype=np.int64)
+        # Indices of the vertices in the original graph, which inherit its vertex order
+        self.__vertices = np.unique(np.concatenate((src, dst, extra)))
+        # Edges sorted by start and end vertex in local indices
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        self.__weights = _edge_weights(g, src, dst)
+        self.__indices = np.searchsorted(self.__vertices, dst)
+        self.__indptr = np.zeros(len(self.__vertices) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(np.searchsorted(self.__vertices, src), minlength=len(self.__vertices)), out=self.__indptr[1:])
+        for arr in (self.__vertices, self.__weights, self.__indices, self.__indptr):
+            arr.flags.writeable = False
+        self.__as_graph = None
+
+    def __getattr__(self, name):
+        # Private attributes are never forwarded, so missing attributes during construction do not recurse
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.to_graph(), name)
+
+    def to_graph(self):
+        """Returns the subgraph as an instance of the Graph class, which is created on the first call."""
+        if self.__as_graph is None:
+            src = np.repeat(np.arange(len(self.__vertices)), np.diff(self.__indptr))
+            self.__as_graph = Graph.from_edges(src, self.__indices, self.__weights, vertexNames=list(self.return_names()), dtype=self.__graph.return_weightType(), sparse=self.__graph.is_sparse())
+        return self.__as_graph
+
+    def return_graph(self):
+        """Returns the graph, of which this is a subgraph."""
+        return self.__graph
+
+    def return_baseIndices(self):
+        """Returns the indices of the vertices in the original graph as an array."""
+        return self.__vertices
+
+    def return_baseIndex(self, vertex):
+        """Returns the index of the given vertex in the original graph."""
+        return int(self.__vertices[vertex])
+
+    def return_num_vertices(self):
+        """Returns the number of nodes of the subgraph"""
+        return len(self.__vertices)
+
+    def return_num_edges(self):
+        """Returns the number of edges of the subgraph"""
+        return len(self.__indices)
+
+    def return_names(self):
+        """Returns the names of the nodes of the subgraph as a read-only view on the names of the original graph"""
+        return NameView(self.__graph, self.__vertices)
+
+    def return_vertexName(self, index):
+        """Returns the name of a node, given an index"""
+        return self.__graph.return_vertexName(self.__vertices[index])
+
+    def return_vertexIndex(self, name):
+        """Returns the index of a node, given a name"""
+        base = self.__graph.return_vertexIndex(name)
+        index = np.searchsorted(self.__vertices, base)
+        if index == len(self.__vertices) or self.__vertices[index] != base:
+            raise KeyError(name)
+        return int(index)
+
+    def return_weightType(self):
+        """Returns the data type of the edge weights"""
+        return self.__graph.return_weightType()
+
+    def is_sparse(self):
+        """Returns whether the original graph is stored in sparse format only"""
+        return self.__graph.is_sparse()
+
+    def return_csr(self):
+        """Returns the subgraph in compressed sparse row format as a tuple (indptr, indices, weights)."""
+        return self.__indptr, self.__indices, self.__weights
+
+    def return_adjacencies(self, vertex):
+        """Returns all nodes that are adjacent to the selected node with the corresponding edge weight"""
+        begin = self.__indptr[vertex]
+        end = self.__indptr[vertex + 1]
+        return tuple(zip(self.__indices[begin:end].tolist(), self.__weights[begin:end].tolist()))
+
+    def return_adjacencyList(self):
+        """Returns the adjacency list of the subgraph"""
+        return tuple(self.return_adjacencies(v) for v in range(0, len(self.__vertices)))
+
+    def __find_edge(self, startVertex, endVertex):
+        """Returns the position of the edge (startVertex, endVertex) in the CSR arrays or -1 if the edge does not exist."""
+        begin = self.__indptr[startVertex]
+        end = self.__indptr[startVertex + 1]
+        pos = begin + np.searchsorted(self.__indices[begin:end], endVertex)
+        if pos < end and self.__indices[pos] == endVertex:
+            return pos
+        return -1
+
+    def is_adjacent(self, startVertex, endVertex):
+        """Returns whether the start node is adjacent to the end node"""
+        return self.__find_edge(startVertex, endVertex) >= 0
+
+    def return_weight(self, startVertex, endVertex):
+        """Returns the weight of an edge (startVertex, endVertex)"""
+        pos = self.__find_edge(startVertex, endVertex)
+        return self.__weights[pos] if pos >= 0 else self.__weights.dtype.type(0)
+
+    def return_outdeg(self, vertex):
+        """Returns the output degree of the selected node"""
+        return self.__indptr[vertex + 1] - self.__indptr[vertex]
+
+    def return_indeg(self, vertex):
+        """Returns the input degree of the selected node"""
+        return np.count_nonzero(self.__indices == vertex)
+
+    def return_nbytes(self):
+        """Returns an estimate of the memory occupied by the subgraph in bytes, without the original graph"""
+        nbytes = sum(arr.nbytes for arr in (self.__vertices, self.__weights, self.__indices, self.__indptr))
+        if self.__as_graph is not None:
+            nbytes += self.__as_graph.return_nbytes()
+        return nbytes
+
+    def __is_current(self):
+        """Returns whether the original graph has not been changed since the creation of the subgraph."""
+        return self.__version is None or self.__version == self.__graph.return_version()
+
+    def return_edgeCodes(self):
+        """Returns each edge (i, j) encoded as i*n+j with the vertex indices of the original graph and its number of vertices n as a sorted array."""
+        src = self.__vertices[np.repeat(np.arange(len(self.__vertices)), np.diff(self.__indptr))]
+        return src * self.__graph.return_num_vertices() + self.__vertices[self.__indices]
+
+    def is_subgraph_of(self, other):
+        """Returns 'True' if the subgraph is a subgraph of the given graph, otherwise 'False'"""
+        # A subgraph is made of edges of the original graph, unless a mutable graph has been changed since
+        if other is self.__graph and self.__is_current():
+            return True
+        if isinstance(other, _Subgraph) and other.return_graph() is self.__graph and self.__is_current() and other.__is_current():
+            return bool(np.all(np.isin(self.__vertices, other.return_baseIndices())) and np.all(np.isin(self.return_edgeCodes(), other.return_edgeCodes())))
+        if not isinstance(other, (_Subgraph, Graph)):
+            raise TypeError("Only works between graphs.")
+        elif other.return_num_vertices() == 0:
+            return False
+        return _is_subgraph(self, other)
+
+
+class Path(_Subgraph):
+    """Path of a graph given by the sequence of its vertices."""
+
+    def __init__(self, g: Graph, vertices):
+        """'vertices' is the sequence of the vertex indices of the path in the graph 'g', which is empty if there is no path."""
+        self.__path = np.array(vertices, dtype=np.int64)
+        self.__path.flags.writeable = False
+        super().__init__(g, self.__path[:-1], self.__path[1:], self.__path)
+
+    def return_path(self):
+        """Returns the vertex indices of the path in the original graph as a tuple."""
+        return tuple(self.__path.tolist())
+
+    def return_pathNames(self):
+        """Returns the names of the vertices of the path in their order along the path."""
+        return NameView(self.return_graph(), self.__path)
+
+    def contains_edge(self, startVertex, endVertex):
+        """Returns whether the edge (startVertex, endVertex), given by vertex indices of the original graph, is an edge of the path."""
+        return bool(np.any((self.__path[:-1] == startVertex) & (self.__path[1:] == endVertex)))
+
+    def return_length(self):
+        """Returns the sum of the weights of the edges of the path."""
+        return self.return_csr()[2].sum()
+
+
+class Tree(_Subgraph):
+    """Tree of a graph given by the parent of each vertex."""
+
+    def __init__(self, g: Graph, parent, root):
+        """'parent' contains for each vertex index of the graph 'g' the index of its parent, where -1 (or None) marks the root and vertices not contained in the tree. 'root' is the vertex index of the root."""
+        parent = np.array([-1 if p is None else p for p in parent] if not isinstance(parent, np.ndarray) else parent, dtype=np.int64)
+        dst = np.flatnonzero(parent >= 0)
+        super().__init__(g, parent[dst], dst, [root])
+        self.__root = root
+        self.__parent = parent
+        self.__parent.flags.writeable = False
+
+    @classmethod
+    def from_edges(cls, g: Graph, src, dst, root):
+        """Creates the tree from its edges (src[i], dst[i]) given as vertex indices of the graph 'g'."""
+        parent = np.full(g.return_num_vertices(), -1, dtype=np.int64)
+        parent[np.asarray(dst, dtype=np.int64)] = np.asarray(src, dtype=np.int64)
+        return cls(g, parent, root)
+
+    def return_root(self):
+        """Returns the vertex index of the root in the original graph."""
+        return self.__root
+
+    def return_parentArray(self):
+        """Returns for each vertex index of the original graph the index of its parent as an array, where -1 marks the root and vertices not contained in the tree."""
+        return self.__parent
+
+    def return_pathTo(self, vertex):
+        """Returns the path from the root to the given vertex index of the original graph, which is empty if the vertex is not contained in the tree."""
+        if vertex != self.__root and self.__parent[vertex] < 0:
+            return Path(self.return_graph(), [])
+        path = [vertex]
+        while self.__parent[path[-1]] >= 0:
+            path.append(int(self.__parent[path[-1]]))
+        return Path(self.return_graph(), path[::-1])
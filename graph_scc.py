@@ -0,0 +1,195 @@
+import numpy as np
+
+from graph import Graph, _index_dtype
+from graph_mutable import MutableGraph
+
+
+def _tarjan(indptr, indices):
+    """Iterative version of Tarjan's algorithm on CSR arrays given as lists. Returns for each vertex the number of its strongly connected component, where components are numbered in the order they are completed, i.e. in reverse topological order of the condensation, and the number of components."""
+    size = len(indptr) - 1
+    index = [-1] * size
+    low = [0] * size
+    label = [-1] * size
+    stack = []
+    counter = 0
+    components = 0
+    for root in range(0, size):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        # Each entry of the call stack holds a vertex and the position of its next adjacency in the CSR arrays
+        calls = [[root, indptr[root]]]
+        while calls:
+            top = calls[-1]
+            v, pos = top
+            end = indptr[v + 1]
+            while pos < end:
+                w = indices[pos]
+                pos += 1
+                if index[w] < 0:
+                    break
+                # Vertices of completed components are not on the stack anymore
+                if label[w] < 0 and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                calls.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        label[w] = components
+                        if w == v:
+                            break
+                    components += 1
+                if calls:
+                    u = calls[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                continue
+            top[1] = pos
+            index[w] = low[w] = counter
+            counter += 1
+            stack.append(w)
+            calls.append([w, indptr[w]])
+    return label, components
+
+
+def _induced_components(indptr, indices, vertices):
+    """Tarjan's algorithm on the subgraph induced by the given vertices of the CSR arrays given as lists. Returns the strongly connected components as lists of vertices in the order they are completed."""
+    local = {v: i for i, v in enumerate(vertices)}
+    subIndptr = [0]
+    subIndices = []
+    for v in vertices:
+        subIndices.extend(local[w] for w in indices[indptr[v]:indptr[v + 1]] if w in local)
+        subIndptr.append(len(subIndices))
+    label, count = _tarjan(subIndptr, subIndices)
+    components = [[] for i in range(0, count)]
+    for v, component in zip(vertices, label):
+        components[component].append(v)
+    return components
+
+
+def is_acyclic(g: Graph):
+    """Returns 'True' if the graph does not contain circles. A single DFS stops at the first edge back to a vertex on the current path, so the test runs in O(V+E) and usually ends early on cyclic graphs."""
+    indptr, indices = (x.tolist() for x in g.return_csr()[:2])
+    size = len(indptr) - 1
+    # 0: not visited, 1: on the current path, 2: finished
+    state = [0] * size
+    for root in range(0, size):
+        if state[root] != 0:
+            continue
+        state[root] = 1
+        calls = [[root, indptr[root]]]
+        while calls:
+            top = calls[-1]
+            v, pos = top
+            end = indptr[v + 1]
+            while pos < end:
+                w = indices[pos]
+                pos += 1
+                if state[w] == 1:
+                    return False
+                if state[w] == 0:
+                    break
+            else:
+                state[v] = 2
+                calls.pop()
+                continue
+            top[1] = pos
+            state[w] = 1
+            calls.append([w, indptr[w]])
+    return True
+
+
+class StrongComponents:
+    
+    def __init__(self, g: Graph):
+        """Constructor of the class of strongly connected components. 'g' should contain the graph to be considered. The components are computed on the first query in O(V+E)."""
+        self.__graph = g
+        self.__labels = None
+        self.__num_components = 0
+        self.__sizes = None
+        self.__condensation = None
+        # The components are computed again after a change of the edges of a mutable graph
+        if isinstance(g, MutableGraph):
+            g.add_listener(self.__graph_changed)
+            
+    def return_graph(self):
+        """Returns the considered graph."""
+        return self.__graph
+        
+    def return_labels(self):
+        """Returns for each vertex the label of its strongly connected component as an array. Labels are numbered in topological order of the condensation, so each edge between different components leads to a larger label."""
+        if self.__labels is None:
+            self.__compute()
+        return self.__labels
+        
+    def return_num_components(self):
+        """Returns the number of strongly connected components."""
+        if self.__labels is None:
+            self.__compute()
+        return self.__num_components
+        
+    def return_sizes(self):
+        """Returns the number of vertices of each component as an array indexed by label."""
+        if self.__labels is None:
+            self.__compute()
+        return self.__sizes
+        
+    def return_component(self, label):
+        """Returns the vertex indices of the component with the given label as an array."""
+        return np.flatnonzero(self.return_labels() == label)
+        
+    def return_cyclicVertices(self):
+        """Returns the vertex indices, which lie on a circle, i.e. the vertices of components with at least two vertices, as an array."""
+        labels = self.return_labels()
+        return np.flatnonzero(self.__sizes[labels] > 1)
+        
+    def is_strongly_connected(self):
+        """Returns 'True' if each vertex can be reached from each other vertex."""
+        return self.return_num_components() <= 1
+        
+    def is_acyclic(self):
+        """Returns 'True' if the graph does not contain circles, i.e. if each component consists of a single vertex."""
+        return self.return_num_components() == self.__graph.return_num_vertices()
+        
+    def may_reach(self, startVertex, endVertex):
+        """Returns 'False' if there is certainly no path from the start vertex to the end vertex, since the component of the end vertex precedes the component of the start vertex in topological order. 'True' means, that a path may exist."""
+        labels = self.return_labels()
+        return bool(labels[startVertex] <= labels[endVertex])
+        
+    def return_condensation(self):
+        """Returns the condensation of the graph, i.e. the acyclic graph with a vertex for each component (named by its label) and an edge between two components, if the graph contains an edge between their vertices. The weight of such an edge is the smallest weight of these edges. The condensation is stored in sparse format."""
+        if self.__condensation is None:
+            labels = self.return_labels()
+            indptr, indices, weights = self.__graph.return_csr()
+            src = labels[np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))]
+            dst = labels[indices]
+            between = src != dst
+            src, dst, weights = src[between], dst[between], weights[between]
+            # The smallest weight of parallel edges is kept
+            order = np.lexsort((weights, dst, src))
+            src, dst, weights = src[order], dst[order], weights[order]
+            first = np.ones(len(src), dtype=bool)
+            first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+            self.__condensation = Graph.from_edges(src[first], dst[first], weights[first], vertexNames=list(range(0, self.__num_components)), dtype=self.__graph.return_weightType(), sparse=True)
+        return self.__condensation
+        
+    def __compute(self):
+        """Computes the labels of the components."""
+        indptr, indices = (x.tolist() for x in self.__graph.return_csr()[:2])
+        label, components = _tarjan(indptr, indices)
+        # Tarjan's algorithm completes the components in reverse topological order
+        labels = components - 1 - np.array(label, dtype=_index_dtype(components + 1))
+        labels.flags.writeable = False
+        self.__labels = labels
+        self.__num_components = components
+        self.__sizes = np.bincount(labels, minlength=components)
+        self.__sizes.flags.writeable = False
+        
+    def __graph_changed(self, kind, startVertex, endVertex, oldWeight, newWeight):
+        """Listener of a mutable graph, which drops the components after a change of the graph."""
+        self.__labels = None
+        self.__sizes = None
+        self.__condensation = None
@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager, nullcontext
+from threading import RLock
+
+
+# Context manager used instead of the phases of the statistics, if no statistics are recorded
+_no_phase = nullcontext()
+
+
+class Stats:
+
+    # Counted events
+    counters = ("settled", "relaxed", "heapPushes", "heapPops", "cacheHits", "cacheMisses", "resultsBuilt")
+
+    def __init__(self, callback=None):
+        """Constructor of the statistics of algorithm objects, which are passed to them by the optional parameter 'stats'. Several objects may share one instance. 'callback' is called after each measured phase as callback(phase, seconds, counts), where 'counts' is a dictionary of the events counted during the phase."""
+        self.__callback = callback
+        self.__counts = dict.fromkeys(Stats.counters, 0)
+        # Accumulated wall time and number of executions of each phase
+        self.__times = {}
+        self.__calls = {}
+        self.__lock = RLock()
+
+    def add(self, name, n=1):
+        """Adds n to the counter of the given event."""
+        with self.__lock:
+            self.__counts[name] += n
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager, which measures the wall time of a phase and reports it to the callback."""
+        before = dict(self.__counts) if self.__callback is not None else None
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            with self.__lock:
+                self.__times[name] = self.__times.get(name, 0.0) + seconds
+                self.__calls[name] = self.__calls.get(name, 0) + 1
+            if self.__callback is not None:
+                self.__callback(name, seconds, {k: self.__counts[k] - before[k] for k in Stats.counters})
+
+    def reset(self):
+        """Sets all counters and times to 0."""
+        with self.__lock:
+            self.__counts = dict.fromkeys(Stats.counters, 0)
+            self.__times = {}
+            self.__calls = {}
+
+    # Getter-methods
+    def return_count(self, name):
+        """Returns the counter of the given event."""
+        return self.__counts[name]
+
+    def return_counts(self):
+        """Returns a dictionary of all counters."""
+        return dict(self.__counts)
+
+    def return_times(self):
+        """Returns a dictionary of the accumulated wall time of each phase in seconds."""
+        return dict(self.__times)
+
+    def return_calls(self):
+        """Returns a dictionary of the number of executions of each phase."""
+        return dict(self.__calls)
+
+    def return_stats(self):
+        """Returns a dictionary of the counters, the times and the numbers of executions of the phases."""
+        return {"counts": self.return_counts(), "times": self.return_times(), "calls": self.return_calls()}
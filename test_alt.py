@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from graph import Graph, random_graph
+from graph_alt import ALT
+from graph_dijkstra import Dijkstra
+from graph_mutable import MutableGraph
+
+class TestALT(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0,0],
+                             [0,0,2,5,0],
+                             [0,0,0,1,0],
+                             [4,0,0,0,0],
+                             [0,0,0,0,0]], dtype=np.int64)
+        self.graph = Graph(self.mat, vertexNames=['a','b','c','d','e'])
+
+    def test_queries(self):
+        """Tests distances, paths and bounds on a small graph."""
+        alt = ALT(self.graph, landmarks=[3])
+        self.assertEqual(alt.return_landmarks(), (3,))
+        self.assertEqual(alt.return_distance(0, 3), 6)
+        self.assertEqual(alt.return_path(0, 3), (0, 1, 2, 3))
+        self.assertEqual(alt.return_shortestPath(0, 3).return_names(), ('a', 'b', 'c', 'd'))
+        self.assertEqual((alt.return_distance(0, 4), alt.return_path(0, 4), alt.return_path(2, 2)), (np.inf, (), (2,)))
+        # d(0, 3) >= d(0, 'd') - d(3, 'd') = 6 and d(0, 3) <= d(0, 'd') + d('d', 3) = 6
+        self.assertEqual(alt.return_bounds(0, 3), (6, 6))
+        self.assertEqual(alt.return_bounds(1, 0), (0, 7))
+        self.assertEqual(alt.return_bounds(3, 1), (7, 7))
+        self.assertEqual(alt.return_bounds(0, 4)[1], np.inf)
+        self.assertRaises(ValueError, alt.return_distance, 0, 5)
+        self.assertRaises(ValueError, ALT, self.graph, selection="random")
+        self.assertRaises(ValueError, ALT, self.graph, landmarks=[7])
+
+    def test_random(self):
+        """Tests the queries of both selection heuristics against Dijkstra's algorithm."""
+        g = random_graph(120, True, 0.03, seed=2, sparse=True)
+        dijkstra = Dijkstra(g, cacheBytes=10**7)
+        rng = np.random.default_rng(2)
+        for selection in ALT.selections:
+            alt = ALT(g, landmarks=4, selection=selection, seed=1)
+            self.assertEqual(len(set(alt.return_landmarks())), 4)
+            for i in range(0, 150):
+                s, t = rng.integers(0, 120, 2).tolist()
+                expected = dijkstra.return_shortestPathLengths(s)[t]
+                self.assertEqual(alt.return_distance(s, t), expected)
+                lower, upper = alt.return_bounds(s, t)
+                # The bounds are differences of rounded path lengths
+                self.assertTrue(lower - 1e-9 <= expected <= upper + 1e-9)
+                path = alt.return_path(s, t)
+                if path:
+                    self.assertEqual(sum(g.return_weight(u, v) for u, v in zip(path, path[1:])), expected)
+
+    def test_persistence(self):
+        """Tests storing and loading the index and the invalidation after a change of a mutable graph."""
+        g = MutableGraph(self.mat, vertexNames=['a','b','c','d','e'])
+        alt = ALT(g, landmarks=2, seed=0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "alt.npz")
+            alt.save(path)
+            loaded = ALT.load(g, path)
+            self.assertEqual(loaded.return_landmarks(), alt.return_landmarks())
+            self.assertEqual((loaded.return_distance(1, 0), loaded.return_bounds(1, 0)), (alt.return_distance(1, 0), alt.return_bounds(1, 0)))
+            self.assertRaises(ValueError, ALT.load, self.graph.__class__(self.mat * 2, vertexNames=['a','b','c','d','e']), path)
+            g.set_weight(1, 3, 1)
+            self.assertRaises(ValueError, alt.return_distance, 0, 3)
+            self.assertRaises(ValueError, loaded.return_bounds, 0, 3)
+            self.assertRaises(ValueError, ALT.load, g, path)
@@ -0,0 +1,92 @@
+import unittest
+import os
+import tempfile
+import gc
+import numpy as np
+
+from graph import Graph, random_graph
+import graph_apsp
+from graph_apsp import FloydWarshall
+from graph_dijkstra import Dijkstra
+from graph_mutable import MutableGraph
+
+class TestFloydWarshall(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0],
+                             [0,0,2,5],
+                             [0,0,0,1],
+                             [0,0,0,0]], dtype=np.int64)
+        self.graph = Graph(self.mat, vertexNames=['a','b','c','d'])
+
+    def test_paths(self):
+        """Tests the path lengths, predecessors and paths on a small graph."""
+        apsp = FloydWarshall(self.graph)
+        self.assertEqual(apsp.return_shortestPathLengths(0), (0, 3, 5, 6))
+        self.assertEqual(apsp.return_shortestPathLengths(3), (np.inf, np.inf, np.inf, 0))
+        self.assertEqual(apsp.return_parent(0), (None, 0, 1, 2))
+        self.assertEqual(apsp.return_path(0, 3), (0, 1, 2, 3))
+        self.assertEqual((apsp.return_path(3, 0), apsp.return_path(2, 2)), ((), (2,)))
+        self.assertEqual(apsp.return_shortestPath(0, 3).return_names(), ('a', 'b', 'c', 'd'))
+        self.assertEqual(apsp.return_predecessors().dtype, np.int32)
+        self.assertEqual(apsp.return_distances().flags.writeable, False)
+        self.assertRaises(ValueError, apsp.return_path, 0, 4)
+
+    def test_random(self):
+        """Tests the path lengths against Dijkstra's algorithm for several block sizes and data types."""
+        g = random_graph(70, True, 0.08, seed=6)
+        dijkstra = Dijkstra(g, cacheBytes=10**7)
+        expected = np.array([dijkstra.return_shortestPathLengths(s) for s in range(0, 70)])
+        for block in (1, 16, 128):
+            apsp = FloydWarshall(g, block=block)
+            self.assertEqual(np.allclose(apsp.return_distances(), expected), True)
+            for s in range(0, 70, 9):
+                for t in range(0, 70):
+                    path = apsp.return_path(s, t)
+                    length = sum(g.return_weight(u, v) for u, v in zip(path, path[1:]))
+                    self.assertEqual(np.isclose(length, expected[s, t]) if path else expected[s, t] == np.inf, True)
+        single = FloydWarshall(g, dtype=np.float32, predecessors=False).return_distances()
+        self.assertEqual(single.dtype, np.float32)
+        self.assertEqual(np.allclose(single, expected, rtol=1e-5), True)
+        self.assertRaises(ValueError, FloydWarshall(g, predecessors=False).return_predecessors)
+        self.assertRaises(TypeError, FloydWarshall, g, dtype=np.int32)
+        self.assertRaises(ValueError, FloydWarshall, g, block=0)
+
+    def test_memmap(self):
+        """Tests the storage of the matrices in memory-mapped files and the recomputation after a change of a mutable graph."""
+        g = MutableGraph(self.mat, vertexNames=['a','b','c','d'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dist.npy")
+            predecessorPath = os.path.join(directory, "pred.npy")
+            apsp = FloydWarshall(g, path=path, predecessorPath=predecessorPath)
+            self.assertEqual(apsp.return_path(0, 3), (0, 1, 2, 3))
+            self.assertEqual(list(np.load(path)[0]), [0, 3, 5, 6])
+            self.assertEqual(list(np.load(predecessorPath)[0]), [-1, 0, 1, 2])
+            g.set_weight(1, 3, 1)
+            self.assertEqual(apsp.return_path(0, 3), (0, 1, 3))
+            self.assertEqual(list(np.load(path)[0]), [0, 3, 5, 4])
+            
+    def test_temporary(self):
+        """Tests that the temporary files used without enough free memory are deleted together with the object."""
+        g = MutableGraph(self.mat, vertexNames=['a','b','c','d'])
+        available = graph_apsp._available_memory
+        graph_apsp._available_memory = lambda: 0
+        try:
+            apsp = FloydWarshall(g)
+            with self.assertWarns(Warning):
+                self.assertEqual(apsp.return_path(0, 3), (0, 1, 2, 3))
+            self.assertEqual(isinstance(apsp.return_distances(), np.memmap), True)
+            directory = os.path.dirname(apsp.return_distances().filename)
+            self.assertEqual(len(os.listdir(directory)), 2)
+            # A change of the graph deletes the files
+            g.set_weight(1, 3, 1)
+            self.assertEqual(os.path.exists(directory), False)
+            with self.assertWarns(Warning):
+                self.assertEqual(apsp.return_path(0, 3), (0, 1, 3))
+            directory = os.path.dirname(apsp.return_distances().filename)
+            del apsp
+            gc.collect()
+            self.assertEqual(os.path.exists(directory), False)
+        finally:
+            graph_apsp._available_memory = available
+
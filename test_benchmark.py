@@ -0,0 +1,33 @@
+import unittest
+import json
+import os
+import tempfile
+
+from benchmark import run_benchmarks, compare, main
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run(self):
+        """Tests that all benchmarks run on small graphs and produce JSON."""
+        results = run_benchmarks(sizes=(40,), densities=(0.05,), repeat=1)
+        cases = {(r["benchmark"], r["generator"]) for r in results["results"]}
+        for name in ("construction", "bfs", "dfs", "dijkstra", "delta", "cycles", "subgraph", "generate"):
+            self.assertEqual((name, "gnm") in cases and (name, "gnp") in cases, True)
+        self.assertEqual(all(r["median"] >= 0 for r in results["results"]), True)
+        self.assertEqual(json.loads(json.dumps(results))["meta"]["seed"], 0)
+        # Equal seeds create equal graphs
+        self.assertEqual([r["edges"] for r in results["results"]], [r["edges"] for r in run_benchmarks(sizes=(40,), densities=(0.05,), repeat=1, memory=False)["results"]])
+        self.assertRaises(ValueError, run_benchmarks, names=["unknown"])
+
+    def test_compare(self):
+        """Tests the detection of regressions between two runs."""
+        case = {"benchmark": "bfs", "generator": "gnm", "vertices": 10, "density": 0.1}
+        baseline = {"results": [dict(case, median=1.0, peakBytes=100)]}
+        current = {"results": [dict(case, median=1.1, peakBytes=200), dict(case, vertices=20, median=5.0, peakBytes=None)]}
+        regressions = compare(baseline, current, 0.2)
+        self.assertEqual([(r["measure"], r["baseline"], r["current"]) for r in regressions], [("peakBytes", 100, 200)])
+        self.assertEqual(len(compare(baseline, current, 0.05)), 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.assertEqual(main(["--sizes", "30", "--densities", "0.1", "--benchmarks", "bfs", "--repeat", "1", "--no-memory", "--output", path]), 0)
+            self.assertEqual(main(["--sizes", "30", "--densities", "0.1", "--benchmarks", "bfs", "--repeat", "1", "--no-memory", "--output", os.devnull, "--compare", path, "--threshold", "1000"]), 0)
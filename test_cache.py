@@ -0,0 +1,97 @@
+import unittest
+import gc
+import numpy as np
+
+from graph import Graph, random_graph
+from graph_cache import ResultCache, return_default_cache, set_default_cache
+from graph_dijkstra import Dijkstra
+from graph_explo import Graphexploration
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru(self):
+        """Tests the eviction of least recently used values and the counters."""
+        cache = ResultCache(maxEntries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual("b" in cache, False)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.return_stats(), {"hits": 2, "misses": 1, "evictions": 1, "entries": 2, "nbytes": cache.return_nbytes()})
+        cache.remove("a")
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual((len(cache), cache.return_nbytes(), cache.return_hits()), (0, 0, 2))
+
+    def test_lfu(self):
+        """Tests the eviction of least frequently used values, where ties are evicted in least recently used order."""
+        cache = ResultCache(maxEntries=3, policy="lfu")
+        for key in ("a", "b", "c"):
+            cache.put(key, key)
+        cache.get("a")
+        cache.get("a")
+        cache.get("c")
+        cache.put("d", "d")
+        self.assertEqual(sorted(k for k in "abcd" if k in cache), ["a", "c", "d"])
+        # The new value has the smallest use count, but the least recently used value of the same count is evicted first
+        cache.put("e", "e")
+        self.assertEqual(sorted(k for k in "abcde" if k in cache), ["a", "c", "e"])
+        self.assertRaises(ValueError, ResultCache, policy="fifo")
+
+    def test_bytes(self):
+        """Tests the byte limit of the cache."""
+        cache = ResultCache(1000)
+        cache.put("a", np.zeros(100))
+        self.assertEqual(cache.return_nbytes(), 800)
+        cache.put("b", np.zeros(50))
+        self.assertEqual(("a" in cache, "b" in cache, cache.return_nbytes()), (False, True, 400))
+        # Values larger than the limit are not stored
+        cache.put("c", np.zeros(200))
+        self.assertEqual(("b" in cache, "c" in cache), (True, False))
+        cache.put("d", "x", nbytes=600)
+        self.assertEqual(cache.return_nbytes(), 1000)
+        self.assertRaises(ValueError, ResultCache, -1)
+
+    def test_algorithms(self):
+        """Tests that the algorithm classes give the same results with small caches, which have to evict results, and with a shared cache."""
+        g = random_graph(30, True, 0.2, seed=3)
+        d = Dijkstra(g, cache=ResultCache())
+        explo = Graphexploration(g, cache=ResultCache())
+        shared = ResultCache(maxEntries=3)
+        d_small = Dijkstra(g, cacheBytes=6000)
+        explo_small = Graphexploration(g, cache=shared)
+        d_shared = Dijkstra(g, cache=shared)
+        self.assertEqual(explo_small.return_cache() is d_shared.return_cache(), True)
+        for repeat in range(0, 2):
+            for s in range(0, g.return_num_vertices()):
+                self.assertEqual(d_small.return_shortestPathLengths(s), d.return_shortestPathLengths(s))
+                self.assertEqual(d_shared.return_parent(s), d.return_parent(s))
+                self.assertEqual(d_shared.return_path(s, 0), d.return_path(s, 0))
+                self.assertEqual(explo_small.return_bfsDist(s), explo.return_bfsDist(s))
+                self.assertEqual(explo_small.return_dfsNum(s), explo.return_dfsNum(s))
+                self.assertEqual(explo_small.return_bfsSpanningTree(s).return_adjacencyList(), explo.return_bfsSpanningTree(s).return_adjacencyList())
+        self.assertEqual(d_small.return_cache().return_evictions() > 0, True)
+        self.assertEqual(shared.return_evictions() > 0, True)
+        self.assertEqual(d.return_cache().return_evictions(), 0)
+        self.assertEqual(d.return_cache().return_hits() > 0, True)
+        # The results of garbage collected objects are removed
+        cache = d.return_cache()
+        del d
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(TypeError, Dijkstra, g, cache={})
+
+    def test_default(self):
+        """Tests setting the cache used by default."""
+        default = return_default_cache()
+        try:
+            cache = ResultCache(policy="lfu")
+            set_default_cache(cache)
+            self.assertEqual(Graphexploration(Graph(np.array([[0, 1], [0, 0]]))).return_cache() is cache, True)
+        finally:
+            set_default_cache(default)
+        self.assertEqual(Dijkstra(Graph(np.array([[0, 1], [0, 0]]))).return_cache() is default, True)
+        self.assertRaises(TypeError, set_default_cache, None)
+        self.assertEqual(Graph(np.array([[0, 1], [0, 0]])).return_nbytes() > 0, True)
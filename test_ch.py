@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+
+from graph import Graph, random_graph
+from graph_ch import ContractionHierarchy
+from graph_dijkstra import Dijkstra
+from graph_mutable import MutableGraph
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0,0],
+                             [0,0,2,5,0],
+                             [0,0,0,1,0],
+                             [4,0,0,0,0],
+                             [0,0,0,0,0]], dtype=np.int64)
+        self.graph = Graph(self.mat, vertexNames=['a','b','c','d','e'])
+
+    def test_queries(self):
+        """Tests distances, unpacked paths and the hierarchy on a small graph."""
+        ch = ContractionHierarchy(self.graph)
+        self.assertEqual(sorted(ch.return_rank().tolist()), [0, 1, 2, 3, 4])
+        self.assertEqual(ch.return_distance(0, 3), 6)
+        self.assertEqual(ch.return_path(0, 3), (0, 1, 2, 3))
+        self.assertEqual(ch.return_shortestPath(0, 3).return_names(), ('a', 'b', 'c', 'd'))
+        self.assertEqual(ch.return_path(3, 2), (3, 0, 1, 2))
+        self.assertEqual((ch.return_distance(0, 4), ch.return_path(0, 4), ch.return_path(2, 2)), (np.inf, (), (2,)))
+        # Every edge of the hierarchy leads to a vertex of higher rank
+        rank = ch.return_rank()
+        for indptr, indices, weights, middle in (ch.return_upwardCsr(), ch.return_downwardCsr()):
+            sources = np.repeat(np.arange(5), np.diff(indptr))
+            self.assertTrue(np.all(rank[indices] > rank[sources]))
+            self.assertEqual(int(np.sum(middle >= 0)) <= ch.return_num_shortcuts(), True)
+        self.assertRaises(ValueError, ch.return_distance, 0, 5)
+        self.assertRaises(ValueError, ContractionHierarchy, self.graph, witnessLimit=0)
+
+    def test_random(self):
+        """Tests the queries against Dijkstra's algorithm on random graphs and a grid for several witness limits."""
+        side = 12
+        src, dst = [], []
+        for i in range(0, side * side):
+            if (i + 1) % side != 0:
+                src += [i, i + 1]
+                dst += [i + 1, i]
+            if i + side < side * side:
+                src += [i, i + side]
+                dst += [i + side, i]
+        weights = np.random.default_rng(4).integers(1, 10, len(src))
+        grid = Graph.from_edges(src, dst, weights, vertexNames=list(range(0, side * side)), sparse=True)
+        rng = np.random.default_rng(3)
+        for g in (random_graph(100, True, 0.04, seed=3, sparse=True), random_graph(80, False, 0.05, seed=5), grid):
+            size = g.return_num_vertices()
+            dijkstra = Dijkstra(g, cacheBytes=10**7)
+            for limit in (1, 64):
+                ch = ContractionHierarchy(g, witnessLimit=limit)
+                for i in range(0, 150):
+                    s, t = rng.integers(0, size, 2).tolist()
+                    expected = dijkstra.return_shortestPathLengths(s)[t]
+                    self.assertTrue(np.isclose(ch.return_distance(s, t), expected) or ch.return_distance(s, t) == expected)
+                    path = ch.return_path(s, t)
+                    if expected == np.inf:
+                        self.assertEqual(path, ())
+                    else:
+                        self.assertEqual((path[0], path[-1]), (s, t))
+                        self.assertTrue(np.isclose(sum(g.return_weight(u, v) for u, v in zip(path, path[1:])), expected))
+                        if s != t:
+                            out = ch.return_shortestPath(s, t)
+                            self.assertEqual((set(out.return_names()), out.return_num_edges()), (set(g.return_vertexName(v) for v in path), len(path) - 1))
+
+    def test_mutable(self):
+        """Tests the invalidation after a change of a mutable graph."""
+        g = MutableGraph(self.mat, vertexNames=['a','b','c','d','e'])
+        ch = ContractionHierarchy(g)
+        self.assertEqual(ch.return_distance(0, 3), 6)
+        g.set_weight(1, 3, 1)
+        self.assertRaises(ValueError, ch.return_distance, 0, 3)
+        self.assertEqual(ContractionHierarchy(g).return_distance(0, 3), 4)
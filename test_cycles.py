@@ -56,3 +56,35 @@ class TestCircleClass(unittest.TestCase):
             for c in kreise:
                 self.__is_cycle(c)
                 self.assertEqual(c.is_subgraph_of(g), True)
+                
+    def test_sparse(self):
+        """Tests the Circle class on graphs stored in sparse format."""
+        for i in np.arange(self.test_nums):
+            g = self.__random_graphs[i]
+            sparse = Graph(np.array(g.return_adjacencyMatrix()), vertexNames=list(g.return_names()), sparse=True)
+            cycle = Circle(sparse)
+            self.assertEqual(cycle.return_numCircles(), self.__cycle[i].return_numCircles())
+            for c in cycle.return_circles():
+                self.__is_cycle(c)
+                self.assertEqual(c.is_subgraph_of(sparse), True)
+
+    def test_iter_cycles(self):
+        """Tests the enumeration of all elementary circles."""
+        g = Graph(np.array([[0,1,0,0],
+                            [1,0,1,0],
+                            [1,0,0,1],
+                            [0,1,0,0]]))
+        cycles = [tuple(c.tolist()) for c in Circle(g).iter_cycles()]
+        self.assertEqual(sorted(cycles), [(0, 1), (0, 1, 2), (1, 2, 3)])
+        self.assertEqual(sorted(tuple(c.tolist()) for c in Circle(g).iter_cycles(max_length=2)), [(0, 1)])
+        self.assertEqual(len(list(Circle(g).iter_cycles(limit=2))), 2)
+        for i in np.arange(self.test_nums):
+            g = self.__random_graphs[i]
+            cycles = set()
+            for c in self.__cycle[i].iter_cycles(max_length=4, limit=500):
+                self.assertEqual(c[0], c.min())
+                self.assertEqual(len(set(c.tolist())), len(c))
+                self.assertEqual(all(g.is_adjacent(c[k], c[(k + 1) % len(c)]) for k in range(0, len(c))), True)
+                cycles.add(tuple(c.tolist()))
+            self.assertEqual(len(cycles) <= 500, True)
+            self.assertEqual(next(self.__cycle[i].iter_cycles(), None) is None, self.__cycle[i].is_acyclic())
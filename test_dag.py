@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+
+from graph import Graph, random_graph
+from graph_dag import DagPaths
+from graph_dijkstra import Dijkstra
+from graph_mutable import MutableGraph
+
+class TestDagPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,1,5,0,0],
+                             [0,0,2,6,0],
+                             [0,0,0,3,0],
+                             [0,0,0,0,1],
+                             [0,0,0,0,0]], dtype=np.int64)
+        self.graphs = [Graph(self.mat, vertexNames=['a','b','c','d','e'], sparse=sparse) for sparse in (False, True)]
+
+    def test_topological_order(self):
+        """Tests the topological order of acyclic graphs and the error for graphs with circles."""
+        for g in self.graphs:
+            self.assertEqual(list(g.return_topologicalOrder()), [0, 1, 2, 3, 4])
+        g = random_graph(30, False, 0.1, seed=1)
+        mat = np.triu(g.return_adjacencyMatrix(), 1)
+        order = Graph(mat[::-1, ::-1], vertexNames=list(range(0, 30))).return_topologicalOrder()
+        position = np.argsort(order)
+        src, dst = np.nonzero(mat[::-1, ::-1])
+        self.assertEqual(np.all(position[src] < position[dst]), True)
+        self.assertRaises(ValueError, g.return_topologicalOrder)
+        self.assertEqual(len(Graph.from_edges([], [], vertexNames=[]).return_topologicalOrder()), 0)
+
+    def test_paths(self):
+        """Tests the shortest and longest paths in an acyclic graph."""
+        for g in self.graphs:
+            dag = DagPaths(g)
+            self.assertEqual(dag.return_shortestPathLengths(0), (0, 1, 3, 6, 7))
+            self.assertEqual(dag.return_longestPathLengths(0), (0, 1, 5, 8, 9))
+            self.assertEqual(dag.return_longestPathLengths(3), (-np.inf, -np.inf, -np.inf, 0, 1))
+            self.assertEqual(dag.return_longestParent(0), (None, 0, 0, 2, 3))
+            self.assertEqual((dag.return_path(0, 4), dag.return_longestPath(0, 4)), ((0, 1, 2, 3, 4), (0, 2, 3, 4)))
+            self.assertEqual((dag.return_path(4, 0), dag.return_longestPath(2, 2)), ((), (2,)))
+            self.assertEqual(dag.return_longestPaths(0).return_num_edges(), 4)
+            self.assertEqual(dag.return_shortestPath(0, 3).return_length(), 6)
+            self.assertEqual(dag.return_shortestPaths(0).is_subgraph_of(g), True)
+            self.assertRaises(ValueError, dag.return_path, 0, 5)
+        self.assertRaises(ValueError, DagPaths(random_graph(10, False, 0.5, seed=1)).return_shortestPathLengths, 0)
+
+    def test_dijkstra(self):
+        """Tests that Dijkstra's algorithm relaxing in topological order on acyclic graphs equals the heap."""
+        rng = np.random.default_rng(2)
+        src = rng.integers(0, 40, 150)
+        dst = rng.integers(0, 40, 150)
+        keep = src < dst
+        g = Graph.from_edges(src[keep], dst[keep], rng.random(np.count_nonzero(keep)) + 0.1, vertexNames=list(range(0, 40)))
+        for s in range(0, 40):
+            self.assertEqual(Dijkstra(g).return_shortestPathLengths(s), Dijkstra(g, dag=False).return_shortestPathLengths(s))
+            self.assertEqual(Dijkstra(g).return_parent(s), DagPaths(g).return_parent(s))
+        # Weights 1 and 2 give many paths of equal length, on which the parents are chosen like in the heap
+        for i in range(0, 40):
+            size = int(rng.integers(3, 12))
+            src, dst = np.nonzero(np.triu(rng.random((size, size)) < 0.4, 1))
+            # The topological order differs from the order of the vertex indices
+            perm = rng.permutation(size)
+            g = Graph.from_edges(perm[src], perm[dst], rng.integers(1, 3, len(src)), vertexNames=list(range(0, size)))
+            for s in range(0, size):
+                self.assertEqual(Dijkstra(g).return_parent(s), Dijkstra(g, dag=False).return_parent(s))
+
+    def test_mutable(self):
+        """Tests that the paths follow changes of a mutable graph."""
+        g = MutableGraph(self.mat)
+        dag = DagPaths(g)
+        self.assertEqual(dag.return_longestPathLengths(0)[4], 9)
+        g.add_edge(0, 4, 10)
+        self.assertEqual((dag.return_longestPathLengths(0)[4], dag.return_shortestPathLengths(0)[4]), (10, 7))
+        g.add_edge(4, 0, 1)
+        self.assertRaises(ValueError, dag.return_shortestPathLengths, 0)
@@ -70,3 +70,87 @@ class TestDijkstra(unittest.TestCase):
                         d_s_i = dist[i_ind]
                         d_s_j = dist[j_ind]
                         self.assertEqual(isclose(d_s_j, d_s_i+d_i_j), True)
+                        
+    def test_sparse(self):
+        """Tests that Dijkstra's algorithm gives the same path lengths on graphs stored in sparse format."""
+        for d in self.__dijkstra:
+            graph = d.return_graph()
+            sparse = Graph(np.array(graph.return_adjacencyMatrix()), vertexNames=list(graph.return_names()), sparse=True)
+            d_sparse = Dijkstra(sparse)
+            for s in range(0, graph.return_num_vertices()):
+                self.assertEqual(np.allclose(d_sparse.return_shortestPathLengths(s), d.return_shortestPathLengths(s)), True)
+                self.assertEqual(d_sparse.return_shortestPaths(s).is_subgraph_of(sparse), True)
+                
+    def test_engines(self):
+        """Tests that the heap engine computes the same path lengths as the original scan engine."""
+        for d in self.__dijkstra:
+            graph = d.return_graph()
+            self.assertEqual(d.return_engine(), "heap")
+            d_scan = Dijkstra(graph, engine="scan")
+            for s in range(0, graph.return_num_vertices()):
+                self.assertEqual(np.allclose(d.return_shortestPathLengths(s), d_scan.return_shortestPathLengths(s)), True)
+                # Each parent has to lie on a shortest path
+                dist = d.return_shortestPathLengths(s)
+                for v, u in enumerate(d.return_parent(s)):
+                    if u != None:
+                        self.assertEqual(isclose(dist[v], dist[u] + graph.return_weight(u, v)), True)
+        self.assertRaises(ValueError, Dijkstra, self.__random_graphs[0], engine="fibonacci")
+
+    def test_delta(self):
+        """Tests that delta-stepping computes the same path lengths and parents as the heap engine for several bucket widths and threads."""
+        import graph_dijkstra
+        for d in self.__dijkstra:
+            graph = d.return_graph()
+            heap = Dijkstra(graph, dag=False, cacheBytes=10**6)
+            tuned = Dijkstra(graph, engine="delta", cacheBytes=10**6)
+            self.assertGreater(tuned.return_delta(), 0)
+            for delta in (None, 0.5, 100):
+                delta_stepping = tuned if delta is None else Dijkstra(graph, engine="delta", delta=delta, cacheBytes=10**6)
+                for s in range(0, graph.return_num_vertices()):
+                    self.assertEqual(delta_stepping.return_shortestPathLengths(s), heap.return_shortestPathLengths(s))
+                    self.assertEqual(delta_stepping.return_parent(s), heap.return_parent(s))
+        # Every bucket is split over the threads
+        threshold = graph_dijkstra._delta_parallel
+        graph_dijkstra._delta_parallel = 1
+        try:
+            graph = self.__random_graphs[0]
+            threads = Dijkstra(graph, engine="delta", workers=3, cacheBytes=10**6)
+            self.assertEqual(threads.return_shortestPathLengths(0), Dijkstra(graph, dag=False).return_shortestPathLengths(0))
+        finally:
+            graph_dijkstra._delta_parallel = threshold
+        self.assertRaises(ValueError, Dijkstra, graph, engine="delta", delta=0)
+        self.assertRaises(ValueError, Dijkstra, graph, engine="delta", workers=0)
+
+    def test_many(self):
+        """Tests the computation of path lengths from several start vertices in worker processes."""
+        for d in self.__dijkstra[:3]:
+            graph = d.return_graph()
+            sources = list(range(0, graph.return_num_vertices()))
+            for workers in (1, 2):
+                lengths = d.return_shortestPathLengths_many(sources, workers=workers)
+                self.assertEqual(lengths.shape, (len(sources), graph.return_num_vertices()))
+                for s in sources:
+                    self.assertEqual(np.allclose(lengths[s], d.return_shortestPathLengths(s)), True)
+        self.assertRaises(ValueError, self.__dijkstra[0].return_shortestPathLengths_many, [-1])
+        
+    def test_path(self):
+        """Tests point-to-point queries with early termination, resumed search states and bidirectional search against the full search."""
+        for d in self.__dijkstra[:5]:
+            graph = d.return_graph()
+            num_vertices = graph.return_num_vertices()
+            for options in ({}, {"keepState": False}, {"bidirectional": True}):
+                d_path = Dijkstra(graph)
+                for s in range(0, num_vertices):
+                    dist = d.return_shortestPathLengths(s)
+                    for t in range(0, num_vertices):
+                        path = d_path.return_path(s, t, **options)
+                        if dist[t] == math.inf:
+                            self.assertEqual(path, ())
+                            continue
+                        self.assertEqual((path[0], path[-1]), (s, t))
+                        self.assertEqual(all(graph.is_adjacent(i, j) for i, j in zip(path[:-1], path[1:])), True)
+                        self.assertEqual(isclose(sum(graph.return_weight(i, j) for i, j in zip(path[:-1], path[1:])), dist[t]), True)
+                # Resumed searches have to complete to the same path lengths
+                for s in range(0, num_vertices):
+                    self.assertEqual(np.allclose(d_path.return_shortestPathLengths(s), d.return_shortestPathLengths(s)), True)
+        self.assertRaises(ValueError, self.__dijkstra[0].return_path, 0, -1)
@@ -1,6 +1,10 @@
 import unittest
+import os
+import json
+import tempfile
 
 from graph import *
+from graph_results import Path
 
 class TestGraphClass(unittest.TestCase):
 
@@ -132,6 +136,193 @@ class TestGraphClass(unittest.TestCase):
         self.assertEqual(self.graph_b.return_vertexName(3), '3')
         self.assertEqual(self.graph_c.return_vertexName(3), 'D')
         
+    def test_csr(self):
+        """Tests the getter-method for the compressed sparse row representation."""
+        indptr, indices, weights = self.graph_a.return_csr()
+        self.assertEqual(list(indptr), [0, 2, 3, 3, 6, 6, 6, 7])
+        self.assertEqual(list(indices), [1, 2, 3, 4, 5, 6, 1])
+        self.assertEqual(list(weights), [1, 1, 1, 1, 1, 1, 1])
+        indptr, indices, weights = self.graph_c.return_csr()
+        self.assertEqual(list(indptr), [0, 1, 1, 3, 3, 3, 4, 4])
+        self.assertEqual(list(indices), [2, 1, 3, 6])
+        self.assertEqual(list(weights), [3, 10, 2, 5])
+        # Rows are sorted for an unsorted adjacency list as well, the adjacency list keeps the given order
+        g = Graph([(0,2,1.0), (0,1,2.0), (2,0,3.0), (0,2,4.0)], vertexNames=[0,1,2], dtype=np.float64)
+        indptr, indices, weights = g.return_csr()
+        self.assertEqual((list(indptr), list(indices), list(weights)), ([0, 2, 2, 3], [1, 2, 0], [2.0, 4.0, 3.0]))
+        self.assertEqual(g.return_adjacencies(0), ((2, 1.0), (1, 2.0), (2, 4.0)))
+        self.assertEqual((g.is_adjacent(0, 1), g.return_weight(0, 2), g.return_num_edges()), (True, 4.0, 3))
+        
+    def test_sparse(self):
+        """Tests that graphs stored in sparse format behave like graphs stored in dense format."""
+        self.assertFalse(self.graph_a.is_sparse())
+        for i in np.arange(self.test_nums):
+            dense = random_graph(random.randint(1,2*self.test_size), True, random.uniform(0, 1))
+            sparse = Graph(np.array(dense.return_adjacencyMatrix()), vertexNames=list(dense.return_names()), sparse=True)
+            self.assertTrue(sparse.is_sparse())
+            self.assertEqual(sparse.return_num_vertices(), dense.return_num_vertices())
+            self.assertEqual(sparse.return_num_edges(), dense.return_num_edges())
+            self.assertEqual(sparse.return_adjacencyList(), dense.return_adjacencyList())
+            for v in range(0, dense.return_num_vertices()):
+                self.assertEqual(sparse.return_outdeg(v), dense.return_outdeg(v))
+                self.assertEqual(sparse.return_indeg(v), dense.return_indeg(v))
+                for w in range(0, dense.return_num_vertices()):
+                    self.assertEqual(sparse.is_adjacent(v, w), dense.is_adjacent(v, w))
+                    self.assertEqual(sparse.return_weight(v, w), dense.return_weight(v, w))
+            self.assertTrue(sparse.is_subgraph_of(dense))
+            self.assertTrue(dense.is_subgraph_of(sparse))
+        # Adjacency list constructor
+        sparse_b = Graph(self.adj_b, dtype=np.float64, vertexNames=["0","1","2","3"], sparse=True)
+        self.assertEqual(sparse_b.return_adjacencyList(), self.graph_b.return_adjacencyList())
+        self.assertEqual(np.allclose(sparse_b.return_adjacencyMatrix(), self.graph_b.return_adjacencyMatrix()), True)
+        self.assertEqual(sparse_b.return_indeg(3), 3)
+        self.assertEqual(sparse_b.return_weight(2,1), 3.5)
+        self.assertEqual(sparse_b.return_weightType(), np.float64)
+        
+    def test_from_edges(self):
+        """Tests the bulk constructor for numpy edge arrays."""
+        # Vertices given as indices
+        src, dst = np.nonzero(self.mat_c)
+        g = Graph.from_edges(src, dst, self.mat_c[src, dst], vertexNames=['A','B','C','D','E','F','G'])
+        self.assertEqual(g.return_adjacencyList(), self.graph_c.return_adjacencyList())
+        self.assertEqual(np.any(np.bitwise_xor(g.return_adjacencyMatrix(), self.mat_c)), False)
+        self.assertEqual(g.return_weightType(), np.int64)
+        self.assertEqual(g.return_indeg(2), 1)
+        # Vertices given as names
+        starts = np.array([x[0] for x in self.adj_b])
+        ends = np.array([x[1] for x in self.adj_b])
+        weights = np.array([x[2] for x in self.adj_b])
+        g = Graph.from_edges(starts, ends, weights, vertexNames=["3","1","0","2"], sparse=True)
+        self.assertEqual(g.return_names(), ("3","1","0","2"))
+        self.assertEqual(g.is_subgraph_of(self.graph_b), True)
+        self.assertEqual(self.graph_b.is_subgraph_of(g), True)
+        g = Graph.from_edges(starts, ends, weights)
+        self.assertEqual(g.return_names(), ("0","1","2","3"))
+        self.assertEqual(g.return_adjacencyList(), self.graph_b.return_adjacencyList())
+        # Duplicate edges are removed, the last weight is kept
+        g = Graph.from_edges(np.array([0, 1, 0]), np.array([1, 2, 1]), np.array([1.0, 2.0, 3.0]))
+        self.assertEqual(g.return_num_edges(), 2)
+        self.assertEqual(g.return_weight(0, 1), 3.0)
+        # Unweighted
+        g = Graph.from_edges(np.array([0, 1]), np.array([1, 2]))
+        self.assertEqual(g.return_adjacencyList(), (((1, 1),), ((2, 1),), ()))
+        # Error handling
+        self.assertRaises(ValueError, Graph.from_edges, np.array([0, 1]), np.array([1, 1]))
+        self.assertRaises(ValueError, Graph.from_edges, np.array([0, 1]), np.array([1, 2]), np.array([1.0, 0.0]))
+        self.assertRaises(ValueError, Graph.from_edges, np.array([0, 3]), np.array([1, 2]), vertexNames=['a','b','c'])
+        self.assertRaises(ValueError, Graph.from_edges, np.array(['a']), np.array(['d']), vertexNames=['a','b','c'])
+        self.assertRaises(TypeError, Graph.from_edges, np.array([0, 1]), np.array([1]))
+        
+    def test_random_graph(self):
+        """Tests the generators of random graphs."""
+        for i in np.arange(self.test_nums):
+            size = random.randint(1,2*self.test_size)
+            density = random.uniform(0, 1)
+            g = random_graph(size, True, density, seed=int(i))
+            self.assertEqual(g.return_num_vertices(), size)
+            self.assertEqual(g.return_num_edges(), int((size**2-size) * density))
+            self.assertEqual(np.any(np.diagonal(g.return_adjacencyMatrix())), False)
+            self.assertEqual(g.return_weightType(), np.float64)
+            # The same seed gives the same graph
+            self.assertEqual(random_graph(size, True, density, seed=int(i)).return_adjacencyList(), g.return_adjacencyList())
+        g = random_graph(40, False, 0.9, sparse=True)
+        self.assertTrue(g.is_sparse())
+        self.assertEqual(g.return_num_edges(), int((40**2-40) * 0.9))
+        self.assertEqual(set(g.return_csr()[2]), {1})
+        # G(n,p) model
+        g = random_graph_gnp(200, 0.1, False, seed=1)
+        self.assertEqual(abs(g.return_num_edges() - (200**2-200) * 0.1) < 500, True)
+        self.assertEqual(np.any(np.diagonal(g.return_adjacencyMatrix())), False)
+        self.assertEqual(random_graph_gnp(10, 1.0, seed=1).return_num_edges(), 90)
+        self.assertEqual(random_graph_gnp(10, 0.0, seed=1).return_num_edges(), 0)
+        self.assertRaises(ValueError, random_graph, 0)
+        self.assertRaises(ValueError, random_graph, 10, True, 1.5)
+        self.assertRaises(ValueError, random_graph_gnp, 10, -0.5)
+        
+    def test_save_load(self):
+        """Tests storing graphs in binary files and loading them with and without memory mapping."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.bin")
+            for g in (self.graph_a, self.graph_b, self.graph_c, random_graph(50, True, 0.2, sparse=True)):
+                g.save(path)
+                # The arrays are page-aligned
+                self.assertEqual(os.path.getsize(path) % 4096, 0)
+                for mmap in (True, False):
+                    loaded = Graph.load(path, mmap=mmap)
+                    self.assertTrue(loaded.is_sparse())
+                    self.assertEqual(loaded.return_names(), g.return_names())
+                    self.assertEqual(loaded.return_weightType(), g.return_weightType())
+                    self.assertEqual([set(x) for x in loaded.return_adjacencyList()], [set(x) for x in g.return_adjacencyList()])
+                    self.assertEqual([loaded.return_indeg(v) for v in range(0, g.return_num_vertices())], [g.return_indeg(v) for v in range(0, g.return_num_vertices())])
+                    self.assertTrue(loaded.is_subgraph_of(g))
+                    self.assertEqual(isinstance(loaded.return_csr()[1], np.memmap), mmap)
+            # Dense graph from an unsorted adjacency list, whose rows are searched by bisection after loading
+            g = Graph([(0,2,1.0), (0,1,2.0)], vertexNames=[0,1,2], dtype=np.float64)
+            g.save(path)
+            for mmap in (True, False):
+                loaded = Graph.load(path, mmap=mmap)
+                self.assertEqual((loaded.is_adjacent(0, 1), loaded.return_weight(0, 1), loaded.return_weight(0, 2)), (True, 2.0, 1.0))
+                self.assertEqual((Path(loaded, [0, 1]).return_length(), Path(loaded, [0, 2]).return_length()), (2.0, 1.0))
+            # Files of older versions may contain unsorted rows, which are sorted on loading
+            with open(path, "rb") as f:
+                f.seek(len(b"PYGRAPH\x00"))
+                header = json.loads(f.read(int(np.frombuffer(f.read(8), dtype="<u8")[0])).decode("utf-8"))
+            for key in ("indices", "weights"):
+                offset, dtype, length = header["arrays"][key]
+                stored = np.memmap(path, dtype=dtype, mode="r+", offset=offset, shape=(length,))
+                stored[:] = stored[::-1].copy()
+                stored.flush()
+                del stored
+            loaded = Graph.load(path)
+            self.assertEqual((loaded.return_weight(0, 1), Path(loaded, [0, 1]).return_length(), list(loaded.return_csr()[1])), (2.0, 2.0, [1, 2]))
+            # Empty graph
+            empty = Graph.from_edges(np.array([], dtype=np.int64), np.array([], dtype=np.int64), vertexNames=["x"])
+            empty.save(path)
+            self.assertEqual(Graph.load(path).return_names(), ("x",))
+            self.assertEqual(Graph.load(path).return_num_edges(), 0)
+            # Only integer and string names are supported
+            self.assertRaises(TypeError, Graph([(1.5, 2.5, 1.0)], dtype=np.float64, vertexNames=[1.5, 2.5]).save, path)
+            with open(path, "wb") as f:
+                f.write(b"no graph")
+            self.assertRaises(ValueError, Graph.load, path)
+        
+    def test_read_edgelist(self):
+        """Tests reading graphs from text and binary edge list files in chunks."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "edges.txt")
+            with open(path, "w") as f:
+                f.write("# Complete graph\n")
+                for edge in self.adj_b:
+                    f.write("%s\t%s\t%s\n" % edge)
+            for chunksize in (1, 5, 100):
+                g = Graph.read_edgelist(path, chunksize=chunksize, delimiter="\t")
+                self.assertTrue(g.is_sparse())
+                self.assertEqual(g.return_names(), ("0", "1", "2", "3"))
+                self.assertEqual(g.return_adjacencyList(), self.graph_b.return_adjacencyList())
+            g = Graph.read_edgelist(path, vertexNames=["3","2","1","0"], dtype=np.float32, sparse=False)
+            self.assertEqual(g.return_names(), ("3","2","1","0"))
+            self.assertEqual(g.return_weightType(), np.float32)
+            self.assertTrue(g.is_subgraph_of(self.graph_b))
+            # CSV without weights, integer names and a duplicate edge
+            with open(path, "w") as f:
+                f.write("5,7\n7,9\n\n5,7\n")
+            g = Graph.read_edgelist(path, chunksize=2, delimiter=",", nodeType=int)
+            self.assertEqual(g.return_names(), (5, 7, 9))
+            self.assertEqual(g.return_adjacencyList(), (((1, 1.0),), ((2, 1.0),), ()))
+            with open(path, "w") as f:
+                f.write("a b c d\n")
+            self.assertRaises(ValueError, Graph.read_edgelist, path)
+            # Binary records
+            path = os.path.join(directory, "edges.bin")
+            record = np.dtype([("src", "<i4"), ("dst", "<i4"), ("weight", "<i8")])
+            src, dst = np.nonzero(self.mat_c)
+            edges = np.zeros(len(src), dtype=record)
+            edges["src"], edges["dst"], edges["weight"] = src, dst, self.mat_c[src, dst]
+            edges.tofile(path)
+            g = Graph.read_edgelist(path, chunksize=3, binary=record, dtype=np.int64, vertexNames=['A','B','C','D','E','F','G'])
+            self.assertEqual(g.return_adjacencyList(), self.graph_c.return_adjacencyList())
+            self.assertRaises(TypeError, Graph.read_edgelist, path, binary=np.int64)
+        
     # Merges two unweighted graphs and inserts an additional vertex in the resulting graph so that the union builds a true superset of the two input graphs.
     def __merge_graphs_with_extra(self, g_a: Graph, g_b: Graph):
         m_a = g_a.return_adjacencyMatrix()
@@ -163,3 +354,27 @@ class TestGraphClass(unittest.TestCase):
             # Check that union is not a subgraph of the two graphs
             self.assertEqual(g_union.is_subgraph_of(g_a), False)
             self.assertEqual(g_union.is_subgraph_of(g_b), False)
+            
+    def test_subgraph_hash(self):
+        """Tests the content hash of the graphs and the vectorized subgraph check against weights, names and storage formats."""
+        # The hash depends on the content only, not on the storage format or the order of the adjacency list
+        reordered = Graph(self.adj_b[::-1], dtype=np.float64, vertexNames=["0","1","2","3"])
+        sparse = Graph(self.adj_b, dtype=np.float64, vertexNames=["0","1","2","3"], sparse=True)
+        self.assertEqual(reordered.return_hash(), self.graph_b.return_hash())
+        self.assertEqual(sparse.return_hash(), self.graph_b.return_hash())
+        self.assertNotEqual(self.graph_a.return_hash(), self.graph_c.return_hash())
+        renamed = Graph(self.adj_b, dtype=np.float64, vertexNames=["1","0","2","3"])
+        self.assertNotEqual(renamed.return_hash(), self.graph_b.return_hash())
+        # Subgraphs are matched by name with equal weights
+        sub = Graph([("3","1",2.75), ("1","0",2.0)], dtype=np.float64, vertexNames=["3","1","0"])
+        self.assertEqual(sub.is_subgraph_of(reordered), True)
+        self.assertEqual(sub.is_subgraph_of(sparse), True)
+        self.assertEqual(reordered.is_subgraph_of(sub), False)
+        heavier = Graph([("3","1",2.5)], dtype=np.float64, vertexNames=["3","1"])
+        self.assertEqual(heavier.is_subgraph_of(self.graph_b), False)
+        foreign = Graph([("3","x",2.75)], dtype=np.float64, vertexNames=["3","x"])
+        self.assertEqual(foreign.is_subgraph_of(self.graph_b), False)
+        isolated = Graph(np.zeros((2, 2)), vertexNames=["1","2"])
+        self.assertEqual(isolated.is_subgraph_of(self.graph_b), True)
+        self.assertEqual(self.graph_b.is_subgraph_of(isolated), False)
+        self.assertRaises(TypeError, self.graph_b.is_subgraph_of, self.adj_b)
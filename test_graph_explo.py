@@ -1,8 +1,10 @@
 import unittest
 import numpy as np
 import math
+import os
+import tempfile
 
-from graph import Graph
+from graph import Graph, random_graph
 from graph_explo import Graphexploration
 
 class TestGraphExplorationClass(unittest.TestCase):
@@ -121,6 +123,148 @@ class TestGraphExplorationClass(unittest.TestCase):
                                                                                                    [0., 0.]]), True)
         self.assertEqual(len(self.explo_c.return_shortestPath(2, 6).return_adjacencyMatrix()), 0)
         
+    def test_path(self):
+        """Tests point-to-point queries with early termination, resumed search states and bidirectional BFS."""
+        self.assertEqual(self.explo_a.return_path(0, 3), (0, 1, 3))
+        self.assertEqual(self.explo_a.return_path(0, 6), (0, 1, 3, 6))
+        self.assertEqual(self.explo_a.return_path(2, 6), ())
+        self.assertEqual(self.explo_a.return_path(0, 0), (0,))
+        self.assertEqual(self.explo_c.return_path(0, 1, bidirectional=True), (0, 2, 1))
+        self.assertEqual(self.explo_c.return_path(0, 6, bidirectional=True), ())
+        self.assertRaises(ValueError, self.explo_a.return_path, 0, 7)
+        for g in (self.graph_a, self.graph_b, self.graph_c):
+            explo = Graphexploration(g)
+            for options in ({}, {"keepState": False}, {"bidirectional": True}):
+                explo_path = Graphexploration(g)
+                for s in range(0, g.return_num_vertices()):
+                    dist = explo.return_bfsDist(s)
+                    for t in range(0, g.return_num_vertices()):
+                        path = explo_path.return_path(s, t, **options)
+                        if dist[t] == math.inf:
+                            self.assertEqual(path, ())
+                        else:
+                            self.assertEqual((path[0], path[-1], len(path) - 1), (s, t, dist[t]))
+                            self.assertTrue(all(g.is_adjacent(i, j) for i, j in zip(path[:-1], path[1:])))
+        
+    def test_frontierBfs(self):
+        """Tests the frontier based BFS against the queue based BFS."""
+        for explo in (self.explo_a, self.explo_b, self.explo_c):
+            g = explo.return_graph()
+            frontier = Graphexploration(g, bfs="frontier")
+            bottom_up = Graphexploration(g, bfs="frontier", directionOptimizing=True)
+            for s in range(0, g.return_num_vertices()):
+                # Top-down layers discover the vertices in the same order as the queue
+                self.assertEqual(frontier.return_bfsDist(s), explo.return_bfsDist(s))
+                self.assertEqual(frontier.return_bfsParent(s), explo.return_bfsParent(s))
+                self.assertEqual(bottom_up.return_bfsDist(s), explo.return_bfsDist(s))
+                # Bottom-up layers may choose other parents of the same layer
+                dist = bottom_up.return_bfsDistArray(s)
+                parent = bottom_up.return_bfsParentArray(s)
+                self.assertEqual(dist.dtype, np.int32)
+                for v in range(0, g.return_num_vertices()):
+                    if parent[v] >= 0:
+                        self.assertTrue(g.is_adjacent(parent[v], v))
+                        self.assertEqual(dist[v], dist[parent[v]] + 1)
+        self.assertEqual(list(self.explo_c.return_bfsDistArray(2)), [-1, 1, 0, 1, -1, -1, -1])
+        self.assertEqual(list(self.explo_c.return_bfsParentArray(2)), [-1, 2, -1, 2, -1, -1, -1])
+        self.assertRaises(ValueError, Graphexploration, self.graph_a, bfs="stack")
+        
+    def test_bfsDistMany(self):
+        """Tests the computation of BFS-distances from several start vertices in worker processes."""
+        for workers in (1, 2):
+            dist = self.explo_b.return_bfsDist_many([1, 3, 2], workers=workers)
+            self.assertEqual(dist.dtype, np.int32)
+            self.assertEqual([list(x) for x in dist], [list(self.explo_b.return_bfsDistArray(s)) for s in (1, 3, 2)])
+            dist = self.explo_c.return_bfsDist_many(range(0, 7), workers=workers)
+            self.assertEqual(list(dist[2]), [-1, 1, 0, 1, -1, -1, -1])
+
+    def test_bfsDistMatrix(self):
+        """Tests the multi-source BFS against single BFS runs, also with more than 64 start vertices and in a memory-mapped file."""
+        for explo in (self.explo_a, self.explo_b, self.explo_c):
+            g = explo.return_graph()
+            dist = explo.return_bfsDistMatrix()
+            self.assertEqual(dist.dtype, np.uint16)
+            for s in range(0, g.return_num_vertices()):
+                self.assertEqual(list(dist[s]), [65535 if d < 0 else d for d in explo.return_bfsDistArray(s)])
+        self.assertEqual(list(self.explo_c.return_bfsDistMatrix([2], dtype=np.uint8)[0]), [255, 1, 0, 1, 255, 255, 255])
+        g = random_graph(100, True, 0.03, seed=4, sparse=True)
+        explo = Graphexploration(g, bfs="frontier")
+        sources = [5, 99] + list(range(0, 80))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dist.npy")
+            dist = explo.return_bfsDistMatrix(sources, dtype=np.uint32, path=path)
+            stored = np.load(path, mmap_mode="r")
+            for i, s in enumerate(sources):
+                expected = [2**32 - 1 if d < 0 else d for d in explo.return_bfsDistArray(s)]
+                self.assertEqual(list(dist[i]), expected)
+                self.assertEqual(list(stored[i]), expected)
+            del dist, stored
+        self.assertRaises(ValueError, self.explo_c.return_bfsDistMatrix, [7])
+        self.assertRaises(TypeError, self.explo_c.return_bfsDistMatrix, dtype=np.int32)
+
+
+    def test_deepDfs(self):
+        """Tests the DFS on a path graph, whose depth exceeds the recursion limit of Python."""
+        size = 20000
+        path = Graph.from_edges(np.arange(size - 1), np.arange(1, size), sparse=True)
+        explo = Graphexploration(path)
+        self.assertEqual(explo.return_dfsNum(), tuple(float(x) for x in range(1, size + 1)))
+        self.assertEqual(explo.return_finNum(), tuple(float(x) for x in range(size, 0, -1)))
+        self.assertEqual(len(explo.return_nontreeedges()), 0)
+        # Starting in the middle, the first half of the path is visited by further roots
+        self.assertEqual(explo.return_dfsNum(size // 2)[0], size // 2 + 1)
+        
+    def test_listOrder(self):
+        """Tests that edges of equal weight are traversed in the order of an unsorted adjacency list."""
+        g = Graph([(0,2,1.0), (0,1,1.0), (1,3,1.0), (2,3,1.0), (3,0,1.0)], vertexNames=[0,1,2,3], dtype=np.float64)
+        explo = Graphexploration(g)
+        self.assertEqual(explo.return_dfsNum(), (1, 4, 2, 3))
+        self.assertEqual(explo.return_finNum(), (4, 3, 2, 1))
+        self.assertEqual(explo.return_backwardedges(), ([3, 0],))
+        self.assertEqual(explo.return_shortestPath(0, 3).return_names(), (0, 2, 3))
+        # Recursive DFS in the order of the adjacency list, stably sorted by weight
+        def reference(g, s):
+            dfsNum = [0] * g.return_num_vertices()
+            finNum = [0] * g.return_num_vertices()
+            counters = [1, 1]
+            def visit(v):
+                dfsNum[v] = counters[0]
+                counters[0] += 1
+                for w, weight in sorted(g.return_adjacencies(v), key=lambda edge: edge[1]):
+                    if dfsNum[w] == 0:
+                        visit(w)
+                finNum[v] = counters[1]
+                counters[1] += 1
+            for root in [s] + [v for v in range(0, g.return_num_vertices()) if v != s]:
+                if dfsNum[root] == 0:
+                    visit(root)
+            return tuple(dfsNum), tuple(finNum)
+        rng = np.random.default_rng(8)
+        for i in range(0, 30):
+            edges = [(u, v, float(rng.integers(1, 3))) for u in range(0, 10) for v in range(0, 10) if u != v and rng.random() < 0.3]
+            order = rng.permutation(len(edges))
+            g = Graph([edges[k] for k in order], vertexNames=list(range(0, 10)), dtype=np.float64)
+            explo = Graphexploration(g)
+            for s in (0, 5):
+                self.assertEqual((explo.return_dfsNum(s), explo.return_finNum(s)), reference(g, s))
+        
+    def test_sparse(self):
+        """Tests that the graph exploration gives the same results on graphs stored in sparse format."""
+        sparse_b = Graph(self.adj_b, dtype=np.float64, vertexNames=["0","1","2","3"], sparse=True)
+        sparse_c = Graph(self.mat_c, vertexNames=['A','B','C','D','E','F','G'], sparse=True)
+        explo_b = Graphexploration(sparse_b)
+        explo_c = Graphexploration(sparse_c)
+        self.assertEqual(explo_b.return_dfsNum(1), self.explo_b.return_dfsNum(1))
+        self.assertEqual(explo_b.return_backwardedges(1), self.explo_b.return_backwardedges(1))
+        self.assertEqual(explo_c.return_finNum(2), self.explo_c.return_finNum(2))
+        self.assertEqual(explo_c.return_bfsDist(2), self.explo_c.return_bfsDist(2))
+        self.assertEqual(explo_b.return_bfsParent(1), self.explo_b.return_bfsParent(1))
+        self.assertTrue(explo_c.return_dfs_tree(2).is_sparse())
+        # In sparse format the adjacencies are ordered by vertex index
+        self.assertEqual([set(x) for x in explo_c.return_dfs_tree(2).return_adjacencyList()], [set(x) for x in self.explo_c.return_dfs_tree(2).return_adjacencyList()])
+        self.assertEqual([set(x) for x in explo_c.return_bfsSpanningTree(2).return_adjacencyList()], [set(x) for x in self.explo_c.return_bfsSpanningTree(2).return_adjacencyList()])
+        self.assertEqual(explo_b.return_shortestPath(2, 3).return_adjacencyList(), self.explo_b.return_shortestPath(2, 3).return_adjacencyList())
+        
     def test_Graph(self):
         """Tests the getter-method for the considered graph."""
         self.assertEqual(self.explo_a.return_graph(), self.graph_a)
@@ -0,0 +1,141 @@
+import unittest
+import numpy as np
+
+from graph import Graph, random_graph, _subgraph_memo
+from graph_cache import ResultCache
+from graph_mutable import MutableGraph
+from graph_dijkstra import Dijkstra
+from graph_explo import Graphexploration
+from graph_cycles import Circle
+
+class TestMutableGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0],
+                             [0,0,2,5],
+                             [0,0,0,1],
+                             [0,0,0,0]], dtype=np.int64)
+        self.graph = MutableGraph(self.mat, vertexNames=['a','b','c','d'])
+
+    def test_changes(self):
+        """Tests the changes of the graph, the version counter and the listeners."""
+        g = self.graph
+        calls = []
+        g.add_listener(lambda *args: calls.append(args))
+        self.assertEqual((g.return_num_vertices(), g.return_num_edges(), g.return_version()), (4, 4, 0))
+        g.add_edge(3, 0, 2)
+        g.set_weight(1, 3, 4)
+        g.set_weight(1, 3, 4)
+        g.remove_edge(0, 1)
+        self.assertEqual(g.add_vertex('e'), 4)
+        self.assertEqual(g.return_version(), 4)
+        self.assertEqual(calls, [("edge", 3, 0, 0, 2), ("edge", 1, 3, 5, 4), ("edge", 0, 1, 3, 0), ("vertex", 4, 4, 0, 0)])
+        self.assertEqual((g.is_adjacent(3, 0), g.is_adjacent(0, 1), g.return_weight(1, 3)), (True, False, 4))
+        self.assertEqual((g.return_outdeg(1), g.return_indeg(3), g.return_inAdjacencies(3)), (2, 2, ((1, 4), (2, 1))))
+        self.assertEqual(g.return_adjacencyList(), ((), ((2, 2), (3, 4)), ((3, 1),), ((0, 2),), ()))
+        self.assertEqual(g.return_names(), ('a', 'b', 'c', 'd', 'e'))
+        self.assertEqual(g.return_weightType(), np.dtype(np.int64))
+        self.assertRaises(ValueError, g.add_edge, 1, 2)
+        self.assertRaises(ValueError, g.add_edge, 1, 1)
+        self.assertRaises(ValueError, g.add_edge, 1, 7)
+        self.assertRaises(ValueError, g.remove_edge, 2, 1)
+        self.assertRaises(ValueError, g.set_weight, 1, 2, 0)
+        self.assertRaises(ValueError, g.add_vertex, 'a')
+        with self.assertWarns(Warning):
+            g.set_weight(1, 2, 2.5)
+        # The frozen copy follows the changes
+        frozen = g.to_graph()
+        self.assertEqual(frozen.return_adjacencyList(), g.return_adjacencyList())
+        self.assertIs(g.to_graph(), frozen)
+        self.assertEqual(frozen.is_subgraph_of(g), True)
+        # Results for mutable graphs are not stored by content hash
+        entries = len(_subgraph_memo)
+        self.assertEqual(Graph(self.mat, vertexNames=['a','b','c','d']).is_subgraph_of(g), False)
+        self.assertEqual(len(_subgraph_memo), entries)
+        g.add_edge(0, 1, 3)
+        self.assertIsNot(g.to_graph(), frozen)
+        self.assertEqual(MutableGraph().add_vertex(), 0)
+
+    def test_invalidation(self):
+        """Tests that results after changes equal a new computation and that results of unaffected start vertices are kept."""
+        g = self.graph
+        cache = ResultCache()
+        dijkstra = Dijkstra(g, cache=cache)
+        explo = Graphexploration(g, cache=cache)
+        circle = Circle(g)
+        self.assertEqual((dijkstra.return_shortestPathLengths(0), dijkstra.return_path(0, 3)), ((0, 3, 5, 6), (0, 1, 2, 3)))
+        dijkstra.return_shortestPathLengths(2)
+        explo.return_bfsDist(0)
+        explo.return_bfsDist(2)
+        self.assertEqual(circle.is_acyclic(), True)
+        # A cheaper edge from 'b' only affects the start vertices reaching 'b' and a changed weight does not affect the BFS
+        g.set_weight(1, 3, 2)
+        misses = cache.return_misses()
+        self.assertEqual(dijkstra.return_shortestPathLengths(2), (np.inf, np.inf, 0, 1))
+        self.assertEqual(explo.return_bfsDist(0), (0, 1, 2, 2))
+        self.assertEqual(cache.return_misses(), misses)
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, 3, 5, 5))
+        self.assertEqual(dijkstra.return_path(0, 3), (0, 1, 3))
+        g.add_edge(3, 0, 1)
+        g.add_vertex('e')
+        self.assertEqual(circle.is_acyclic(), False)
+        for s in range(0, 5):
+            fresh = g.to_graph()
+            self.assertEqual(dijkstra.return_shortestPathLengths(s), Dijkstra(fresh).return_shortestPathLengths(s))
+            self.assertEqual(dijkstra.return_parent(s), Dijkstra(fresh).return_parent(s))
+            self.assertEqual(explo.return_bfsParent(s), Graphexploration(fresh).return_bfsParent(s))
+            self.assertEqual(explo.return_dfsNum(s), Graphexploration(fresh).return_dfsNum(s))
+
+    def test_random_changes(self):
+        """Tests the results after random changes against a new computation on the current version."""
+        rng = np.random.default_rng(3)
+        g = MutableGraph(random_graph(20, edgeDensity=0.1, seed=3))
+        dijkstra = Dijkstra(g, cacheBytes=10**7)
+        explo = Graphexploration(g, cacheBytes=10**7, bfs="frontier")
+        for step in range(0, 80):
+            u, v = rng.integers(0, 20, 2).tolist()
+            if u != v:
+                if not g.is_adjacent(u, v):
+                    g.add_edge(u, v, rng.integers(1, 10))
+                elif step % 2 == 0:
+                    g.remove_edge(u, v)
+                else:
+                    g.set_weight(u, v, rng.integers(1, 10))
+            fresh = g.to_graph()
+            s, t = rng.integers(0, 20, 2).tolist()
+            self.assertEqual(dijkstra.return_shortestPathLengths(s), Dijkstra(fresh).return_shortestPathLengths(s))
+            self.assertEqual(dijkstra.return_path(s, t), Dijkstra(fresh).return_path(s, t))
+            self.assertEqual(explo.return_bfsDist(s), Graphexploration(fresh).return_bfsDist(s))
+            self.assertEqual(len(explo.return_path(s, t, bidirectional=True)), len(Graphexploration(fresh).return_path(s, t)))
+
+    def test_dynamic(self):
+        """Tests the repair of shortest paths after changes against a new computation."""
+        g = self.graph
+        cache = ResultCache()
+        dijkstra = Dijkstra(g, cache=cache, dynamic=True)
+        self.assertEqual(dijkstra.is_dynamic(), True)
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, 3, 5, 6))
+        g.set_weight(1, 3, 1)
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, 3, 5, 4))
+        self.assertEqual(dijkstra.return_parent(0), (None, 0, 1, 1))
+        g.remove_edge(1, 3)
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, 3, 5, 6))
+        g.remove_edge(0, 1)
+        g.add_vertex()
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, np.inf, np.inf, np.inf, np.inf))
+        self.assertEqual(dijkstra.return_parent(0), (None, None, None, None, None))
+        self.assertEqual(dijkstra.is_consistent(0), True)
+        rng = np.random.default_rng(5)
+        g = MutableGraph(random_graph(30, edgeDensity=0.08, seed=5))
+        dijkstra = Dijkstra(g, cacheBytes=10**7, dynamic=True)
+        for step in range(0, 100):
+            u, v = rng.integers(0, 30, 2).tolist()
+            if u != v:
+                if not g.is_adjacent(u, v):
+                    g.add_edge(u, v, rng.random() + 0.1)
+                elif step % 2 == 0:
+                    g.remove_edge(u, v)
+                else:
+                    g.set_weight(u, v, rng.random() + 0.1)
+            for s in range(0, 3):
+                self.assertEqual(dijkstra.is_consistent(s), True)
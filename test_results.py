@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+
+from graph import Graph
+from graph_results import Path, Tree
+from graph_explo import Graphexploration
+from graph_mutable import MutableGraph
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0],
+                             [0,0,2,5],
+                             [1,0,0,0],
+                             [0,0,4,0]], dtype=np.int64)
+        self.graphs = [Graph(self.mat, vertexNames=['a','b','c','d'], sparse=sparse) for sparse in (False, True)]
+
+    def test_path(self):
+        """Tests the queries of a path and its conversion into a graph."""
+        for g in self.graphs:
+            p = Path(g, [3, 2, 0])
+            self.assertEqual(p.return_path(), (3, 2, 0))
+            self.assertEqual(tuple(p.return_pathNames()), ('d', 'c', 'a'))
+            self.assertEqual(p.return_names(), ('a', 'c', 'd'))
+            self.assertEqual(p.return_length(), 5)
+            self.assertEqual((p.return_num_vertices(), p.return_num_edges()), (3, 2))
+            self.assertEqual(p.return_adjacencyList(), ((), ((0, 1),), ((1, 4),)))
+            self.assertEqual((p.return_vertexIndex('d'), p.return_vertexName(1), p.return_baseIndex(1)), (2, 'c', 2))
+            self.assertEqual((p.is_adjacent(2, 1), p.is_adjacent(1, 2), p.return_weight(1, 0)), (True, False, 1))
+            self.assertRaises(KeyError, p.return_vertexIndex, 'b')
+            self.assertEqual(np.all(p.return_adjacencyMatrix() == [[0,0,0],[1,0,0],[0,4,0]]), True)
+            self.assertEqual(p.to_graph().is_sparse(), g.is_sparse())
+            self.assertEqual(p.is_subgraph_of(g), True)
+            self.assertEqual(g.is_subgraph_of(p), False)
+            self.assertEqual(p.to_graph().is_subgraph_of(p), True)
+            self.assertEqual(Path(g, []).return_num_vertices(), 0)
+        
+    def test_tree(self):
+        """Tests the queries of a tree given by parents or by edges."""
+        for g in self.graphs:
+            t = Tree(g, [None, 0, 1, 1], 0)
+            self.assertEqual(t.return_root(), 0)
+            self.assertEqual(list(t.return_parentArray()), [-1, 0, 1, 1])
+            self.assertEqual(t.return_adjacencyList(), (((1, 3),), ((2, 2), (3, 5)), (), ()))
+            self.assertEqual(t.return_pathTo(3).return_path(), (0, 1, 3))
+            self.assertEqual(t.return_pathTo(3).is_subgraph_of(t), True)
+            self.assertEqual(t.is_subgraph_of(t.return_pathTo(3)), False)
+            self.assertEqual(Tree.from_edges(g, [1, 0], [3, 1], 0).return_pathTo(2).return_num_vertices(), 0)
+            self.assertEqual(Tree(g, [-1, -1, -1, -1], 2).return_names(), ('c',))
+            # Trees can be explored like graphs
+            explo = Graphexploration(t)
+            self.assertEqual(len(explo.return_nontreeedges(0)), 0)
+            self.assertEqual(explo.return_dfs_tree(0).is_subgraph_of(t), True)
+            self.assertEqual(t.return_nbytes() > 0, True)
+
+    def test_mutable(self):
+        """Tests the subgraph check of results against a mutable graph, which has been changed after their creation."""
+        g = MutableGraph(self.mat, vertexNames=['a','b','c','d'])
+        p = Path(g, [3, 2, 0])
+        t = Tree(g, [None, 0, 1, 1], 0)
+        self.assertEqual((p.is_subgraph_of(g), t.return_pathTo(3).is_subgraph_of(t)), (True, True))
+        g.set_weight(3, 2, 7)
+        self.assertEqual(p.is_subgraph_of(g), False)
+        self.assertEqual(t.is_subgraph_of(g), True)
+        g.remove_edge(1, 3)
+        self.assertEqual(t.is_subgraph_of(g), False)
+        # Results of the same version are compared by their edges
+        self.assertEqual(Path(g, [0, 1]).is_subgraph_of(Tree(g, [None, 0, 1, -1], 0)), True)
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+
+from graph import Graph, random_graph
+from graph_scc import StrongComponents, is_acyclic
+from graph_explo import Graphexploration
+from graph_mutable import MutableGraph
+
+class TestStrongComponents(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,1,0,0,0],
+                             [0,0,2,0,0],
+                             [3,0,0,4,0],
+                             [0,0,0,0,5],
+                             [0,0,0,6,0]], dtype=np.int64)
+
+    def test_components(self):
+        """Tests the labels, the condensation and the queries of the components."""
+        for sparse in (False, True):
+            g = Graph(self.mat, sparse=sparse)
+            scc = StrongComponents(g)
+            self.assertEqual(list(scc.return_labels()), [0, 0, 0, 1, 1])
+            self.assertEqual((scc.return_num_components(), list(scc.return_sizes())), (2, [3, 2]))
+            self.assertEqual(list(scc.return_component(1)), [3, 4])
+            self.assertEqual(list(scc.return_cyclicVertices()), [0, 1, 2, 3, 4])
+            self.assertEqual((scc.is_strongly_connected(), scc.is_acyclic()), (False, False))
+            self.assertEqual((scc.may_reach(0, 4), scc.may_reach(4, 0)), (True, False))
+            self.assertEqual(scc.return_condensation().return_adjacencyList(), (((1, 4),), ()))
+            self.assertEqual(is_acyclic(g), False)
+
+    def test_random(self):
+        """Compares the components of random graphs with the mutual reachability given by the BFS."""
+        for seed in range(0, 10):
+            g = random_graph(20, False, 0.08, seed=seed)
+            labels = StrongComponents(g).return_labels()
+            explo = Graphexploration(g)
+            reach = np.array([[d < np.inf for d in explo.return_bfsDist(s)] for s in range(0, 20)])
+            self.assertEqual(np.array_equal(reach & reach.T, labels[:, None] == labels[None, :]), True)
+            # Edges between components lead to larger labels
+            indptr, indices, weights = g.return_csr()
+            src = np.repeat(np.arange(20), np.diff(indptr))
+            self.assertEqual(np.all(labels[src] <= labels[indices]), True)
+            self.assertEqual(is_acyclic(g), np.all(np.bincount(labels) == 1))
+
+    def test_mutable(self):
+        """Tests that the components follow changes of a mutable graph."""
+        g = MutableGraph(self.mat)
+        scc = StrongComponents(g)
+        self.assertEqual(scc.return_num_components(), 2)
+        g.remove_edge(2, 0)
+        g.remove_edge(4, 3)
+        self.assertEqual((scc.return_num_components(), scc.is_acyclic(), is_acyclic(g)), (5, True, True))
+        self.assertEqual(list(scc.return_labels()), [0, 1, 2, 3, 4])
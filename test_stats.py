@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+
+from graph import Graph
+from graph_stats import Stats
+from graph_dijkstra import Dijkstra
+from graph_explo import Graphexploration
+from graph_cycles import Circle
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.mat = np.array([[0,3,0,0],
+                             [0,0,2,5],
+                             [0,0,0,1],
+                             [1,0,0,0]], dtype=np.int64)
+        self.graph = Graph(self.mat, vertexNames=['a','b','c','d'])
+
+    def test_dijkstra(self):
+        """Tests the counters and phases of Dijkstra's algorithm."""
+        calls = []
+        stats = Stats(lambda phase, seconds, counts: calls.append((phase, counts["settled"])))
+        dijkstra = Dijkstra(self.graph, cacheBytes=10**6, stats=stats)
+        self.assertIs(dijkstra.return_stats(), stats)
+        self.assertEqual(dijkstra.return_shortestPathLengths(0), (0, 3, 5, 6))
+        # 'd' is pushed twice, once via 'b' and once via 'c'
+        self.assertEqual(stats.return_counts(), {"settled": 4, "relaxed": 5, "heapPushes": 5, "heapPops": 5, "cacheHits": 0, "cacheMisses": 2, "resultsBuilt": 0})
+        dijkstra.return_shortestPathLengths(0)
+        dijkstra.return_shortestPaths(0)
+        self.assertEqual(stats.return_count("cacheHits"), 2)
+        self.assertEqual(stats.return_count("resultsBuilt"), 1)
+        self.assertEqual(stats.return_count("settled"), 4)
+        self.assertEqual(stats.return_calls(), {"construction": 2, "search": 1, "results": 2})
+        self.assertIn(("search", 4), calls)
+        self.assertEqual(set(stats.return_times()), {"construction", "search", "results"})
+        stats.reset()
+        self.assertEqual(stats.return_stats(), {"counts": dict.fromkeys(Stats.counters, 0), "times": {}, "calls": {}})
+        # A bidirectional search pushes and pops on both sides
+        dijkstra = Dijkstra(self.graph, cacheBytes=10**6, stats=stats)
+        self.assertEqual(dijkstra.return_path(0, 3, bidirectional=True), (0, 1, 2, 3))
+        counts = stats.return_counts()
+        self.assertGreaterEqual(counts["heapPushes"], counts["heapPops"])
+        self.assertGreater(counts["settled"], 0)
+        self.assertRaises(TypeError, Dijkstra, self.graph, stats={})
+
+    def test_exploration(self):
+        """Tests the counters of the BFS, the DFS and of point-to-point searches."""
+        for engine in ("queue", "frontier"):
+            stats = Stats()
+            explo = Graphexploration(self.graph, cacheBytes=10**6, bfs=engine, stats=stats)
+            explo.return_bfsDist(0)
+            explo.return_bfsSpanningTree(0)
+            self.assertEqual(stats.return_counts(), {"settled": 4, "relaxed": 5, "heapPushes": 0, "heapPops": 0, "cacheHits": 1, "cacheMisses": 3, "resultsBuilt": 1})
+        stats = Stats()
+        explo = Graphexploration(self.graph, cacheBytes=10**6, stats=stats)
+        explo.return_dfs_tree(0)
+        self.assertEqual((stats.return_count("settled"), stats.return_count("relaxed"), stats.return_count("resultsBuilt")), (4, 5, 1))
+        stats.reset()
+        # The search stops after exploring 'a' and 'b', which discovers 'c'
+        self.assertEqual(explo.return_path(0, 2), (0, 1, 2))
+        self.assertEqual((stats.return_count("settled"), stats.return_count("relaxed")), (2, 3))
+        self.assertEqual(stats.return_calls(), {"construction": 1, "search": 1})
+        self.assertRaises(TypeError, Graphexploration, self.graph, stats=1)
+
+    def test_circle(self):
+        """Tests that the statistics are passed on to the graph exploration of the circle class."""
+        stats = Stats()
+        circle = Circle(self.graph, stats=stats)
+        self.assertEqual(circle.return_numCircles(), 1)
+        self.assertEqual(circle.return_stats(), stats)
+        self.assertEqual(stats.return_count("resultsBuilt"), 2)
+        self.assertEqual(set(stats.return_calls()), {"construction", "search", "results"})
+        self.assertRaises(TypeError, Circle, self.graph, stats="stats")
@@ -3,5 +3,15 @@ from test_dijkstra import *
 from test_cycles import *
 from test_graph import *
 from test_graph_explo import *
+from test_cache import *
+from test_results import *
+from test_mutable import *
+from test_scc import *
+from test_dag import *
+from test_benchmark import *
+from test_stats import *
+from test_apsp import *
+from test_alt import *
+from test_ch import *
 
 unittest.main()
@@ -65,6 +65,8 @@ class Visu:
             raise TypeError("\'color\' has to be a 3- or 4-tuple.")
         if not sub.is_subgraph_of(self.__graph):
             raise ValueError("\'sub\' is no subgraph.")
+        # Positions of the edges in the edge list of igraph, which would otherwise be searched for each marked edge
+        edge_index = {e: i for i, e in enumerate(self.__vi_graph.get_edgelist())}
         # Traverses each vertex of the subgraph and marks it in the supergraph
         mark_names = sub.return_names()
         for name in mark_names:
@@ -75,13 +77,13 @@ class Visu:
             for edge in adj_sub:
                 vertexIndex = self.__graph.return_vertexIndex(sub.return_vertexName(edge[0]))
                 if  self.__directed:
-                    index = self.__vi_graph.get_edgelist().index((self.__graph.return_vertexIndex(name),vertexIndex))
+                    index = edge_index[(self.__graph.return_vertexIndex(name),vertexIndex)]
                 else:
                     # If the graph is undirected, check both directions
-                    if (self.__graph.return_vertexIndex(name),vertexIndex) in self.__vi_graph.get_edgelist():
-                        index = self.__vi_graph.get_edgelist().index((self.__graph.return_vertexIndex(name),vertexIndex))
+                    if (self.__graph.return_vertexIndex(name),vertexIndex) in edge_index:
+                        index = edge_index[(self.__graph.return_vertexIndex(name),vertexIndex)]
                     else:
-                        index = self.__vi_graph.get_edgelist().index((vertexIndex,self.__graph.return_vertexIndex(name)))
+                        index = edge_index[(vertexIndex,self.__graph.return_vertexIndex(name))]
                     
                 self.__visual_style["edge_color"][index] = color
                 self.__visual_style["edge_width"][index] = 2